@@ -107,11 +107,16 @@ class SLNode:
     Singly Linked List node for use in a hash map
     """
 
-    def __init__(self, key: str, value: object, next: "SLNode" = None) -> None:
-        """Initialize node given a key and value."""
+    def __init__(self, key: str, value: object, next: "SLNode" = None,
+                 hash_val: int = None) -> None:
+        """
+        Initialize node given a key and value. The full (pre-modulo) hash of
+        the key may be cached alongside it so the map never re-hashes it.
+        """
         self.key = key
         self.value = value
         self.next = next
+        self.hash_val = hash_val
 
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
@@ -188,20 +193,22 @@ class LinkedList:
         """Return an iterator for the list, starting at the head."""
         return LinkedListIterator(self._head)
 
-    def insert(self, key: str, value: object) -> None:
-        """Insert new node at front of the list."""
-        self._head = SLNode(key, value, self._head)
+    def insert(self, key: str, value: object, hash_val: int = None) -> None:
+        """Insert new node (with its cached hash) at front of the list."""
+        self._head = SLNode(key, value, self._head, hash_val)
         self._size += 1
 
-    def remove(self, key: str) -> bool:
+    def remove(self, key: str, hash_val: int = None) -> bool:
         """
-        Remove first node with matching key.
+        Remove first node with matching key. If hash_val is given, nodes whose
+        cached hash differs are skipped without comparing keys.
         Return True if removal was successful, False otherwise.
         """
         previous, node = None, self._head
         while node:
 
-            if node.key == key:
+            if (hash_val is None or node.hash_val == hash_val) \
+                    and node.key == key:
                 if previous:
                     previous.next = node.next
                 else:
@@ -212,11 +219,16 @@ class LinkedList:
             previous, node = node, node.next
         return False
 
-    def contains(self, key: str) -> SLNode:
-        """Return node with matching key, or None if no match"""
+    def contains(self, key: str, hash_val: int = None) -> SLNode:
+        """
+        Return node with matching key, or None if no match. If hash_val is
+        given, nodes whose cached hash differs are skipped without comparing
+        keys.
+        """
         node = self._head
         while node:
-            if node.key == key:
+            if (hash_val is None or node.hash_val == hash_val) \
+                    and node.key == key:
                 return node
             node = node.next
         return node
@@ -230,10 +242,14 @@ class LinkedList:
 
 class HashEntry:
 
-    def __init__(self, key: str, value: object) -> None:
-        """Initialize an entry for use in a hash map."""
+    def __init__(self, key: str, value: object, hash_val: int = None) -> None:
+        """
+        Initialize an entry for use in a hash map. The full (pre-modulo) hash
+        of the key may be cached alongside it so the map never re-hashes it.
+        """
         self.key = key
         self.value = value
+        self.hash_val = hash_val
 
         # Set this value to True when you "delete" a HashEntry
         self.is_tombstone = False
@@ -0,0 +1,1068 @@
+# Course: CS261 - Data Structures
+# Assignment: Assignment #6: Hash Map
+# Description: Benchmarks for the Separate Chaining and Open Addressing
+# # -- Hash Maps. Each benchmark is a plain function that prints its own
+# #     results; run one from the command line by name, e.g.
+# #
+# #         python hash_map_bench.py resize 1000000
+# #
+# #     Run without arguments to list the available benchmarks.
+
+import gc
+import os
+import random
+import string
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+from itertools import permutations, islice
+from multiprocessing import Pool
+
+from a6_include import (DynamicArray, LinkedList,
+                        hash_function_1, hash_function_2)
+import hash_map_oa
+import hash_map_sc
+from hash_map_policy import PrimePolicy, PowerOfTwoPolicy
+from hash_map_hashes import (FNV1aHash, SipHash, Blake2bHash,
+                             hash_function_1_batch, hash_function_2_batch)
+from hash_map_sketch import find_mode_approx
+from hash_map_mmap import MappedHashMap
+from hash_map_shm import ShardedHashMap
+
+
+def long_keys(n: int, length: int = 64) -> list:
+    """
+    Returns n distinct string keys, each padded out to the given length.
+
+    :param n: The number of keys.
+    :param length: The length of each key.
+    :return: A list of keys.
+    """
+    return [('key' + str(i)).ljust(length, '#') for i in range(n)]
+
+
+def random_keys(n: int, length: int = 16, seed: int = 261) -> list:
+    """
+    Returns n random alphanumeric string keys of the given length. Unlike
+    long_keys(), these don't share a common prefix and padding, so they
+    spread over a much wider range of hash values.
+
+    :param n: The number of keys.
+    :param length: The length of each key.
+    :param seed: Seed for the random generator, so runs are repeatable.
+    :return: A list of keys.
+    """
+    rand = random.Random(seed)
+    alphabet = string.ascii_letters + string.digits
+    return [''.join(rand.choices(alphabet, k=length)) for _ in range(n)]
+
+
+def bench_resize(n: int = 1_000_000) -> None:
+    """
+    Times resize_table() on a map of n long keys against what resize_table()
+    used to cost: re-putting (and so re-hashing) every key into a table of
+    the new capacity.
+
+    :param n: The number of keys in the map.
+    :return: None -- prints results.
+    """
+    keys = long_keys(n)
+
+    for name, module in (('SC', hash_map_sc), ('OA', hash_map_oa)):
+        m = module.HashMap(2 * n + 1, hash_function_2)
+        for key in keys:
+            m.put(key, key)
+        new_capacity = m.get_capacity() * 2
+
+        # Before: every key goes back through put().
+        start = time.perf_counter()
+        rebuilt = module.HashMap(new_capacity, hash_function_2)
+        for key in keys:
+            rebuilt.put(key, key)
+        before = time.perf_counter() - start
+
+        # After: resize_table() re-indexes using the cached hashes.
+        start = time.perf_counter()
+        m.resize_table(new_capacity)
+        after = time.perf_counter() - start
+
+        print(f"{name} resize of {n} keys: re-put {before:.3f}s, "
+              f"cached hash {after:.3f}s ({before / after:.1f}x)")
+
+
+def bench_hash(n: int = 1_000_000) -> None:
+    """
+    Times hashing n long keys one at a time against the batched variants.
+
+    :param n: The number of keys to hash.
+    :return: None -- prints results.
+    """
+    keys = long_keys(n)
+
+    for function, batch_function in ((hash_function_1, hash_function_1_batch),
+                                     (hash_function_2, hash_function_2_batch)):
+        start = time.perf_counter()
+        for key in keys:
+            function(key)
+        scalar = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch_function(keys)
+        batch = time.perf_counter() - start
+
+        print(f"{function.__name__} on {n} keys: scalar {scalar:.3f}s, "
+              f"batch {batch:.3f}s ({scalar / batch:.1f}x)")
+
+
+def bench_bulk(*sizes: int) -> None:
+    """
+    Times put_many() / get_many() against a put() / get() loop over the same
+    keys, for maps of each given size.
+
+    :param sizes: The numbers of keys to test (default 10^5, 10^6, 10^7).
+    :return: None -- prints results.
+    """
+    for n in sizes or (100_000, 1_000_000, 10_000_000):
+        keys = long_keys(n)
+        items = [(key, i) for i, key in enumerate(keys)]
+
+        for name, module in (('SC', hash_map_sc), ('OA', hash_map_oa)):
+            m = module.HashMap(11, hash_function_2)
+            start = time.perf_counter()
+            for key, value in items:
+                m.put(key, value)
+            loop_put = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for key in keys:
+                m.get(key)
+            loop_get = time.perf_counter() - start
+
+            m = module.HashMap(11, hash_function_2)
+            start = time.perf_counter()
+            m.put_many(items)
+            bulk_put = time.perf_counter() - start
+
+            start = time.perf_counter()
+            m.get_many(keys)
+            bulk_get = time.perf_counter() - start
+
+            print(f"{name} n={n}: put loop {loop_put:.3f}s, "
+                  f"put_many {bulk_put:.3f}s ({loop_put / bulk_put:.1f}x); "
+                  f"get loop {loop_get:.3f}s, "
+                  f"get_many {bulk_get:.3f}s ({loop_get / bulk_get:.1f}x)")
+
+
+def bench_build(n: int = 1_000_000) -> None:
+    """
+    Times building a map of n keys by put() from the default capacity (so
+    through every doubling) against HashMap.from_items().
+
+    :param n: The number of keys.
+    :return: None -- prints results.
+    """
+    items = [(key, i) for i, key in enumerate(long_keys(n))]
+
+    for name, module in (('SC', hash_map_sc), ('OA', hash_map_oa)):
+        start = time.perf_counter()
+        m = module.HashMap(11, hash_function_2)
+        for key, value in items:
+            m.put(key, value)
+        incremental = time.perf_counter() - start
+
+        start = time.perf_counter()
+        module.HashMap.from_items(items, function=hash_function_2)
+        presized = time.perf_counter() - start
+
+        print(f"{name} build of {n} keys: put() {incremental:.3f}s, "
+              f"from_items {presized:.3f}s ({incremental / presized:.1f}x)")
+
+
+def probe_length(m: hash_map_oa.HashMap, key: str) -> int:
+    """
+    Returns the number of slots a get() of key looks at in an OA map.
+
+    :param m: An open-addressing HashMap.
+    :param key: The key to look up.
+    :return: The number of slots probed.
+    """
+    hash_val = m._hash_function(key)
+    cap = m.get_capacity()
+    step = m._policy.probe_step
+    limit = m._policy.probe_limit(cap)
+    probes, gap = 1, 1
+    new_i = hash_val % cap
+    an_entry = m._buckets[new_i]
+    while an_entry and (an_entry.hash_val != hash_val or an_entry.key != key) \
+            and probes < limit:
+        new_i = (new_i + gap) % cap
+        gap += step
+        an_entry = m._buckets[new_i]
+        probes += 1
+    return probes
+
+
+def bench_churn(n: int = 10_000, rounds: int = 20) -> None:
+    """
+    Removes and re-puts the same n keys over and over in an OA map, printing
+    the mean and max get() probe length after each round. With tombstones
+    counted and compacted, both should stay flat.
+
+    :param n: The number of keys.
+    :param rounds: The number of remove / re-put rounds.
+    :return: None -- prints results.
+    """
+    keys = long_keys(n, 16)
+    m = hash_map_oa.HashMap(11, hash_function_2)
+    for key in keys:
+        m.put(key, key)
+
+    for round_i in range(rounds):
+        for key in keys:
+            m.remove(key)
+        for key in keys:
+            m.put(key, key)
+
+        lengths = [probe_length(m, key) for key in keys]
+        print(f"round {round_i}: mean probes "
+              f"{sum(lengths) / n:.2f}, max {max(lengths)}, "
+              f"tombstones {m._tombstones}, capacity {m.get_capacity()}")
+
+
+def percentile(values: list, fraction: float):
+    """
+    Returns the value at the given fraction (0 to 1) of the sorted values.
+
+    :param values: A non-empty list of numbers.
+    :param fraction: Which percentile to take, e.g. 0.99 for p99.
+    :return: The percentile value.
+    """
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def robin_hood_probe_length(m: hash_map_oa.RobinHoodHashMap,
+                            key: str) -> int:
+    """
+    Returns the number of slots a get() of a present key looks at in a
+    Robin Hood map.
+
+    :param m: A RobinHoodHashMap.
+    :param key: A key in m.
+    :return: The number of slots probed.
+    """
+    hash_i = m.quad_prob(key, 'get')
+    return m._probe_distance(m._buckets[hash_i], hash_i) + 1
+
+
+def bench_robin_hood(n: int = 100_000) -> None:
+    """
+    Compares get() probe lengths and time between quadratic probing (at its
+    0.5 load limit) and Robin Hood probing at 0.5 and 0.9 load limits.
+
+    :param n: The number of keys.
+    :return: None -- prints results.
+    """
+    keys = random_keys(n, 64)
+    maps = (
+        ('quadratic, 0.5', hash_map_oa.HashMap(11, hash_function_2),
+         probe_length),
+        ('robin hood, 0.5',
+         hash_map_oa.RobinHoodHashMap(11, hash_function_2, 0.5),
+         robin_hood_probe_length),
+        ('robin hood, 0.9',
+         hash_map_oa.RobinHoodHashMap(11, hash_function_2, 0.9),
+         robin_hood_probe_length),
+    )
+
+    for name, m, probe_function in maps:
+        for key in keys:
+            m.put(key, key)
+
+        start = time.perf_counter()
+        for key in keys:
+            m.get(key)
+        elapsed = time.perf_counter() - start
+
+        lengths = [probe_function(m, key) for key in keys]
+        print(f"{name}: load {m.table_load():.2f}, mean probes "
+              f"{sum(lengths) / n:.2f}, p99 {percentile(lengths, 0.99)}, "
+              f"max {max(lengths)}, get {elapsed / n * 1e6:.2f}us/op")
+
+
+def bench_columns(n: int = 100_000) -> None:
+    """
+    Compares memory per entry and get() time between the HashEntry-based OA
+    map and the column-based ArrayHashMap. Keys and values are created
+    before measuring, so only the table itself is counted.
+
+    :param n: The number of keys.
+    :return: None -- prints results.
+    """
+    keys = random_keys(n, 64)
+
+    for name, cls in (('HashEntry', hash_map_oa.HashMap),
+                      ('columns', hash_map_oa.ArrayHashMap)):
+        tracemalloc.start()
+        m = cls(11, hash_function_2)
+        for key in keys:
+            m.put(key, key)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        for key in keys:
+            m.get(key)
+        elapsed = time.perf_counter() - start
+
+        print(f"{name}: {memory / n:.1f} bytes/entry at load "
+              f"{m.table_load():.2f}, get {elapsed / n * 1e6:.2f}us/op")
+
+
+def measure(function, *args) -> tuple:
+    """
+    Calls function(*args), returning its result along with the seconds it
+    took and the bytes it left allocated.
+
+    :param function: The callable to measure.
+    :param args: Arguments for function.
+    :return: A (result, seconds, bytes) tuple.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function(*args)
+    elapsed = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, elapsed, memory
+
+
+def eager_buckets(capacity: int) -> DynamicArray:
+    """
+    Returns a bucket array built the way the SC map used to build one: a
+    DA holding a fresh LinkedList per bucket.
+
+    :param capacity: The number of buckets.
+    :return: The bucket array.
+    """
+    buckets = DynamicArray()
+    for _ in range(capacity):
+        buckets.append(LinkedList())
+    return buckets
+
+
+def bench_lazy(capacity: int = 1_000_000) -> None:
+    """
+    Compares the time and memory of setting up (and clearing) an empty SC
+    map of the given capacity, with one LinkedList per bucket against the
+    lazily filled bucket array.
+
+    :param capacity: The capacity of the map.
+    :return: None -- prints results.
+    """
+    _, eager_time, eager_memory = measure(eager_buckets, capacity)
+    m, lazy_time, lazy_memory = measure(hash_map_sc.HashMap, capacity)
+    print(f"create, capacity {capacity}: eager {eager_time:.3f}s "
+          f"{eager_memory / 2 ** 20:.1f}MB, lazy {lazy_time:.3f}s "
+          f"{lazy_memory / 2 ** 20:.1f}MB")
+
+    m.put('key', 'value')
+    _, eager_time, _ = measure(eager_buckets, m.get_capacity())
+    _, lazy_time, _ = measure(m.clear)
+    print(f"clear, capacity {m.get_capacity()}: eager {eager_time:.3f}s, "
+          f"lazy {lazy_time:.3f}s")
+
+
+def latency_histogram(latencies: list) -> str:
+    """
+    Returns a one-line histogram of latencies (in seconds), counting them
+    into power-of-ten buckets from 1us up.
+
+    :param latencies: A list of latencies in seconds.
+    :return: The histogram, as text.
+    """
+    limits = (1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1, float('inf'))
+    labels = ('<1us', '<10us', '<100us', '<1ms', '<10ms', '<100ms', '>=100ms')
+    counts = [0] * len(limits)
+    for latency in latencies:
+        bucket_i = 0
+        while latency >= limits[bucket_i]:
+            bucket_i += 1
+        counts[bucket_i] += 1
+    return ' '.join(f"{label}:{count}"
+                    for label, count in zip(labels, counts) if count)
+
+
+def bench_latency(*sizes: int) -> None:
+    """
+    Times every put() while filling each map type from its default capacity,
+    comparing all-at-once resizing with incremental rehashing. The worst
+    put() of an incremental map should stay flat as the size grows.
+
+    :param sizes: The numbers of keys to put (default 10^4, 10^5, 10^6).
+    :return: None -- prints results.
+    """
+    maps = (
+        ('SC', lambda: hash_map_sc.HashMap(11, hash_function_2)),
+        ('SC incremental',
+         lambda: hash_map_sc.IncrementalHashMap(11, hash_function_2)),
+        ('OA', lambda: hash_map_oa.HashMap(11, hash_function_2)),
+        ('OA incremental',
+         lambda: hash_map_oa.IncrementalHashMap(11, hash_function_2)),
+    )
+
+    for n in sizes or (10_000, 100_000, 1_000_000):
+        keys = random_keys(n, 64)
+        for name, factory in maps:
+            # Garbage collection pauses would otherwise swamp the tail.
+            m = factory()
+            latencies = []
+            gc.disable()
+            for key in keys:
+                start = time.perf_counter()
+                m.put(key, key)
+                latencies.append(time.perf_counter() - start)
+            gc.enable()
+
+            print(f"{name} n={n}: p50 {percentile(latencies, 0.5) * 1e6:.1f}us"
+                  f" p99 {percentile(latencies, 0.99) * 1e6:.1f}us"
+                  f" max {max(latencies) * 1e3:.2f}ms"
+                  f" [{latency_histogram(latencies)}]")
+
+
+def bench_shrink(n: int = 100_000) -> None:
+    """
+    Puts n keys into each map, removes 95% of them, then times a full
+    get_keys_and_values() walk, with and without a shrink_load.
+
+    :param n: The number of keys.
+    :return: None -- prints results.
+    """
+    keys = random_keys(n, 64)
+    survivors = n - int(n * 0.95)
+    maps = [
+        ('sc', lambda: hash_map_sc.HashMap(11, hash_function_1)),
+        ('sc shrink', lambda: hash_map_sc.HashMap(11, hash_function_1, 0.25)),
+        ('oa', lambda: hash_map_oa.HashMap(11, hash_function_1)),
+        ('oa shrink', lambda: hash_map_oa.HashMap(11, hash_function_1,
+                                                  shrink_load=0.1)),
+    ]
+
+    for name, factory in maps:
+        m = factory()
+        for key in keys:
+            m.put(key, key)
+        peak = m.get_capacity()
+
+        start = time.perf_counter()
+        for key in keys[survivors:]:
+            m.remove(key)
+        remove_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        m.get_keys_and_values()
+        walk_time = time.perf_counter() - start
+
+        print(f"{name}: capacity {peak} -> {m.get_capacity()}, "
+              f"remove {remove_time:.3f}s, walk {walk_time * 1e3:.2f}ms")
+
+
+def bench_policy(n: int = 100_000) -> None:
+    """
+    Times put() of n keys from the default capacity (so through every
+    resize), then get() of each, in both maps under the prime and
+    power-of-two capacity policies, at each map's default load factor and
+    at 0.75.
+
+    :param n: The number of keys.
+    :return: None -- prints results.
+    """
+    keys = random_keys(n, 64)
+    policies = [
+        ('prime', PrimePolicy()),
+        ('pow2', PowerOfTwoPolicy()),
+        ('pow2 load 0.75', PowerOfTwoPolicy(max_load=0.75)),
+    ]
+
+    for name, module in (('SC', hash_map_sc), ('OA', hash_map_oa)):
+        for policy_name, policy in policies:
+            m = module.HashMap(11, hash_function_1, policy=policy)
+
+            start = time.perf_counter()
+            for key in keys:
+                m.put(key, key)
+            put_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for key in keys:
+                m.get(key)
+            get_time = time.perf_counter() - start
+
+            print(f"{name} {policy_name}: put {put_time:.3f}s, "
+                  f"get {get_time:.3f}s, capacity {m.get_capacity()}")
+
+
+def key_corpora(n: int) -> dict:
+    """
+    Returns n keys of each of several kinds, named: the 'str' + str(i) keys
+    the module tests use, every ordering of one ID's characters, UUIDs, and
+    URL-style paths.
+
+    :param n: The number of keys of each kind.
+    :return: A dict of corpus name to list of keys.
+    """
+    rand = random.Random(261)
+    return {
+        'str + i': ['str' + str(i) for i in range(n)],
+        'anagrams': [''.join(chars) for chars in
+                     islice(permutations('SKU-48157093'), n)],
+        'uuids': [str(uuid.UUID(int=rand.getrandbits(128)))
+                  for _ in range(n)],
+        'paths': [f"/users/{rand.randrange(n)}/orders/{i}"
+                  for i in range(n)],
+    }
+
+
+def chain_lengths(m: hash_map_sc.HashMap) -> list:
+    """
+    Returns the length of every bucket's chain in an SC map.
+
+    :param m: A separate chaining HashMap.
+    :return: A list of chain lengths, one per bucket.
+    """
+    return [m._buckets[i].length() for i in range(m.get_capacity())]
+
+
+def bench_distribution(n: int = 5_000) -> None:
+    """
+    For each corpus from key_corpora() and each hash function (the two
+    provided ones, then the seeded ones), builds an SC and an OA map of n
+    keys and prints the time to hash them, the SC chain lengths (longest,
+    and the mean a lookup walks) and the OA get() probe lengths (mean, p99
+    and longest).
+
+    :param n: The number of keys per corpus.
+    :return: None -- prints results.
+    """
+    functions = [
+        ('hash_function_1', hash_function_1),
+        ('hash_function_2', hash_function_2),
+        ('FNV1aHash', FNV1aHash()),
+        ('SipHash', SipHash()),
+        ('Blake2bHash', Blake2bHash()),
+    ]
+
+    for corpus, keys in key_corpora(n).items():
+        for name, function in functions:
+            start = time.perf_counter()
+            for key in keys:
+                function(key)
+            hash_time = time.perf_counter() - start
+
+            items = [(key, key) for key in keys]
+            sc_map = hash_map_sc.HashMap.from_items(items, function=function)
+            chains = chain_lengths(sc_map)
+            walked = sum(length * length for length in chains) / len(keys)
+
+            oa_map = hash_map_oa.HashMap.from_items(items, function=function)
+            probes = [probe_length(oa_map, key) for key in keys]
+
+            print(f"{corpus:9} {name:15} hash {hash_time / n * 1e6:5.2f}us/key"
+                  f" | SC chain max {max(chains):5}, mean walked "
+                  f"{walked:8.2f} | OA probes mean "
+                  f"{sum(probes) / n:8.2f}, p99 {percentile(probes, 0.99):5}"
+                  f", max {max(probes)}")
+
+
+def find_mode_get_put(da: DynamicArray) -> (DynamicArray, int):
+    """
+    find_mode() as it was before upsert(): a get() then a put() per
+    element, so each key is hashed (and its chain walked) twice.
+
+    :param da: A DA object of strings.
+    :return: A DA of the most-occurring value(s), and how often they occur.
+    """
+    map = hash_map_sc.HashMap()
+    new_da = DynamicArray()
+    highest_freq = 0
+    for da_i in range(da.length()):
+        key = da[da_i]
+        frequency = map.get(key)
+        frequency = 1 if frequency is None else frequency + 1
+        map.put(key, frequency)
+        if frequency > highest_freq:
+            new_da = DynamicArray()
+            new_da.append(key)
+            highest_freq = frequency
+        elif frequency == highest_freq:
+            new_da.append(key)
+    return new_da, highest_freq
+
+
+def bench_find_mode(n: int = 10_000_000, distinct: int = 10_000) -> None:
+    """
+    Times find_mode() over a DA of n keys drawn from distinct random keys,
+    against the get() then put() version it replaced, and counts the same
+    keys into an OA map (with mixed hashes, so probing isn't what's being
+    measured) with get() then put() and with increment().
+
+    :param n: The length of the DA.
+    :param distinct: The number of distinct keys in it.
+    :return: None -- prints results.
+    """
+    rand = random.Random(261)
+    da = DynamicArray(rand.choices(random_keys(distinct), k=n))
+
+    for name, function in (('get/put', find_mode_get_put),
+                           ('increment', hash_map_sc.find_mode)):
+        start = time.perf_counter()
+        _, frequency = function(da)
+        elapsed = time.perf_counter() - start
+        print(f"find_mode {name}: {elapsed:.2f}s "
+              f"({n / elapsed:,.0f} elements/s), mode frequency {frequency}")
+
+    def count_get_put(m):
+        for da_i in range(n):
+            key = da[da_i]
+            count = m.get(key)
+            m.put(key, 1 if count is None else count + 1)
+
+    def count_increment(m):
+        for da_i in range(n):
+            m.increment(da[da_i])
+
+    for name, function in (('get/put', count_get_put),
+                           ('increment', count_increment)):
+        m = hash_map_oa.HashMap(11, hash_function_2,
+                                policy=PowerOfTwoPolicy())
+        start = time.perf_counter()
+        function(m)
+        elapsed = time.perf_counter() - start
+        print(f"OA count {name}: {elapsed:.2f}s "
+              f"({n / elapsed:,.0f} elements/s)")
+
+
+def bench_parallel(n: int = 2_000_000, distinct: int = 100_000) -> None:
+    """
+    Times find_mode_parallel() with 1, 2, 4, 8 and 16 worker processes over
+    a DA of n keys drawn from distinct random keys, checking each result
+    against the serial one. Then repeats this over n all-distinct keys,
+    where every key ties for the mode.
+
+    :param n: The length of the DA.
+    :param distinct: The number of distinct keys in it.
+    :return: None -- prints results.
+    """
+    rand = random.Random(261)
+    for keys in (rand.choices(random_keys(distinct), k=n),
+                 random_keys(n)):
+        print(f"{n} keys, {len(set(keys))} distinct:")
+        da = DynamicArray(keys)
+
+        serial_time = None
+        serial = None
+        for workers in (1, 2, 4, 8, 16):
+            start = time.perf_counter()
+            modes, frequency = hash_map_sc.find_mode_parallel(da, workers,
+                                                              min_items=0)
+            elapsed = time.perf_counter() - start
+
+            result = ([modes[i] for i in range(modes.length())], frequency)
+            if serial is None:
+                serial, serial_time = result, elapsed
+            print(f"{workers:2} workers: {elapsed:.2f}s, speedup "
+                  f"{serial_time / elapsed:.2f}x, "
+                  f"{'same' if result == serial else 'DIFFERENT'} result")
+
+
+def bench_sketch(n: int = 1_000_000, distinct: int = 500_000) -> None:
+    """
+    Compares the exact find_mode_stream() with the fixed-memory
+    find_mode_approx() over n keys drawn (Zipf-like) from distinct keys,
+    printing the time, peak memory and modes of each, for each hash
+    function.
+
+    :param n: The number of keys in the stream.
+    :param distinct: The number of distinct keys.
+    :return: None -- prints results.
+    """
+    rand = random.Random(261)
+    keys = [str(uuid.UUID(int=rand.getrandbits(128))) for _ in range(distinct)]
+    weights = [1 / rank ** 1.1 for rank in range(1, distinct + 1)]
+    stream = rand.choices(keys, weights=weights, k=n)
+
+    runs = [('exact', lambda: hash_map_sc.find_mode_stream(stream, 1))]
+    for name, function in (('hash_function_1', hash_function_1),
+                           ('hash_function_2', hash_function_2),
+                           ('FNV1aHash', FNV1aHash())):
+        runs.append((f"sketch {name}",
+                     lambda function=function: find_mode_approx(
+                         stream, function=function)))
+
+    for name, function in runs:
+        gc.collect()
+        result, elapsed, _ = measure(function)
+        tracemalloc.start()
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        modes = result[0]
+        print(f"{name:26} {elapsed:6.2f}s, peak {peak / 2 ** 20:6.1f}MB, "
+              f"modes {[modes[i] for i in range(min(modes.length(), 2))]}"
+              + (f", error bound {result[1]}" if name != 'exact' else
+                 f", frequency {result[1]}"))
+
+
+class GlobalLockHashMap:
+    """
+    A HashMap with every call made under one lock: how a map is usually
+    shared between threads without ConcurrentHashMap.
+    """
+
+    def __init__(self, *args) -> None:
+        self._map = hash_map_sc.HashMap(*args)
+        self._lock = threading.Lock()
+
+    def put(self, key: str, value: object) -> None:
+        with self._lock:
+            self._map.put(key, value)
+
+    def get(self, key: str):
+        with self._lock:
+            return self._map.get(key)
+
+    def remove(self, key: str) -> None:
+        with self._lock:
+            self._map.remove(key)
+
+    def get_keys_and_values(self) -> DynamicArray:
+        with self._lock:
+            return self._map.get_keys_and_values()
+
+
+def concurrent_workload(m, keys: list, seed: int, ops: int) -> dict:
+    """
+    Makes ops random calls (half get(), a third put(), the rest remove())
+    on the given keys, keeping a dict of what each put() or remove() should
+    have left behind.
+
+    :param m: The map to call.
+    :param keys: The keys to use, which no other thread uses.
+    :param seed: Seed for the random generator, so runs are repeatable.
+    :param ops: The number of calls.
+    :return: A dict of each key put (and not since removed) to its value.
+    """
+    rand = random.Random(seed)
+    reference = {}
+    for _ in range(ops):
+        key = rand.choice(keys)
+        choice = rand.random()
+        if choice < 0.5:
+            if m.get(key) != reference.get(key):
+                raise AssertionError(f"get({key!r}) != {reference.get(key)}")
+        elif choice < 0.83:
+            m.put(key, choice)
+            reference[key] = choice
+        else:
+            m.remove(key)
+            reference.pop(key, None)
+    return reference
+
+
+def bench_concurrent(ops: int = 200_000, max_threads: int = 8) -> None:
+    """
+    Splits ops random get(), put() and remove() calls evenly over 1, 2, 4,
+    ... up to max_threads threads, each with keys of its own, sharing one
+    ConcurrentHashMap or one HashMap behind a single global lock. Every
+    get() is checked as it runs, and the final contents against the
+    threads' reference dicts. Threads only run in parallel on a
+    free-threaded build of CPython; with the GIL, expect no speedup.
+
+    :param ops: The total number of calls.
+    :param max_threads: The most threads to run.
+    :return: None -- prints results.
+    """
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f"GIL {'enabled' if gil else 'disabled'}, "
+          f"{os.cpu_count()} CPUs")
+
+    for name, make_map in (
+            ('global lock', lambda: GlobalLockHashMap(11, hash_function_2)),
+            ('ConcurrentHashMap',
+             lambda: hash_map_sc.ConcurrentHashMap(11, hash_function_2))):
+        base_time = None
+        threads = 1
+        while threads <= max_threads:
+            m = make_map()
+            references = [None] * threads
+
+            def work(thread_i: int) -> None:
+                keys = [f"t{thread_i}-{i}" for i in range(10_000)]
+                references[thread_i] = concurrent_workload(
+                    m, keys, thread_i, ops // threads)
+
+            workers = [threading.Thread(target=work, args=(thread_i,))
+                       for thread_i in range(threads)]
+            start = time.perf_counter()
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            elapsed = time.perf_counter() - start
+
+            expected = {}
+            for reference in references:
+                expected.update(reference or {})
+            pairs = m.get_keys_and_values()
+            correct = None not in references and expected == dict(
+                pairs[i] for i in range(pairs.length()))
+
+            base_time = base_time or elapsed
+            print(f"{name:18} {threads:2} threads: {elapsed:.2f}s, "
+                  f"speedup {base_time / elapsed:.2f}x, "
+                  f"{'correct' if correct else 'WRONG'}")
+            threads *= 2
+
+
+def bench_snapshot(n: int = 1_000_000, reads: int = 200_000) -> None:
+    """
+    Times, on a SnapshotHashMap of n keys: taking a snapshot, the first
+    put() after it (which copies the bucket array), a put() after that,
+    and reads through a snapshot against reads on the map itself.
+
+    :param n: The number of keys in the map.
+    :param reads: The number of get() calls to time.
+    :return: None -- prints results.
+    """
+    keys = random_keys(n)
+    m = hash_map_oa.SnapshotHashMap.from_items(
+        ((key, key) for key in keys), n, FNV1aHash())
+
+    start = time.perf_counter()
+    snapshot = m.publish()
+    print(f"snapshot():            {time.perf_counter() - start:.6f}s")
+
+    start = time.perf_counter()
+    m.put(keys[0], 'changed')
+    print(f"first put() after it:  {time.perf_counter() - start:.6f}s")
+
+    start = time.perf_counter()
+    m.put(keys[1], 'changed')
+    print(f"next put():            {time.perf_counter() - start:.6f}s")
+
+    lookups = random.Random(261).choices(keys, k=reads)
+    for name, source in (('map', m), ('snapshot', snapshot)):
+        start = time.perf_counter()
+        for key in lookups:
+            source.get(key)
+        print(f"{reads} get() on {name}: "
+              f"{time.perf_counter() - start:.2f}s")
+    print(f"snapshot still has the old value: "
+          f"{snapshot.get(keys[0]) == keys[0]}")
+
+
+def bench_mmap(n: int = 200_000, reads: int = 100_000) -> None:
+    """
+    Compares warm-starting a table of n keys: reopening a MappedHashMap
+    file, against rebuilding an open addressing HashMap with put_many().
+    Then times reads on the reopened file from 1 and from 4 read-only
+    processes sharing it.
+
+    :param n: The number of keys in the table.
+    :param reads: The number of get() calls each reader makes.
+    :return: None -- prints results.
+    """
+    keys = random_keys(n)
+    function = FNV1aHash(261)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'table')
+
+        start = time.perf_counter()
+        with MappedHashMap(path, 2 * n + 1, function) as m:
+            for key in keys:
+                m.put(key, key)
+        print(f"build file by put():        "
+              f"{time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        rebuilt = hash_map_oa.HashMap(2 * n + 1, function)
+        rebuilt.put_many((key, key) for key in keys)
+        print(f"rebuild HashMap:            "
+              f"{time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        m = MappedHashMap(path, readonly=True)
+        m.get(keys[0])
+        print(f"reopen file and first get(): "
+              f"{time.perf_counter() - start:.6f}s")
+        m.close()
+
+        lookups = random.Random(261).choices(keys, k=reads)
+        for readers in (1, 4):
+            start = time.perf_counter()
+            with Pool(readers) as pool:
+                found = sum(pool.starmap(mapped_reads,
+                                         [(path, lookups)] * readers))
+            print(f"{readers} read-only process(es), {reads} get() each: "
+                  f"{time.perf_counter() - start:.2f}s, "
+                  f"{'correct' if found == readers * reads else 'WRONG'}")
+
+
+def mapped_reads(path: str, keys: list) -> int:
+    """
+    Opens the MappedHashMap at path read-only and looks up every key.
+
+    :param path: The file of the table.
+    :param keys: The keys to look up.
+    :return: How many keys were found with themselves as their value.
+    """
+    with MappedHashMap(path, readonly=True) as m:
+        return sum(m.get(key) == key for key in keys)
+
+
+def bench_dump(n: int = 10_000_000) -> None:
+    """
+    Times reloading a map of n random string keys with load() against
+    re-inserting its pairs into a new map of the same capacity with
+    put_many(), for both maps.
+
+    :param n: The number of keys.
+    :return: None -- prints results.
+    """
+    keys = random_keys(n)
+    function = FNV1aHash(261)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'table')
+        for name, module in (('SC', hash_map_sc), ('OA', hash_map_oa)):
+            m = module.HashMap.from_items(((key, i) for i, key in
+                                           enumerate(keys)), n, function)
+
+            start = time.perf_counter()
+            m.dump(path)
+            dump_time = time.perf_counter() - start
+            pairs = list(m.items())
+            capacity = m.get_capacity()
+            del m
+            gc.collect()
+
+            start = time.perf_counter()
+            rebuilt = module.HashMap(capacity, function)
+            rebuilt.put_many(pairs)
+            insert_time = time.perf_counter() - start
+            del rebuilt, pairs
+            gc.collect()
+
+            start = time.perf_counter()
+            loaded = module.HashMap.load(path, function)
+            load_time = time.perf_counter() - start
+
+            print(f"{name}: dump() {dump_time:.2f}s "
+                  f"({os.path.getsize(path) / 2 ** 20:.0f}MB), "
+                  f"re-insert {insert_time:.2f}s, load() {load_time:.2f}s, "
+                  f"{insert_time / load_time:.1f}x faster, "
+                  f"size {loaded.get_size()}")
+            del loaded
+            gc.collect()
+
+
+def bench_shm(n: int = 200_000, reads: int = 100_000) -> None:
+    """
+    Times building a ShardedHashMap of n random string keys with put(), and
+    looking keys up in it from 1 and 4 worker processes, which all read the
+    one shared copy. Compares its shared memory against the memory a private
+    HashMap of the same keys takes in each worker.
+
+    :param n: The number of keys in the table.
+    :param reads: The number of get() calls each worker makes.
+    :return: None -- prints results.
+    """
+    keys = random_keys(n)
+    function = FNV1aHash(261)
+    with ShardedHashMap(n, function) as m:
+        start = time.perf_counter()
+        for key in keys:
+            m.put(key, key)
+        print(f"build by put():             "
+              f"{time.perf_counter() - start:.2f}s")
+
+        tracemalloc.start()
+        private = hash_map_oa.HashMap(2 * n + 1, function)
+        private.put_many((key, key) for key in keys)
+        private_size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del private
+        shared_size = sum(shard._shm.size for shard in m._shards)
+        print(f"shared segments: {shared_size / 2 ** 20:.1f}MB in all; "
+              f"private HashMap: {private_size / 2 ** 20:.1f}MB per worker")
+
+        lookups = random.Random(261).choices(keys, k=reads)
+        for workers in (1, 4):
+            start = time.perf_counter()
+            with Pool(workers, initializer=attach_shared,
+                      initargs=(m,)) as pool:
+                found = sum(pool.map(shared_reads, [lookups] * workers))
+            print(f"{workers} worker(s), {reads} get() each: "
+                  f"{time.perf_counter() - start:.2f}s, "
+                  f"{'correct' if found == workers * reads else 'WRONG'}")
+
+
+# The ShardedHashMap a Pool worker was given by attach_shared().
+_shared_map = None
+
+
+def attach_shared(hash_map: ShardedHashMap) -> None:
+    """
+    Pool initializer: keeps the ShardedHashMap a worker was given.
+
+    :param hash_map: The shared HM.
+    :return: None
+    """
+    global _shared_map
+    _shared_map = hash_map
+
+
+def shared_reads(keys: list) -> int:
+    """
+    Looks up every key in the worker's ShardedHashMap.
+
+    :param keys: The keys to look up.
+    :return: How many keys were found with themselves as their value.
+    """
+    return sum(_shared_map.get(key) == key for key in keys)
+
+
+BENCHMARKS = {
+    'resize': bench_resize,
+    'hash': bench_hash,
+    'bulk': bench_bulk,
+    'build': bench_build,
+    'churn': bench_churn,
+    'robin_hood': bench_robin_hood,
+    'columns': bench_columns,
+    'lazy': bench_lazy,
+    'latency': bench_latency,
+    'shrink': bench_shrink,
+    'policy': bench_policy,
+    'distribution': bench_distribution,
+    'find_mode': bench_find_mode,
+    'parallel': bench_parallel,
+    'sketch': bench_sketch,
+    'concurrent': bench_concurrent,
+    'snapshot': bench_snapshot,
+    'mmap': bench_mmap,
+    'dump': bench_dump,
+    'shm': bench_shm,
+}
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in BENCHMARKS:
+        print("usage: python hash_map_bench.py <benchmark> [args...]")
+        print("benchmarks: " + ', '.join(BENCHMARKS))
+        sys.exit(1)
+
+    BENCHMARKS[sys.argv[1]](*(int(arg) for arg in sys.argv[2:]))
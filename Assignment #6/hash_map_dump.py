@@ -0,0 +1,160 @@
+# Course: CS261 - Data Structures
+# Assignment: Assignment #6: Hash Map
+# Description: The binary file format behind HashMap.dump() and
+# # -- HashMap.load(), for the Separate Chaining and Open Addressing Hash
+# #     Maps. A file holds a table's layout rather than just its pairs:
+# #
+# #         header (capacity, size, tombstones, number of records)
+# #         the HashMap class and hash function names, and the pickled
+# #             capacity policy
+# #         the bucket (or slot) of each record, as uint64
+# #         the state of each record (live or tombstone), one byte each
+# #         the cached hash of each record, as uint64
+# #         the keys and the values of the records, each pickled as a list
+# #
+# #     so load() reads each column in one call and puts every record back
+# #     where it was, without hashing a key or probing for a slot. A file is
+# #     only loaded into the class that wrote it, with the same hash
+# #     function (seed included), since the layout depends on both.
+
+import gc
+import pickle
+import struct
+from array import array
+from contextlib import contextmanager
+
+from hash_map_hashes import hash_function_name
+
+
+MAGIC = b'A6HMDUMP'
+
+# Magic, capacity, size, tombstones and the number of records.
+HEADER = struct.Struct('<8sQQQQ')
+
+# Length of each variable-length field that follows the header.
+LENGTH = struct.Struct('<Q')
+
+
+class TableDump:
+    """
+    The contents of a dump file: a table's shape, and its records as
+    parallel columns (slots, states, hashes, keys and values).
+    """
+    __slots__ = ('capacity', 'size', 'tombstones', 'policy',
+                 'slots', 'states', 'hashes', 'keys', 'values')
+
+
+@contextmanager
+def gc_paused():
+    """
+    Pauses the cyclic garbage collector for the body of a with statement.
+    Rebuilding a table allocates an object per entry, none of them part of
+    a reference cycle, and each burst of allocations would otherwise set
+    off a collection that walks every object allocated so far.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def class_name(cls: type) -> str:
+    """
+    Returns the name a dump file records the given HashMap class under.
+    Both modules have a HashMap, so the module name is included.
+
+    :param cls: A HashMap class.
+    :return: The class's name, e.g. "hash_map_oa.RobinHoodHashMap".
+    """
+    return f"{cls.__module__}.{cls.__name__}"
+
+
+def function_name(hash_map) -> str:
+    """
+    Returns the name (see hash_function_name()) of the hash function the
+    given HashMap was created with.
+
+    :param hash_map: A HashMap.
+    :return: The name of its hash function.
+    """
+    # -- A policy may have wrapped the function (in a MixedHash, say), which
+    #   keeps the function it was given as .function.
+    hasher = hash_map._hash_function
+    return hash_function_name(getattr(hasher, 'function', hasher))
+
+
+def write_dump(path: str, hash_map, slots: array, states: bytes,
+               hashes: array, keys: list, values: list) -> None:
+    """
+    Writes a dump file of the given HashMap, whose records are given as
+    parallel columns.
+
+    :param path: The file to write.
+    :param hash_map: The HashMap the records belong to.
+    :param slots: The bucket (or slot) index of each record.
+    :param states: The state of each record (empty for a chained HM).
+    :param hashes: The cached hash of each record.
+    :param keys: The key of each record.
+    :param values: The value of each record.
+    :return: None
+    """
+    with open(path, 'wb') as dump_file:
+        dump_file.write(HEADER.pack(MAGIC, hash_map._capacity,
+                                    hash_map._size,
+                                    getattr(hash_map, '_tombstones', 0),
+                                    len(keys)))
+        for field in (class_name(type(hash_map)).encode(),
+                      function_name(hash_map).encode(),
+                      pickle.dumps(hash_map._policy), bytes(states)):
+            dump_file.write(LENGTH.pack(len(field)))
+            dump_file.write(field)
+
+        slots.tofile(dump_file)
+        hashes.tofile(dump_file)
+        pickle.dump(keys, dump_file, pickle.HIGHEST_PROTOCOL)
+        pickle.dump(values, dump_file, pickle.HIGHEST_PROTOCOL)
+
+
+def read_dump(path: str, cls: type, function: callable) -> TableDump:
+    """
+    Reads a dump file, which must have been written by a cls whose hash
+    function has the same name as function.
+
+    :param path: The file to read.
+    :param cls: The HashMap class loading it.
+    :param function: The hash function it is being loaded with.
+    :return: A TableDump of the file's contents.
+    """
+    table = TableDump()
+    with open(path, 'rb') as dump_file:
+        magic, table.capacity, table.size, table.tombstones, count = \
+            HEADER.unpack(dump_file.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a HashMap dump")
+
+        fields = []
+        for _ in range(4):
+            length, = LENGTH.unpack(dump_file.read(LENGTH.size))
+            fields.append(dump_file.read(length))
+        saved_class, saved_name, policy, table.states = fields
+
+        if saved_class.decode() != class_name(cls):
+            raise ValueError(f"{path} holds a {saved_class.decode()}, "
+                             f"not a {class_name(cls)}")
+        if saved_name.decode() != hash_function_name(function):
+            raise ValueError(f"{path} was written with "
+                             f"{saved_name.decode()}, not "
+                             f"{hash_function_name(function)}")
+        table.policy = pickle.loads(policy)
+
+        table.slots = array('Q')
+        table.slots.fromfile(dump_file, count)
+        table.hashes = array('Q')
+        table.hashes.fromfile(dump_file, count)
+        table.keys = pickle.load(dump_file)
+        table.values = pickle.load(dump_file)
+
+    return table
@@ -0,0 +1,319 @@
+# Course: CS261 - Data Structures
+# Assignment: Assignment #6: Hash Map
+# Description: Seeded hash functions for the Separate Chaining and Open
+# # -- Addressing Hash Maps. hash_function_1 collides on every anagram, and
+# #     hash_function_2 clusters on short keys that differ in a few digits.
+# #     Each class here is a hash function object: pass a new one as the
+# #     function argument of each HashMap, e.g.
+# #
+# #         m = HashMap(11, FNV1aHash())
+# #
+# #     Each object draws its own random seed unless it is given one, so no
+# #     two maps share a seed. A given seed always gives the same hashes, in
+# #     any process.
+# #
+# #     FNV1aHash is the cheapest, and hashes batches of keys with NumPy when
+# #     it is installed. SipHash is a keyed hash that holds up against
+# #     deliberately colliding keys, but runs in pure Python. Blake2bHash is
+# #     also keyed, and runs in C via hashlib.
+# #
+# #     hash_function_name() gives each of these (and hash_function_1 and
+# #     hash_function_2) a name, seed included, that named_hash_function()
+# #     turns back into the same function, so a table saved to a file can
+# #     record how its cached hashes were made.
+# #
+# #     hash_batch() hashes a whole list of keys at once for the bulk
+# #     operations, with NumPy variants of hash_function_1 and
+# #     hash_function_2 (and each seeded class's own batch() method).
+
+
+import hashlib
+import secrets
+import struct
+
+from a6_include import hash_function_1, hash_function_2
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+MASK_64 = (1 << 64) - 1
+
+
+# Keys are hashed this many at a time, bounding the padded code-point matrix.
+BATCH_CHUNK = 1 << 16
+
+# Largest code point a str can hold; used to rule out int64 overflow.
+_MAX_CODE_POINT = 0x10FFFF
+
+
+def _code_point_matrix(keys: list):
+    """
+    Encode a list of str keys as an (n, longest key) uint32 matrix of code
+    points, padded with zeros. NumPy stores str arrays as UCS-4, so this is a
+    view of that buffer rather than a copy.
+    """
+    arr = numpy.asarray(keys, dtype=numpy.str_)
+    width = arr.dtype.itemsize // 4
+    return arr.view(numpy.uint32).reshape(len(keys), width)
+
+
+def hash_function_1_batch(keys) -> list:
+    """
+    Batched hash_function_1: returns the hash of every key in the given
+    sequence, bit-identical to calling hash_function_1 on each one.
+    Returns a NumPy int64 array, or a list if NumPy isn't installed.
+    """
+    keys = list(keys)
+    if numpy is None:
+        return [hash_function_1(key) for key in keys]
+
+    out = numpy.empty(len(keys), dtype=numpy.int64)
+    for start in range(0, len(keys), BATCH_CHUNK):
+        matrix = _code_point_matrix(keys[start:start + BATCH_CHUNK])
+        out[start:start + BATCH_CHUNK] = matrix.sum(axis=1, dtype=numpy.int64)
+    return out
+
+
+def hash_function_2_batch(keys) -> list:
+    """
+    Batched hash_function_2: returns the hash of every key in the given
+    sequence, bit-identical to calling hash_function_2 on each one.
+    Returns a NumPy int64 array, or a list if NumPy isn't installed.
+    """
+    keys = list(keys)
+    if numpy is None:
+        return [hash_function_2(key) for key in keys]
+
+    out = numpy.empty(len(keys), dtype=numpy.int64)
+    for start in range(0, len(keys), BATCH_CHUNK):
+        chunk = keys[start:start + BATCH_CHUNK]
+        matrix = _code_point_matrix(chunk)
+        width = matrix.shape[1]
+
+        # Keys long enough to overflow int64 are hashed one at a time.
+        if width * (width + 1) // 2 * _MAX_CODE_POINT >= 2 ** 63:
+            out[start:start + BATCH_CHUNK] = \
+                [hash_function_2(key) for key in chunk]
+            continue
+
+        weights = numpy.arange(1, width + 1, dtype=numpy.int64)
+        out[start:start + BATCH_CHUNK] = matrix.astype(numpy.int64) @ weights
+    return out
+
+
+# Batched variant of each provided hash function.
+BATCH_HASH_FUNCTIONS = {
+    hash_function_1: hash_function_1_batch,
+    hash_function_2: hash_function_2_batch,
+}
+
+
+def hash_batch(function, keys) -> list:
+    """
+    Returns a list of function(key) for every key, using the batched variant
+    of function when there is one: either listed in BATCH_HASH_FUNCTIONS, or
+    the function's own batch() method.
+    """
+    batch_function = BATCH_HASH_FUNCTIONS.get(function) or \
+        getattr(function, 'batch', None)
+    if batch_function is None:
+        return [function(key) for key in keys]
+
+    hashes = batch_function(keys)
+    return hashes if isinstance(hashes, list) else hashes.tolist()
+
+
+class SeededHash:
+    """
+    Base class for the seeded hash functions. Subclasses implement
+    __call__(key), returning a hash in [0, 2 ** 64).
+    """
+
+    # Size of a randomly drawn seed.
+    seed_bits = 64
+
+    def __init__(self, seed: int = None) -> None:
+        """
+        Initialize a new hash function with the given seed, or a random one.
+        """
+        if seed is None:
+            seed = secrets.randbits(self.seed_bits)
+        self.seed = seed
+
+    def __call__(self, key: str) -> int:
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(seed={self.seed:#x})"
+
+
+class FNV1aHash(SeededHash):
+    """
+    64-bit FNV-1a over the key's UTF-8 bytes, starting from the FNV offset
+    basis XORed with the seed.
+    """
+
+    OFFSET_BASIS = 0xCBF29CE484222325
+    PRIME = 0x100000001B3
+
+    def __call__(self, key: str) -> int:
+        hash_val = self.OFFSET_BASIS ^ (self.seed & MASK_64)
+        for byte in key.encode():
+            hash_val = ((hash_val ^ byte) * self.PRIME) & MASK_64
+        return hash_val
+
+    def batch(self, keys) -> list:
+        """
+        Returns the hash of every key in the given sequence, bit-identical to
+        calling this object on each one. Keys are hashed a byte column at a
+        time with NumPy (whose uint64 products wrap mod 2 ** 64, just as
+        FNV-1a needs), or one at a time if NumPy isn't installed.
+
+        :param keys: A sequence of keys.
+        :return: A list of hashes, in the same order as keys.
+        """
+        keys = list(keys)
+        if numpy is None:
+            return [self(key) for key in keys]
+
+        prime = numpy.uint64(self.PRIME)
+        basis = numpy.uint64(self.OFFSET_BASIS ^ (self.seed & MASK_64))
+        out = numpy.empty(len(keys), dtype=numpy.uint64)
+        for start in range(0, len(keys), BATCH_CHUNK):
+            data = [key.encode() for key in keys[start:start + BATCH_CHUNK]]
+            lengths = numpy.fromiter(map(len, data), dtype=numpy.int64,
+                                     count=len(data))
+
+            # Keys are padded out to the longest one with zero bytes, which
+            #   are left out of the hash by masking on each key's length.
+            arr = numpy.array(data, dtype=bytes)
+            matrix = arr.view(numpy.uint8).reshape(len(data),
+                                                   arr.dtype.itemsize)
+
+            hash_vals = numpy.full(len(data), basis, dtype=numpy.uint64)
+            for column_i in range(int(lengths.max(initial=0))):
+                mixed = (hash_vals ^ matrix[:, column_i]) * prime
+                hash_vals = numpy.where(lengths > column_i, mixed, hash_vals)
+            out[start:start + BATCH_CHUNK] = hash_vals
+
+        return out.tolist()
+
+
+def _sip_rounds(v0: int, v1: int, v2: int, v3: int, rounds: int) -> tuple:
+    """
+    Applies the given number of SipRounds to the SipHash state.
+
+    :return: The new state, as (v0, v1, v2, v3).
+    """
+    for _ in range(rounds):
+        v0 = (v0 + v1) & MASK_64
+        v1 = ((v1 << 13) | (v1 >> 51)) & MASK_64
+        v1 ^= v0
+        v0 = ((v0 << 32) | (v0 >> 32)) & MASK_64
+        v2 = (v2 + v3) & MASK_64
+        v3 = ((v3 << 16) | (v3 >> 48)) & MASK_64
+        v3 ^= v2
+        v0 = (v0 + v3) & MASK_64
+        v3 = ((v3 << 21) | (v3 >> 43)) & MASK_64
+        v3 ^= v0
+        v2 = (v2 + v1) & MASK_64
+        v1 = ((v1 << 17) | (v1 >> 47)) & MASK_64
+        v1 ^= v2
+        v2 = ((v2 << 32) | (v2 >> 32)) & MASK_64
+
+    return v0, v1, v2, v3
+
+
+class SipHash(SeededHash):
+    """
+    SipHash-1-3 (the variant CPython uses for str hashing) over the key's
+    UTF-8 bytes, keyed by a 128-bit seed. Subclasses can change the number
+    of compression and finalization rounds.
+    """
+
+    seed_bits = 128
+    c_rounds = 1
+    d_rounds = 3
+
+    def __call__(self, key: str) -> int:
+        data = key.encode()
+        k0 = self.seed & MASK_64
+        k1 = (self.seed >> 64) & MASK_64
+
+        v0 = k0 ^ 0x736F6D6570736575
+        v1 = k1 ^ 0x646F72616E646F6D
+        v2 = k0 ^ 0x6C7967656E657261
+        v3 = k1 ^ 0x7465646279746573
+
+        # The message is every whole 8-byte word, then a last word holding
+        #   the leftover bytes and the length.
+        tail_i = len(data) & ~7
+        words = list(struct.unpack_from(f'<{tail_i // 8}Q', data))
+        words.append(int.from_bytes(data[tail_i:], 'little') |
+                     ((len(data) & 0xFF) << 56))
+
+        for word in words:
+            v3 ^= word
+            v0, v1, v2, v3 = _sip_rounds(v0, v1, v2, v3, self.c_rounds)
+            v0 ^= word
+
+        v2 ^= 0xFF
+        v0, v1, v2, v3 = _sip_rounds(v0, v1, v2, v3, self.d_rounds)
+        return v0 ^ v1 ^ v2 ^ v3
+
+
+class Blake2bHash(SeededHash):
+    """
+    BLAKE2b (from hashlib) over the key's UTF-8 bytes with an 8-byte
+    digest, keyed by the seed.
+    """
+
+    def __init__(self, seed: int = None) -> None:
+        super().__init__(seed)
+        self._key = (self.seed & MASK_64).to_bytes(8, 'little')
+
+    def __call__(self, key: str) -> int:
+        return int.from_bytes(
+            hashlib.blake2b(key.encode(), digest_size=8,
+                            key=self._key).digest(), 'little')
+
+
+# Hash functions that hash_function_name() can name, by their names.
+NAMED_FUNCTIONS = {'hash_function_1': hash_function_1,
+                   'hash_function_2': hash_function_2}
+SEEDED_HASHES = {cls.__name__: cls
+                 for cls in (FNV1aHash, SipHash, Blake2bHash)}
+
+
+def hash_function_name(function: callable) -> str:
+    """
+    Returns a name for function that named_hash_function() turns back into
+    a function giving the same hashes, in any process.
+
+    :param function: hash_function_1, hash_function_2 or a SeededHash.
+    :return: The function's name, e.g. "FNV1aHash:1f".
+    """
+    for name, named in NAMED_FUNCTIONS.items():
+        if function is named:
+            return name
+    if type(function).__name__ in SEEDED_HASHES:
+        return f"{type(function).__name__}:{function.seed:x}"
+    raise ValueError(f"{function!r} has no name to be saved under")
+
+
+def named_hash_function(name: str) -> callable:
+    """
+    Returns the hash function hash_function_name() gave the given name.
+
+    :param name: A name returned by hash_function_name().
+    :return: The hash function.
+    """
+    if name in NAMED_FUNCTIONS:
+        return NAMED_FUNCTIONS[name]
+    class_name, _, seed = name.partition(':')
+    if class_name not in SEEDED_HASHES or not seed:
+        raise ValueError(f"unknown hash function {name!r}")
+    return SEEDED_HASHES[class_name](int(seed, 16))
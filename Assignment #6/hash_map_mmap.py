@@ -0,0 +1,555 @@
+# Course: CS261 - Data Structures
+# Assignment: Assignment #6: Hash Map
+# Description: A persistent, file-backed Open Addressing Hash Map. The
+# # -- table lives in a file mapped into memory with mmap, laid out as
+# #
+# #         header | capacity slots | data region
+# #
+# #     Each slot holds a key's cached hash, a state byte (empty, live or
+# #     tombstone) and the file offsets of its key and value records. Keys
+# #     (as UTF-8) and values (pickled) are appended to the data region,
+# #     each behind its length; a put() over an existing key appends a new
+# #     value record and repoints the slot at it. The header counts the
+# #     bytes of records left behind this way (or by remove()), and once
+# #     they pass half of the data region the file is rewritten with only
+# #     the live records, so updating keys never grows the file without
+# #     bound. Keys are probed for with the same quadratic probe sequence
+# #     as HashMap.quad_prob(), over the same prime capacities.
+# #
+# #     Opening an existing file only reads its header: slots and records
+# #     are paged in by the OS as lookups touch them, and processes that
+# #     open the same file read-only share the same pages. A resize (or
+# #     compacting away tombstones and stale records) writes a new file
+# #     beside the old one and renames it into place.
+
+import io
+import mmap
+import os
+import pickle
+import struct
+
+from a6_include import HashEntry, hash_function_1
+from hash_map_hashes import MASK_64, hash_function_name, named_hash_function
+from hash_map_oa import HashMap
+from hash_map_policy import DEFAULT_POLICY
+
+
+MAGIC = b'A6OAMMP1'
+
+# Magic, capacity, size, tombstones, end of the data region in use, and the
+#   hash function's name (see hash_function_name()), padded out to 128 bytes.
+HEADER = struct.Struct('<8sQQQQ64s')
+HEADER_SIZE = 128
+DATA_END_OFFSET = 32
+
+# Bytes of records no slot points at any more, kept just past the header
+#   fields (in what is zero padding in a file written without it).
+DEAD_OFFSET = HEADER.size
+
+# Cached hash, key record offset, value record offset and state.
+SLOT = struct.Struct('<QQQB7x')
+STATE_OFFSET = 24
+EMPTY, LIVE, TOMBSTONE = 0, 1, 2
+
+# Each key or value record starts with its length in bytes.
+LENGTH = struct.Struct('<I')
+
+# Room a new file's data region starts with.
+INITIAL_DATA = 1 << 16
+
+
+class MappedHashMap:
+    """
+    Open addressing HashMap whose slots, keys and values live in an
+    mmap-ed file, so it survives a restart without being rebuilt. It has
+    the same lookup API as HashMap (put(), get(), remove(), contains_key(),
+    iterating and the views), and keeps the same load factor limit, 0.5
+    counting tombstones.
+    """
+
+    # Load factor (live entries plus tombstones) the table is kept below.
+    _max_load = 0.5
+
+    # Fraction of the slots tombstones may take before they are purged.
+    _compact_fraction = 0.25
+
+    # Fraction of the data region dead records may take before it is
+    #   rewritten (once they also outgrow a new file's data region).
+    _garbage_fraction = 0.5
+
+    def __init__(self, path: str, capacity: int = 11,
+                 function: callable = None, readonly: bool = False) -> None:
+        """
+        Opens the table stored at path, or (if there is no file there yet)
+        creates a new, empty one of the given capacity hashing keys with
+        function (hash_function_1 by default). An existing file only has its
+        header read. If function is given for an existing file, it must be
+        the one the file was written with.
+
+        With readonly, the file is mapped read-only (and must exist), so any
+        number of processes can share it; changing it raises
+        io.UnsupportedOperation.
+        """
+        self._path = path
+        self._policy = DEFAULT_POLICY
+        self._readonly = readonly
+
+        if not os.path.exists(path):
+            if readonly:
+                raise FileNotFoundError(path)
+            self._write_new(path, self._policy.initial_capacity(capacity),
+                            function or hash_function_1, INITIAL_DATA)
+
+        self._open()
+        if function is not None and \
+                hash_function_name(function) != self._hash_name:
+            self.close()
+            raise ValueError(f"{path} was written with {self._hash_name}, "
+                             f"not {hash_function_name(function)}")
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        return f"MappedHashMap({self._path!r}, size={self._size})"
+
+    def __repr__(self) -> str:
+        """Override string method to provide more readable output."""
+        return str(self)
+
+    def __enter__(self) -> "MappedHashMap":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------ #
+
+    @staticmethod
+    def _write_new(path: str, capacity: int, function: callable,
+                   data_size: int) -> None:
+        """
+        Creates a file holding an empty table of the given capacity, with
+        room for data_size bytes of records. The file is extended rather
+        than written, so its all-zero (empty) slots cost nothing until used.
+
+        :param path: Where to create the file.
+        :param capacity: The number of slots.
+        :param function: The hash function.
+        :param data_size: The size of the data region to start with.
+        :return: None
+        """
+        data_start = HEADER_SIZE + capacity * SLOT.size
+        with open(path, 'wb') as new_file:
+            new_file.write(HEADER.pack(
+                MAGIC, capacity, 0, 0, data_start,
+                hash_function_name(function).encode()))
+            new_file.truncate(data_start + data_size)
+
+    def _open(self) -> None:
+        """
+        Maps our file into memory and reads its header.
+
+        (No params)
+        :return: None -- manipulates HM directly.
+        """
+        self._file = open(self._path, 'rb' if self._readonly else 'r+b')
+        self._mm = mmap.mmap(self._file.fileno(), 0,
+                             access=mmap.ACCESS_READ if self._readonly
+                             else mmap.ACCESS_WRITE)
+
+        magic, self._capacity, self._size, self._tombstones, \
+            self._data_end, hash_name = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{self._path} is not a MappedHashMap file")
+        self._dead, = struct.unpack_from('<Q', self._mm, DEAD_OFFSET)
+
+        self._hash_name = hash_name.rstrip(b'\0').decode()
+        self._hash_function = named_hash_function(self._hash_name)
+
+    def _write_header(self) -> None:
+        """
+        Writes our size, tombstone count and data region end to the header.
+
+        (No params)
+        :return: None -- manipulates HM directly.
+        """
+        struct.pack_into('<QQQ', self._mm, 16,
+                         self._size, self._tombstones, self._data_end)
+
+    def _check_writable(self) -> None:
+        """
+        Raises io.UnsupportedOperation if our file was opened read-only.
+
+        (No params)
+        :return: None
+        """
+        if self._readonly:
+            raise io.UnsupportedOperation(f"{self._path} is open read-only")
+
+    def flush(self) -> None:
+        """
+        Writes every change made so far through to the file on disk.
+
+        (No params)
+        :return: None
+        """
+        if not self._readonly:
+            self._mm.flush()
+
+    def close(self) -> None:
+        """
+        Flushes and unmaps our file. The HM can't be used afterwards.
+
+        (No params)
+        :return: None
+        """
+        if self._mm is not None:
+            self.flush()
+            self._mm.close()
+            self._file.close()
+            self._mm = None
+
+    # ------------------------------------------------------------------ #
+
+    # The load factor and size bookkeeping mean exactly what they do in a
+    #   HashMap, so HashMap's own code runs over our fields.
+    get_size = HashMap.get_size
+    get_capacity = HashMap.get_capacity
+    table_load = HashMap.table_load
+    empty_buckets = HashMap.empty_buckets
+    contains_key = HashMap.contains_key
+    keys = HashMap.keys
+    values = HashMap.values
+    items = HashMap.items
+    get_keys_and_values = HashMap.get_keys_and_values
+    _grown_capacity = HashMap._grown_capacity
+
+    def _slot(self, slot_i: int) -> tuple:
+        """
+        Returns the fields of the given slot.
+
+        :param slot_i: The index of the slot.
+        :return: A tuple of its hash, key offset, value offset and state.
+        """
+        return SLOT.unpack_from(self._mm, HEADER_SIZE + slot_i * SLOT.size)
+
+    def _record(self, offset: int) -> bytes:
+        """
+        Returns the bytes of the record at the given offset.
+
+        :param offset: The file offset of a key or value record.
+        :return: The record's contents.
+        """
+        start = offset + LENGTH.size
+        return self._mm[start:start + LENGTH.unpack_from(self._mm, offset)[0]]
+
+    def _append(self, data: bytes) -> int:
+        """
+        Appends a record holding data to the data region, first doubling
+        the file if the record does not fit.
+
+        :param data: The bytes to store.
+        :return: The file offset of the new record.
+        """
+        offset = self._data_end
+        end = offset + LENGTH.size + len(data)
+        if end > len(self._mm):
+            self._mm.resize(max(2 * len(self._mm), end))
+
+        LENGTH.pack_into(self._mm, offset, len(data))
+        self._mm[offset + LENGTH.size:end] = data
+        self._data_end = end
+        return offset
+
+    def _probe(self, key_bytes: bytes, hash_val: int, job: str) -> int:
+        """
+        Probes for the slot of a key along the quadratic probe sequence of
+        HashMap.quad_prob(), comparing cached hashes before keys.
+
+        For a 'put', returns the key's slot, or else the first tombstone
+        passed (or the empty slot that ended the search). Otherwise returns
+        the key's slot, or -1 if the key is not in our HM.
+
+        :param key_bytes: The key, encoded as UTF-8.
+        :param hash_val: The key's hash, reduced to 64 bits.
+        :param job: 'put', 'get' or 'remove'.
+        :return: A slot index, or -1.
+        """
+        mm = self._mm
+        cap = self._capacity
+        step = self._policy.probe_step
+        limit = cap if job == 'put' else self._policy.probe_limit(cap)
+
+        new_i = hash_val % cap
+        gap = 1
+        first_tombstone = None
+        for _ in range(limit):
+            slot_hash, key_offset, _, state = SLOT.unpack_from(
+                mm, HEADER_SIZE + new_i * SLOT.size)
+            if state == EMPTY:
+                break
+            if state == TOMBSTONE:
+                if first_tombstone is None:
+                    first_tombstone = new_i
+            elif slot_hash == hash_val and \
+                    self._record(key_offset) == key_bytes:
+                return new_i
+            new_i = (new_i + gap) % cap
+            gap += step
+
+        if job != 'put':
+            return -1
+        return new_i if first_tombstone is None else first_tombstone
+
+    def _reserve(self) -> None:
+        """
+        Makes sure one new key can be added without the load factor (live
+        entries plus tombstones) reaching _max_load, growing the table or
+        else purging tombstones.
+
+        (No params)
+        :return: None -- manipulates HM directly.
+        """
+        if self._grown_capacity(self._capacity, self._size +
+                                self._tombstones + 1) != self._capacity:
+            self.resize_table(self._grown_capacity(self._capacity,
+                                                   self._size + 1))
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Takes a key / value pair and either updates it (in the case that the
+        key already exists), or adds it (in the case that it doesn't) to our
+        HM. Either way, the value is appended to the data region.
+
+        :param key: The key of our entry.
+        :param value: The value of our entry.
+        :return: None -- manipulates HM directly.
+        """
+        self._check_writable()
+        self._reserve()
+
+        # Step 1) Probes for the key's slot.
+        key_bytes = key.encode()
+        hash_val = self._hash_function(key) & MASK_64
+        slot_i = self._probe(key_bytes, hash_val, 'put')
+        _, key_offset, old_value_offset, state = self._slot(slot_i)
+
+        # Step 2) Appends the value (and, for a new key, the key), and saves
+        #   the new end of the data region before any slot points past the
+        #   old one, so a crash can never leave a record to be overwritten.
+        value_offset = self._append(pickle.dumps(value,
+                                                 pickle.HIGHEST_PROTOCOL))
+        if state != LIVE:
+            key_offset = self._append(key_bytes)
+        struct.pack_into('<Q', self._mm, DATA_END_OFFSET, self._data_end)
+
+        # Step 3) Points the slot at the records, then updates the counts.
+        #   An updated key's old value record is dead from here on.
+        SLOT.pack_into(self._mm, HEADER_SIZE + slot_i * SLOT.size,
+                       hash_val, key_offset, value_offset, LIVE)
+        if state == LIVE:
+            self._dead += self._record_size(old_value_offset)
+        else:
+            self._size += 1
+            if state == TOMBSTONE:
+                self._tombstones -= 1
+        self._write_header()
+        struct.pack_into('<Q', self._mm, DEAD_OFFSET, self._dead)
+        self._collect_garbage()
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value associated with the given key. If the key is not in
+        our HM, returns None.
+
+        :param key: The key we are ultimately looking for.
+        :return: The value associated with said key.
+        """
+        if self._size == 0:
+            return None
+
+        slot_i = self._probe(key.encode(), self._hash_function(key) & MASK_64,
+                             'get')
+        if slot_i == -1:
+            return None
+        return pickle.loads(self._record(self._slot(slot_i)[2]))
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the given key and its associated value from the HM, leaving
+        a tombstone in its slot. If the key is not in the HM, the method
+        does nothing.
+
+        :param key: The key of the entry we're looking to remove.
+        :return: None -- manipulates HM directly.
+        """
+        self._check_writable()
+        if self._size == 0:
+            return
+
+        slot_i = self._probe(key.encode(), self._hash_function(key) & MASK_64,
+                             'remove')
+        if slot_i == -1:
+            return
+
+        # -- Nothing is appended, so the data region end already on file
+        #   stays right; only the counts follow the slot. The key and value
+        #   records are dead from here on.
+        _, key_offset, value_offset, _ = self._slot(slot_i)
+        self._mm[HEADER_SIZE + slot_i * SLOT.size + STATE_OFFSET] = TOMBSTONE
+        self._size -= 1
+        self._tombstones += 1
+        self._dead += self._record_size(key_offset) + \
+            self._record_size(value_offset)
+        self._write_header()
+        struct.pack_into('<Q', self._mm, DEAD_OFFSET, self._dead)
+
+        if self._tombstones > self._compact_fraction * self._capacity:
+            self.resize_table(self._capacity)
+        else:
+            self._collect_garbage()
+
+    def _record_size(self, offset: int) -> int:
+        """
+        Returns the bytes taken by the record at the given offset, its length
+        included.
+
+        :param offset: The file offset of a key or value record.
+        :return: The record's size.
+        """
+        return LENGTH.size + LENGTH.unpack_from(self._mm, offset)[0]
+
+    def _collect_garbage(self) -> None:
+        """
+        Rewrites our file with only its live records (see resize_table()) if
+        dead records take more than _garbage_fraction of the data region in
+        use, and more room than a new file's data region starts with.
+
+        (No params)
+        :return: None -- manipulates HM directly.
+        """
+        in_use = self._data_end - HEADER_SIZE - self._capacity * SLOT.size
+        if self._dead > max(self._garbage_fraction * in_use, INITIAL_DATA):
+            self.resize_table(self._capacity)
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Rebuilds our file with the given capacity (rounded up to a prime,
+        and large enough for our size). Only live entries are copied, each
+        key and current value once, so tombstones and stale values are
+        dropped; records are copied as bytes, and slots placed by their
+        cached hashes, so nothing is re-hashed or unpickled.
+
+        :param new_capacity: The new capacity we're attempting to re-size to.
+        :return: None -- manipulates HM directly.
+        """
+        self._check_writable()
+        if new_capacity < self._size:
+            return
+
+        new_capacity = self._grown_capacity(
+            self._policy.round_up(new_capacity), self._size)
+        live_data = self._data_end - HEADER_SIZE - \
+            self._capacity * SLOT.size - self._dead
+
+        # Step 1) Writes an empty table to a new file beside ours.
+        new_path = self._path + '.resize'
+        self._write_new(new_path, new_capacity,
+                        self._hash_function, max(live_data, INITIAL_DATA))
+
+        # Step 2) Copies each live entry across, then swaps the new file in.
+        new_map = MappedHashMap(new_path)
+        self._copy_live(new_map)
+        new_map.close()
+        self._replace_with(new_path)
+
+    def _copy_live(self, new_map: "MappedHashMap") -> None:
+        """
+        Copies each of our live entries into new_map, an empty table with
+        room for them, placing each by its cached hash and copying its key
+        and current value records as bytes.
+
+        :param new_map: The empty table to fill.
+        :return: None -- manipulates new_map directly.
+        """
+        new_capacity = new_map._capacity
+        step = self._policy.probe_step
+        for slot_i in range(self._capacity):
+            hash_val, key_offset, value_offset, state = self._slot(slot_i)
+            if state != LIVE:
+                continue
+
+            new_i = hash_val % new_capacity
+            gap = 1
+            while new_map._slot(new_i)[3] != EMPTY:
+                new_i = (new_i + gap) % new_capacity
+                gap += step
+
+            SLOT.pack_into(new_map._mm, HEADER_SIZE + new_i * SLOT.size,
+                           hash_val,
+                           new_map._append(self._record(key_offset)),
+                           new_map._append(self._record(value_offset)),
+                           LIVE)
+
+        new_map._size = self._size
+        new_map._write_header()
+
+    def clear(self) -> None:
+        """
+        Clears the contents of the hash map, but does not change the
+        underlying hash table capacity. Our file is replaced by an empty one.
+
+        (No params)
+        :return: None.
+        """
+        self._check_writable()
+        new_path = self._path + '.resize'
+        self._write_new(new_path, self._capacity, self._hash_function,
+                        INITIAL_DATA)
+        self._replace_with(new_path)
+
+    def _replace_with(self, new_path: str) -> None:
+        """
+        Renames the file at new_path over ours and maps it in its place. The
+        old file is never written to again, so other processes that have it
+        mapped keep reading the table as it was.
+
+        :param new_path: The path of the new file.
+        :return: None -- manipulates HM directly.
+        """
+        self.close()
+        os.replace(new_path, self._path)
+        self._open()
+
+    def __iter__(self):
+        """
+        Create iterator for loop, yielding a HashEntry (read from our file)
+        for every key in our HM.
+        """
+        for slot_i in range(self._capacity):
+            hash_val, key_offset, value_offset, state = self._slot(slot_i)
+            if state == LIVE:
+                yield HashEntry(self._record(key_offset).decode(),
+                                pickle.loads(self._record(value_offset)),
+                                hash_val)
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+    import tempfile
+
+    print("\nrepeated updates keep the file bounded")
+    print("--------------------------------------")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'updates.hm')
+        m = MappedHashMap(path)
+        sizes = []
+        for i in range(200_000):
+            m.put('key' + str(i % 100), 'value' * (i % 7) + str(i))
+            if i % 50_000 == 49_999:
+                sizes.append(os.path.getsize(path))
+        print(m.get_size(), m.get('key99'), sizes)
+        print(max(sizes) <= 4 * INITIAL_DATA + HEADER_SIZE +
+              m.get_capacity() * SLOT.size)
+        m.close()
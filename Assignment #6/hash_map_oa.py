@@ -10,31 +10,76 @@
 # #
 # #     This Hash Map allows for following operations: put(), empty_buckets(),
 # #     table_load(), clear(), resize_table(), get(), contains_key(), remove()
-# #     get_keys_and_values(), and __iter__(), __next__()
-
+# #     get_keys_and_values(), the lazy keys(), values() and items() views,
+# #     and __iter__() (through independent HashMapIterator objects), the
+# #     single-probe upsert(), setdefault() and increment(), along with the
+# #     bulk operations put_many(), get_many(), remove_many() and
+# #     from_items(), and compact() to purge tombstones in place. Capacities,
+# #     growth and the load factor limit come from a capacity policy (see
+# #     hash_map_policy), and stats() reports the table's shape and (after
+# #     enable_stats()) operation counters. dump() and load() save and
+# #     restore the table's exact layout (see hash_map_dump). SnapshotHashMap
+# #     hands readers O(1), copy-on-write snapshots of its table.
+
+import time
+from array import array
+from itertools import islice
 from typing import Tuple, Any
 
 from a6_include import (DynamicArray, DynamicArrayException, HashEntry,
                         hash_function_1, hash_function_2)
+from hash_map_dump import TableDump, write_dump, read_dump, gc_paused
+from hash_map_hashes import BATCH_CHUNK
+from hash_map_policy import DEFAULT_POLICY
+from hash_map_stats import HashMapStats
+from hash_map_views import KeysView, ValuesView, ItemsView
 
 
 class HashMap:
-    def __init__(self, capacity: int, function) -> None:
+    # Load factor (live entries plus tombstones) the table is kept below,
+    #   unless the policy gives its own.
+    _max_load = 0.5
+
+    def __init__(self, capacity: int, function,
+                 compact_fraction: float = 0.25,
+                 shrink_load: float = None,
+                 policy=None) -> None:
         """
         Initialize new HashMap that uses
         quadratic probing for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+
+        Once tombstones fill more than compact_fraction of the table, they are
+        purged in place (see compact()). If shrink_load is given, removals
+        that drop the load factor below it shrink the table (never below its
+        starting capacity). It should be well under _max_load divided by the
+        policy's growth factor, so a shrunk table is not about to grow again.
+        The policy (see hash_map_policy) defaults to prime capacities that
+        double on growth.
         """
-        self._buckets = DynamicArray()
+        self._set_policy(policy)
 
-        # capacity must be a prime number
-        self._capacity = self._next_prime(capacity)
-        for _ in range(self._capacity):
-            self._buckets.append(None)
+        # capacity must be one the policy allows (a prime number by default)
+        self._capacity = self._policy.initial_capacity(capacity)
+        self._buckets = DynamicArray([None] * self._capacity)
 
-        self._hash_function = function
+        self._hash_function = self._policy.hasher(function)
         self._size = 0
 
+        # Removed entries still occupy their slot (as a tombstone) until the
+        #   table is compacted or resized.
+        self._tombstones = 0
+        self._compact_fraction = compact_fraction
+
+        self._shrink_load = shrink_load
+        self._min_capacity = self._capacity
+
+        # Operation counters, only kept while enable_stats() is in effect.
+        self._stats = None
+
+        # Counts every change that moves entries between slots, so that
+        #   iterators can tell their position is no longer valid.
+        self._version = 0
+
     def __str__(self) -> str:
         """
         Override string method to provide more readable output
@@ -88,55 +133,1884 @@ class HashMap:
 
         return True
 
+    def _set_policy(self, policy) -> None:
+        """
+        Takes on the given capacity policy (or the default one when None),
+        along with its load factor limit if it has one.
+
+        :param policy: A capacity policy, or None.
+        :return: None -- manipulates HM directly.
+        """
+        self._policy = DEFAULT_POLICY if policy is None else policy
+        if self._policy.max_load is not None:
+            self._max_load = self._policy.max_load
+        self._check_max_load()
+
+    def _check_max_load(self) -> None:
+        """
+        Raises ValueError if _max_load would let the table fill every slot a
+        key's probe sequence can reach (about half of them, for quadratic
+        probing of a prime capacity), as put() then could not find a slot.
+
+        (No params)
+        :return: None
+        """
+        if not 0 < self._max_load < 1 or \
+                self._max_load > self._policy.probe_reach:
+            raise ValueError(f"max_load {self._max_load} is too high to "
+                             f"probe with {type(self._policy).__name__}")
+
     def get_size(self) -> int:
         """
-        Return size of map
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        Return size of map
+        DO NOT CHANGE THIS METHOD IN ANY WAY
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        DO NOT CHANGE THIS METHOD IN ANY WAY
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    @classmethod
+    def from_items(cls, items, size_hint: int = None,
+                   function: callable = hash_function_1,
+                   policy=None) -> "HashMap":
+        """
+        Builds a new HM from an iterable of (key, value) pairs. The table is
+        sized once, to the capacity that keeps size_hint keys under our load
+        factor limit (0.5 by default), so filling it never triggers a resize.
+
+        If no size_hint is given, items is read fully first to count it. If
+        items turns out to hold more pairs than size_hint, the table simply
+        grows as it would through put().
+
+        :param items: An iterable of (key, value) pairs.
+        :param size_hint: The expected number of distinct keys in items.
+        :param function: The hash function for the new HM.
+        :param policy: The capacity policy for the new HM.
+        :return: A new HashMap holding every pair.
+        """
+        # Step 1) Works out how many keys the table needs to hold.
+        if size_hint is None:
+            items = list(items)
+            size_hint = len(items)
+
+        # Step 2) Creates the HM at its final capacity.
+        max_load = cls._max_load
+        if policy is not None and policy.max_load is not None:
+            max_load = policy.max_load
+        new_map = cls(int(size_hint / max_load) + 1, function, policy=policy)
+
+        # Step 3) Fills it a chunk at a time, so each chunk's keys are hashed
+        #   in one batch without holding a generator's pairs all at once.
+        items = iter(items)
+        chunk = list(islice(items, BATCH_CHUNK))
+        while chunk:
+            new_map.put_many(chunk)
+            chunk = list(islice(items, BATCH_CHUNK))
+
+        return new_map
+
+    def quad_prob(self, key, job, hash_val: int = None) -> int:
+        """
+        Returns a viable index of a non-occupied slot in our DA. Uses the
+        index provided to assess where the Hash Entry should go based on our
+        hash function as a starting place. If key is used, hunts for key.
+
+        The key is hashed once (or not at all if hash_val is given), and each
+        occupied slot's cached hash is compared before its key.
+        """
+        # Initializes start_j as 0. Increments this each loop. The gap to
+        #   the next probe grows by our policy's probe_step each loop, giving
+        #   quadratic (or triangular) probing of our j-value.
+        start_j, gap = 0, 1
+        step = self._policy.probe_step
+
+        if hash_val is None:
+            hash_val = self._hash_function(key)
+
+        # Temporarily stores our buckets and our capacity locally
+        buckets = self._buckets
+        cap = self._capacity
+        index = self._policy.index
+
+        # The new index, will be with quadratic probing of our j-value.
+        new_i = index(hash_val, cap)
+
+        # For put() specifically, we skip over tombstones until we hit None
+        #   OR the key we're dealing with (if it already exists). A new key
+        #   then reuses the first tombstone we passed, if any.
+        # -- Puts always leave at least one None slot within the first
+        #   probe_limit(cap) probes, so this loop ends. (The gap has grown by
+        #   step once per slot probed past the first.)
+        if job == 'put':
+            first_tombstone = None
+            while buckets[new_i]:
+                an_entry = buckets[new_i]
+                if an_entry.is_tombstone:
+                    if first_tombstone is None:
+                        first_tombstone = new_i
+                elif an_entry.hash_val == hash_val and an_entry.key == key:
+                    if self._stats is not None:
+                        self._stats.probed((gap - 1) // step + 1)
+                    return new_i
+                new_i = (new_i + gap) % cap
+                gap += step
+
+            if self._stats is not None:
+                self._stats.probed((gap - 1) // step + 1)
+            return new_i if first_tombstone is None else first_tombstone
+
+        # For get() or remove(), we'll skip over tombstones until we hit None.
+        # -- Past probe_limit(cap) probes (j = cap // 2, for primes) the probe
+        #   sequence only repeats itself, so we stop there even in a table
+        #   with no None slot left. The index we return then holds some other
+        #   key.
+        limit = self._policy.probe_limit(cap)
+        while buckets[new_i] and (buckets[new_i].hash_val != hash_val or
+                                  buckets[new_i].key != key) \
+                and start_j < limit:
+            start_j += 1
+            new_i = (new_i + gap) % cap
+            gap += step
+
+        if self._stats is not None:
+            self._stats.probed(start_j + 1)
+        return new_i
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Takes a key / value pair and either updates it (in the case that the
+        key already exists), or adds it (in the case that it doesn't) to our
+        HM.
+
+        :param key: The key of our node.
+        :param value: The value of our node.
+        :return: None -- manipulates HM directly.
+        """
+        # Step 1) Makes room for one more key. In a open-address HM, load
+        #   factor (counting tombstones) cannot exceed _max_load (0.5 by
+        #   default).
+        self._reserve(1)
+
+        # Step 2) Puts the key through the hash function, then places it.
+        size = self._size
+        self._put_hashed(key, value, self._hash_function(key))
+
+        if self._stats is not None:
+            self._stats.put(self._size == size)
+
+    def _put_hashed(self, key: str, value: object, hash_val: int) -> None:
+        """
+        Updates or adds a key / value pair whose hash is already known. Does
+        not check the load factor; callers are responsible for resizing.
+
+        :param key: The key of our entry.
+        :param value: The value of our entry.
+        :param hash_val: The (pre-modulo) hash of key.
+        :return: None -- manipulates HM directly.
+        """
+        # Step 1) Finds the index of said key by probing from its hash.
+        #   Assigns correct index value and determines if this is a node
+        #   rewrite.
+        hash_i = self.quad_prob(key, 'put', hash_val)
+
+        # If this is not a node rewrite, we increment size. If index holds
+        #   None or a tombstone, we won't have a re-write.
+        if not self._buckets[hash_i]:
+            self._size += 1
+        elif self._buckets[hash_i].is_tombstone:
+            self._size += 1
+            self._tombstones -= 1
+
+        self._buckets[hash_i] = HashEntry(key, value, hash_val)
+
+    def upsert(self, key: str, function: callable, default: object = None):
+        """
+        Replaces the value of key with function(value), or (in the case that
+        key doesn't exist) adds key with the value default. Either way, the
+        key is hashed and probed for only once, and an existing entry is
+        updated in place rather than replaced. If function is None, an
+        existing value is left as it is.
+
+        :param key: The key of our entry.
+        :param function: Called with the current value, returning the new one.
+        :param default: The value of key if it is added.
+        :return: The value now associated with key.
+        """
+        # Step 1) Makes room for one more key, exactly as put() does.
+        self._reserve(1)
+
+        # Step 2) Finds or creates the entry in one probe sequence.
+        size = self._size
+        value = self._upsert_hashed(key, function, default,
+                                    self._hash_function(key))
+
+        if self._stats is not None:
+            self._stats.put(self._size == size)
+        return value
+
+    def setdefault(self, key: str, default: object = None):
+        """
+        Returns the value of key, first adding key with the value default in
+        the case that it doesn't exist.
+
+        :param key: The key of our entry.
+        :param default: The value of key if it is added.
+        :return: The value now associated with key.
+        """
+        return self.upsert(key, None, default)
+
+    def increment(self, key: str, delta: int = 1):
+        """
+        Adds delta to the value of key, or adds key with the value delta in
+        the case that it doesn't exist.
+
+        :param key: The key of our entry.
+        :param delta: The amount to add.
+        :return: The value now associated with key.
+        """
+        return self.upsert(key, lambda value: value + delta, delta)
+
+    def _upsert_hashed(self, key: str, function: callable, default: object,
+                       hash_val: int):
+        """
+        Does the work of upsert() for a key whose hash is already known. Does
+        not check the load factor; callers are responsible for resizing.
+
+        :param key: The key of our entry.
+        :param function: Called with the current value, or None.
+        :param default: The value of key if it is added.
+        :param hash_val: The (pre-modulo) hash of key.
+        :return: The value now associated with key.
+        """
+        # -- For a put, quad_prob() only stops at a live entry if it holds
+        #   our key.
+        hash_i = self.quad_prob(key, 'put', hash_val)
+        an_entry = self._buckets[hash_i]
+        if an_entry and not an_entry.is_tombstone:
+            if function is not None:
+                an_entry.value = function(an_entry.value)
+            return an_entry.value
+
+        if an_entry:
+            self._tombstones -= 1
+        self._size += 1
+        self._buckets[hash_i] = HashEntry(key, default, hash_val)
+        return default
+
+    def _reserve(self, count: int) -> None:
+        """
+        Makes sure count new keys can be added without the load factor (live
+        entries plus tombstones) reaching _max_load. Grows the table if the
+        live entries alone need it to; otherwise just purges tombstones if
+        they are what's in the way.
+
+        :param count: The number of keys about to be added.
+        :return: None -- manipulates HM directly.
+        """
+        new_capacity = self._grown_capacity(self._capacity,
+                                            self._size + count)
+        if new_capacity != self._capacity:
+            self.resize_table(new_capacity)
+        elif self._tombstones and self._grown_capacity(
+                self._capacity, self._size + self._tombstones + count) \
+                != self._capacity:
+            self.compact()
+
+    def _reserve_many(self, count: int) -> None:
+        """
+        Like _reserve(), for the bulk methods, which need all of that room
+        in our buckets before they start placing keys.
+
+        :param count: The number of keys about to be added.
+        :return: None -- manipulates HM directly.
+        """
+        self._reserve(count)
+
+    def _hash_keys(self, keys) -> list:
+        """
+        Returns the hash of every key in keys, computed in one batch.
+
+        :param keys: A sequence of keys.
+        :return: A list of (pre-modulo) hashes, in the same order as keys.
+        """
+        return self._policy.hash_many(self._hash_function, keys)
+
+    def table_load(self) -> float:
+        """
+        Returns the current hash table load factor. Load factor is calculated
+        by dividing the number of elements stored in the table by the number
+        of buckets. LF = n/m.
+
+        This is a O(1) time complexity implementation.
+
+        (No params)
+        :return: The Load Factor of this HM
+        """
+        # Stores the number of elements in the table as "n".
+        n = self._size
+
+        # Stores the number of buckets in the table as "m".
+        # -- m will never be 0 in this case as any time a new HM is initialized
+        # -- it will default to capacity 1 or greater.
+        m = self._capacity
+
+        load_factor = n / m
+
+        # Returns load factor
+        return load_factor
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of empty buckets currently in our HM.
+
+        (No Params)
+        :return: The number of empty buckets (an integer)
+        """
+        # Stores the number of buckets available here.
+        curr_buckets = self._capacity
+
+        # Stores the number of items in the HM, and the number of slots
+        #   still held by tombstones.
+        curr_size = self._size
+        curr_tombstones = self._tombstones
+
+        # Returns the number of buckets minus those in use.
+        return curr_buckets - curr_size - curr_tombstones
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Changes the capacity of the internal hash table. This does nothing to
+        change the existing key/value pairs that already exist, but does re-
+        hash these pairs into new locations and buckets.
+
+        This does nothing if the new_capacity is less than it's size and will
+        only re-size the HM to capacities our policy allows (primes by
+        default).
+
+        :param new_capacity: The new capacity we're attempting to re-size to.
+        :return: None -- manipulates HM directly.
+        """
+        # Step 1) Checks that new_capacity is not less than 1. If so, returns
+        #   immediately.
+        if new_capacity < self._size:
+            return
+        start = time.perf_counter() if self._stats is not None else None
+
+        # Step 2) Makes sure that new_capacity is one our policy allows (a
+        #   prime number by default), rounding it up if not.
+        new_capacity = self._policy.round_up(new_capacity)
+
+        # -- Re-inserting through put() would keep doubling a table that is
+        #   too small for our current size, so settle on that final capacity
+        #   up front instead.
+        new_capacity = self._grown_capacity(new_capacity, self._size)
+
+        # Step 2A) Sets new_da to the capacity we're looking for.
+        new_da = DynamicArray()
+
+        for item in range(new_capacity):
+            new_da.append(None)
+
+        # Step 2B) Copies self._buckets to a new location for safe keeping.
+        temp_buckets = self._buckets
+
+        # Step 3) Swaps in new_da as our buckets. Size does not change, as
+        #   every live key in the old table is already unique, but tombstones
+        #   are left behind.
+        self._buckets = new_da
+        self._capacity = new_capacity
+        self._tombstones = 0
+        self._version += 1
+
+        # Step 4) Traverses entry-by-entry in our original HM, moving each
+        #   live entry as-is into our new buckets.
+        for bucket_i in range(temp_buckets.length()):
+            an_entry = temp_buckets[bucket_i]
+            if an_entry and not an_entry.is_tombstone:
+                self._place(an_entry)
+
+        if start is not None:
+            self._stats.resized(time.perf_counter() - start)
+
+    def _place(self, an_entry: HashEntry) -> None:
+        """
+        Moves a live entry into the first empty slot of its probe sequence,
+        using its cached hash. Only valid while the table holds no tombstones
+        and no other entry with the same key, so no key comparison (or
+        re-hash) is ever needed.
+
+        :param an_entry: The HashEntry to place.
+        :return: None -- manipulates HM directly.
+        """
+        buckets = self._buckets
+        cap = self._capacity
+        index = self._policy.index
+        hash_val = an_entry.hash_val
+
+        gap, step = 1, self._policy.probe_step
+        new_i = index(hash_val, cap)
+        while buckets[new_i]:
+            new_i = (new_i + gap) % cap
+            gap += step
+        buckets[new_i] = an_entry
+
+    def compact(self) -> None:
+        """
+        Purges every tombstone from the table in place, without changing its
+        capacity. Live entries are lifted out and placed again from their
+        cached hashes, so their probe sequences no longer pass over removed
+        keys.
+
+        (No params)
+        :return: None -- manipulates HM directly.
+        """
+        # Step 1) Empties every slot, keeping hold of the live entries.
+        buckets = self._buckets
+        live_entries = []
+        for bucket_i in range(self._capacity):
+            an_entry = buckets[bucket_i]
+            if an_entry is not None:
+                if not an_entry.is_tombstone:
+                    live_entries.append(an_entry)
+                buckets[bucket_i] = None
+
+        # Step 2) Places each live entry back into the now tombstone-free
+        #   table.
+        self._tombstones = 0
+        self._version += 1
+        for an_entry in live_entries:
+            self._place(an_entry)
+
+        if self._stats is not None:
+            self._stats.compactions += 1
+
+    def _grown_capacity(self, capacity: int, size: int) -> int:
+        """
+        Returns the capacity a table of the given size ends up with when its
+        entries are put() one at a time into a table of the given capacity,
+        growing (as our policy says) whenever the load factor reaches
+        _max_load. At least one slot is always left empty, however small the
+        table or high _max_load.
+
+        :param capacity: The capacity we start from.
+        :param size: The number of entries to be placed.
+        :return: The final capacity.
+        """
+        while size > 0 and ((size - 1) / capacity >= self._max_load or
+                            size >= capacity):
+            capacity = self._policy.grow(capacity)
+
+        return capacity
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value associated with the given key. If the key is not in
+        our HM, returns None.
+
+        :param key: The key we are ultimately looking for.
+        :return: The value associated with said key.
+        """
+        # Step 1) If HM is empty, immediately return None.
+        if self._size == 0:
+            if self._stats is not None:
+                self._stats.get(False)
+            return None
+
+        # Step 2) Finds the index of said key by putting it through the hash
+        #   function. Assigns correct index value.
+        hash_i = self.quad_prob(key, 'get')
+
+        # Step 3) Hunts through our buckets for this particular key, attempting
+        #   quadratic probing if the initial hash_i value does not exist.
+        # -- In this case, we've found the theoretical location of this key.
+        #   Check it. If it is None, the key doesn't exist, and if the key at
+        #   this index is not the key we're looking for, it probably DNE.
+        if self._buckets[hash_i] is None or self._buckets[hash_i].key != key \
+                or self._buckets[hash_i].is_tombstone:
+            if self._stats is not None:
+                self._stats.get(False)
+            return None
+
+        # If it does exist, return its value.
+        if self._stats is not None:
+            self._stats.get(True)
+        return self._buckets[hash_i].value
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns true if the given key is a part of our HM, and False if it is
+        not. If called on an empty HM, will return False.
+        """
+        # Attempts self.get(). If a value other than None occurs, return True
+        if self.get(key) is not None:
+            return True
+
+        # If None is the result, return False.
+        return False
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the given key and its associated value from the HM. If the key
+        is not in the HM, the method does nothing.
+        """
+        if self._stats is not None:
+            self._stats.removes += 1
+
+        # Step 1) If HM is empty, immediately return.
+        if self._size == 0:
+            return
+
+        # Step 2) Finds the index of said key by putting it through the hash
+        #   function. Assigns correct index value.
+        hash_i = self.quad_prob(key, 'remove')
+
+        # -- In this case, we've found the theoretical location of this key.
+        #   Check it. If it is None, the key doesn't exist, and if the key at
+        #   this index is not the key we're looking for, it probably DNE.
+        if self._buckets[hash_i] is None or self._buckets[hash_i].key != key \
+                or self._buckets[hash_i].is_tombstone:
+            return
+
+        # -- In this case, the HE exists. Make it a tombstone and decrement
+        #   size.
+        self._buckets[hash_i].is_tombstone = True
+        self._size -= 1
+        self._tombstones += 1
+
+        # -- Shrinks the table if it has emptied out (which also purges
+        #   tombstones), or else purges tombstones once they take up too
+        #   much of the table.
+        self._maybe_shrink()
+        if self._tombstones > self._compact_fraction * self._capacity:
+            self.compact()
+
+    def _maybe_shrink(self) -> None:
+        """
+        If a shrink_load was given and our load factor has dropped below it,
+        shrinks the table (as our policy says) as many times as it takes to
+        bring the load factor back up to it, without going below the
+        starting capacity.
+
+        (No params)
+        :return: None -- manipulates HM directly.
+        """
+        if self._shrink_load is None:
+            return
+
+        new_capacity = self._capacity
+        while self._size / new_capacity < self._shrink_load:
+            smaller = self._policy.shrink(new_capacity)
+            if smaller < self._min_capacity or smaller >= new_capacity:
+                break
+            new_capacity = smaller
+
+        if new_capacity != self._capacity:
+            self._shrink_to(new_capacity)
+
+    def _shrink_to(self, new_capacity: int) -> None:
+        """
+        Moves our entries into a smaller table of the given capacity.
+
+        :param new_capacity: The smaller capacity.
+        :return: None -- manipulates HM directly.
+        """
+        self.resize_table(new_capacity)
+
+    def clear(self) -> None:
+        """
+        Clears the contents of the hash map, but does not change the underlying
+        hash table capacity.
+
+        (No params)
+        :return: None.
+        """
+        # Stores current capacity locally.
+        curr_capacity = self._capacity
+
+        # Creation of a new DA
+        new_da = DynamicArray()
+
+        # Appends items to the end of DA until capacity is same as self.
+        for bucket in range(curr_capacity):
+            new_da.append(None)
+
+        # Uses this new_da as our new set of buckets.
+        self._buckets = new_da
+        self._version += 1
+
+        # Resets size (and tombstones) to 0 again.
+        self._size = 0
+        self._tombstones = 0
+
+    def put_many(self, items) -> None:
+        """
+        Puts every (key, value) pair from items into our HM, as if put() had
+        been called on each in turn. The table is grown once up front, every
+        key is hashed in one batch, and all pairs are placed in a single
+        probing loop.
+
+        :param items: An iterable of (key, value) pairs.
+        :return: None -- manipulates HM directly.
+        """
+        items = list(items)
+        if not items:
+            return
+
+        # Step 1) Grows (or compacts) the table once, so that it has room
+        #   for every pair even if each one is a new key.
+        keys = [key for key, _ in items]
+        self._reserve_many(len(set(keys)))
+
+        # Step 2) Hashes every key at once, then probes for each pair exactly
+        #   as quad_prob() does for put(), with everything held locally.
+        size = self._size
+        buckets = self._buckets
+        cap = self._capacity
+        index = self._policy.index
+        step = self._policy.probe_step
+        for (key, value), hash_val in zip(items, self._hash_keys(keys)):
+            gap = 1
+            new_i = index(hash_val, cap)
+            first_tombstone = None
+            an_entry = buckets[new_i]
+            while an_entry:
+                if an_entry.is_tombstone:
+                    if first_tombstone is None:
+                        first_tombstone = new_i
+                elif an_entry.hash_val == hash_val and an_entry.key == key:
+                    break
+                new_i = (new_i + gap) % cap
+                gap += step
+                an_entry = buckets[new_i]
+
+            if an_entry is None:
+                self._size += 1
+                if first_tombstone is not None:
+                    new_i = first_tombstone
+                    self._tombstones -= 1
+            buckets[new_i] = HashEntry(key, value, hash_val)
+
+        if self._stats is not None:
+            self._stats.put_many(len(items), self._size - size)
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Returns a DA of the value associated with each of the given keys (or
+        None for keys not in our HM), in the same order as keys. Every key is
+        hashed in one batch.
+
+        :param keys: An iterable of keys.
+        :return: A new Dynamic Array object hosting the values.
+        """
+        keys = list(keys)
+        new_da = DynamicArray()
+
+        if self._size == 0:
+            for _ in keys:
+                new_da.append(None)
+            if self._stats is not None:
+                self._stats.get_many(new_da)
+            return new_da
+
+        buckets = self._buckets
+        cap = self._capacity
+        index = self._policy.index
+        step = self._policy.probe_step
+        limit = self._policy.probe_limit(cap)
+        for key, hash_val in zip(keys, self._hash_keys(keys)):
+            start_j, gap = 0, 1
+            new_i = index(hash_val, cap)
+            an_entry = buckets[new_i]
+            while an_entry and (an_entry.hash_val != hash_val or
+                                an_entry.key != key) \
+                    and start_j < limit:
+                start_j += 1
+                new_i = (new_i + gap) % cap
+                gap += step
+                an_entry = buckets[new_i]
+
+            if an_entry is None or an_entry.key != key \
+                    or an_entry.is_tombstone:
+                new_da.append(None)
+            else:
+                new_da.append(an_entry.value)
+
+        if self._stats is not None:
+            self._stats.get_many(new_da)
+        return new_da
+
+    def remove_many(self, keys) -> None:
+        """
+        Removes each of the given keys (and its value) from our HM. Keys that
+        do not exist are ignored. Every key is hashed in one batch.
+
+        :param keys: An iterable of keys.
+        :return: None -- manipulates HM directly.
+        """
+        keys = list(keys)
+        if self._stats is not None:
+            self._stats.removes += len(keys)
+        if self._size == 0 or not keys:
+            return
+
+        for key, hash_val in zip(keys, self._hash_keys(keys)):
+            hash_i = self.quad_prob(key, 'remove', hash_val)
+            an_entry = self._buckets[hash_i]
+            if an_entry is not None and an_entry.key == key \
+                    and not an_entry.is_tombstone:
+                an_entry.is_tombstone = True
+                self._size -= 1
+                self._tombstones += 1
+
+        # -- Shrinks the table if it has emptied out, or else purges
+        #   tombstones once they take up too much of the table.
+        self._maybe_shrink()
+        if self._tombstones > self._compact_fraction * self._capacity:
+            self.compact()
+
+    def keys(self) -> KeysView:
+        """
+        Returns a lazy view of the keys in our HM.
+
+        (No Params)
+        :return: A KeysView over our HM.
+        """
+        return KeysView(self)
+
+    def values(self) -> ValuesView:
+        """
+        Returns a lazy view of the values in our HM.
+
+        (No Params)
+        :return: A ValuesView over our HM.
+        """
+        return ValuesView(self)
+
+    def items(self) -> ItemsView:
+        """
+        Returns a lazy view of the (key, value) pairs in our HM.
+
+        (No Params)
+        :return: An ItemsView over our HM.
+        """
+        return ItemsView(self)
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns a DA where each index contains a tuple of the key/value pairs
+        stored in our HM. To walk the pairs without copying them, loop over
+        items() instead.
+
+        (No Params)
+        :return: A new Dynamic Array object hosting tuples of all HM items.
+        """
+        new_da = DynamicArray()
+        for item in self.items():
+            new_da.append(item)
+        return new_da
+
+    def enable_stats(self) -> None:
+        """
+        Starts (or restarts, from 0) counting operations for stats().
+
+        (No params)
+        :return: None -- manipulates HM directly.
+        """
+        self._stats = HashMapStats()
+
+    def disable_stats(self) -> None:
+        """
+        Stops counting operations, and drops the counts so far.
+
+        (No params)
+        :return: None -- manipulates HM directly.
+        """
+        self._stats = None
+
+    def stats(self) -> dict:
+        """
+        Returns a plain dict describing our HM: its size, capacity, load
+        factor, empty buckets and tombstones, and the operation counters of
+        HashMapStats (all 0 unless enable_stats() is in effect). Probe
+        lengths are counted by quad_prob(), so the probing that put_many()
+        and get_many() do inline is not included.
+
+        (No params)
+        :return: A dict of statistic name to value.
+        """
+        stats = {
+            'enabled': self._stats is not None,
+            'size': self._size,
+            'capacity': self._capacity,
+            'table_load': self.table_load(),
+            'empty_buckets': self.empty_buckets(),
+            'tombstones': self._tombstones,
+        }
+        stats.update((self._stats or HashMapStats()).as_dict())
+        return stats
+
+    def dump(self, path: str) -> None:
+        """
+        Writes our HM to a binary file (see hash_map_dump), recording the
+        slot, state and cached hash of every entry along with its key and
+        value, so load() can put each back where it was.
+
+        :param path: The file to write.
+        :return: None
+        """
+        slots, states, hashes = array('Q'), bytearray(), array('Q')
+        keys, values = [], []
+
+        # -- The bucket DA's own list is read directly, once per slot.
+        for slot_i, an_entry in enumerate(self._buckets._data):
+            if an_entry is not None:
+                slots.append(slot_i)
+                states.append(TOMBSTONE if an_entry.is_tombstone else LIVE)
+                hashes.append(an_entry.hash_val)
+                keys.append(an_entry.key)
+                values.append(an_entry.value)
+
+        write_dump(path, self, slots, states, hashes, keys, values)
+
+    @classmethod
+    def load(cls, path: str, function: callable) -> "HashMap":
+        """
+        Returns a new HM holding the table dump() wrote to path, with the
+        same capacity and policy and every entry (tombstones included) in
+        the slot it was in, so no key is hashed or probed for. Settings not
+        saved (such as shrink_load) take their defaults.
+
+        Raises ValueError if the file was written by another class, or with
+        a hash function other than function.
+
+        :param path: The file to read.
+        :param function: The hash function the file was written with.
+        :return: A new HashMap.
+        """
+        with gc_paused():
+            table = read_dump(path, cls, function)
+            new_map = cls(table.capacity, function, policy=table.policy)
+            new_map._restore(table)
+        return new_map
+
+    def _restore(self, table: TableDump) -> None:
+        """
+        Replaces our (empty) table with the entries of a dump file, each in
+        its saved slot.
+
+        :param table: The contents of a dump file of our capacity.
+        :return: None -- manipulates HM directly.
+        """
+        slots = [None] * self._capacity
+        for slot_i, an_entry in zip(table.slots, map(
+                HashEntry, table.keys, table.values, table.hashes)):
+            slots[slot_i] = an_entry
+
+        # -- Tombstones are rare, so they are found by searching the states.
+        state_i = table.states.find(TOMBSTONE)
+        while state_i != -1:
+            slots[table.slots[state_i]].is_tombstone = True
+            state_i = table.states.find(TOMBSTONE, state_i + 1)
+
+        self._buckets = DynamicArray(slots)
+        self._size = table.size
+        self._tombstones = table.tombstones
+        self._version += 1
+
+    def __iter__(self) -> "HashMapIterator":
+        """
+        Create iterator for loop. Each loop gets an iterator of its own, so
+        loops over the same HM may run nested or interleaved.
+        """
+        return HashMapIterator(self)
+
+
+class HashMapIterator:
+    """
+    Iterator over the live entries of an open addressing HashMap, keeping
+    its own position. It raises RuntimeError if the map moves entries
+    between slots (on a resize, compact() or clear(), say) while it is in
+    use, rather than skipping or repeating entries.
+    """
+    __slots__ = ('_map', '_slots', '_slot_i', '_version')
+
+    def __init__(self, hash_map: HashMap) -> None:
+        """
+        Initialize a new iterator at the start of the given HashMap.
+        """
+        self._map = hash_map
+        self._slot_i = 0
+        self._version = hash_map._version
+
+        # -- The bucket DA's own list is scanned directly, rather than
+        #   through its bounds-checked __getitem__ once per slot. Any change
+        #   that replaces it also changes _version.
+        self._slots = hash_map._buckets._data
+
+    def __iter__(self) -> "HashMapIterator":
+        return self
+
+    def __next__(self) -> HashEntry:
+        """
+        Obtain the next live entry and advance iterator.
+        """
+        if self._map._version != self._version:
+            raise RuntimeError("HashMap was rearranged during iteration")
+
+        slots = self._slots
+        slot_i = self._slot_i
+        while slot_i < len(slots):
+            an_entry = slots[slot_i]
+            slot_i += 1
+            if an_entry is not None and not an_entry.is_tombstone:
+                self._slot_i = slot_i
+                return an_entry
+
+        self._slot_i = slot_i
+        raise StopIteration
+
+
+class RobinHoodHashMap(HashMap):
+    """
+    Open addressing HashMap that uses Robin Hood linear probing in place of
+    quadratic probing, with the same public API.
+
+    On insert, an entry that has probed further from its home slot takes the
+    slot of any resident that has probed less, and that resident moves on
+    instead. This keeps probe lengths short and even, so the table can run
+    at a much higher load factor. Lookups stop as soon as they have probed
+    further than the resident they're looking at, and remove() shifts later
+    entries back instead of leaving tombstones.
+    """
+
+    _max_load = 0.9
+
+    def __init__(self, capacity: int, function,
+                 max_load: float = None,
+                 shrink_load: float = None,
+                 policy=None) -> None:
+        """
+        Initialize new HashMap that uses Robin Hood linear probing for
+        collision resolution, kept below the given load factor (or else the
+        policy's, or 0.9), and shrunk below shrink_load (see HashMap).
+        """
+        super().__init__(capacity, function, shrink_load=shrink_load,
+                         policy=policy)
+        if max_load is not None:
+            self._max_load = max_load
+            self._check_max_load()
+
+    def _check_max_load(self) -> None:
+        """
+        Raises ValueError unless _max_load is between 0 and 1. Linear probing
+        reaches every slot, so any lower limit leaves put() a slot to find.
+
+        (No params)
+        :return: None
+        """
+        if not 0 < self._max_load < 1:
+            raise ValueError(f"max_load {self._max_load} must be between "
+                             f"0 and 1")
+
+    def _probe_distance(self, an_entry: HashEntry, slot_i: int) -> int:
+        """
+        Returns how far an entry sitting at slot_i is from its home slot.
+
+        :param an_entry: The HashEntry.
+        :param slot_i: The index it sits at.
+        :return: The number of slots past its home slot.
+        """
+        index = self._policy.index
+        return index(slot_i - index(an_entry.hash_val, self._capacity),
+                     self._capacity)
+
+    def quad_prob(self, key, job, hash_val: int = None) -> int:
+        """
+        Returns the index holding key, or (if key is not in our HM) an index
+        holding None or some other key. Despite the name this probes linearly,
+        stopping early once we have probed further than the resident entry,
+        as key could not be any further along.
+        """
+        if hash_val is None:
+            hash_val = self._hash_function(key)
+
+        buckets = self._buckets
+        cap = self._capacity
+        index = self._policy.index
+
+        distance = 0
+        new_i = index(hash_val, cap)
+        an_entry = buckets[new_i]
+        while an_entry is not None:
+            if an_entry.hash_val == hash_val and an_entry.key == key:
+                break
+            if self._probe_distance(an_entry, new_i) < distance:
+                break
+            distance += 1
+            new_i = (new_i + 1) % cap
+            an_entry = buckets[new_i]
+
+        if self._stats is not None:
+            self._stats.probed(distance + 1)
+        return new_i
+
+    def _put_hashed(self, key: str, value: object, hash_val: int) -> None:
+        """
+        Updates or adds a key / value pair whose hash is already known. Does
+        not check the load factor; callers are responsible for resizing.
+
+        :param key: The key of our entry.
+        :param value: The value of our entry.
+        :param hash_val: The (pre-modulo) hash of key.
+        :return: None -- manipulates HM directly.
+        """
+        # Step 1) If the key already exists, just updates its value.
+        hash_i = self.quad_prob(key, 'put', hash_val)
+        an_entry = self._buckets[hash_i]
+        if an_entry is not None and an_entry.hash_val == hash_val \
+                and an_entry.key == key:
+            an_entry.value = value
+            return
+
+        # Step 2) Otherwise, places a new entry.
+        self._place(HashEntry(key, value, hash_val))
+        self._size += 1
+
+    def _upsert_hashed(self, key: str, function: callable, default: object,
+                       hash_val: int):
+        """
+        Does the work of upsert() for a key whose hash is already known. Does
+        not check the load factor; callers are responsible for resizing.
+
+        :param key: The key of our entry.
+        :param function: Called with the current value, or None.
+        :param default: The value of key if it is added.
+        :param hash_val: The (pre-modulo) hash of key.
+        :return: The value now associated with key.
+        """
+        an_entry = self._buckets[self.quad_prob(key, 'put', hash_val)]
+        if an_entry is not None and an_entry.hash_val == hash_val \
+                and an_entry.key == key:
+            if function is not None:
+                an_entry.value = function(an_entry.value)
+            return an_entry.value
+
+        self._place(HashEntry(key, default, hash_val))
+        self._size += 1
+        return default
+
+    def _place(self, an_entry: HashEntry) -> None:
+        """
+        Places an entry whose key is not already in our HM, displacing any
+        resident that is closer to its home slot than the entry being carried
+        and carrying that resident on instead.
+
+        :param an_entry: The HashEntry to place.
+        :return: None -- manipulates HM directly.
+        """
+        buckets = self._buckets
+        cap = self._capacity
+        index = self._policy.index
+
+        distance = 0
+        new_i = index(an_entry.hash_val, cap)
+        while buckets[new_i] is not None:
+            resident_distance = self._probe_distance(buckets[new_i], new_i)
+            if resident_distance < distance:
+                buckets[new_i], an_entry = an_entry, buckets[new_i]
+                distance = resident_distance
+                self._version += 1
+            distance += 1
+            new_i = (new_i + 1) % cap
+
+        buckets[new_i] = an_entry
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the given key and its associated value from the HM. If the key
+        is not in the HM, the method does nothing.
+        """
+        if self._stats is not None:
+            self._stats.removes += 1
+        if self._size == 0:
+            return
+
+        self._remove_hashed(key, self._hash_function(key))
+        self._maybe_shrink()
+
+    def _remove_hashed(self, key: str, hash_val: int) -> None:
+        """
+        Removes a key whose hash is already known, if it is in our HM. Every
+        entry after it that isn't in its home slot is shifted back one slot,
+        so no tombstone is left behind.
+
+        :param key: The key to remove.
+        :param hash_val: The (pre-modulo) hash of key.
+        :return: None -- manipulates HM directly.
+        """
+        buckets = self._buckets
+        cap = self._capacity
+
+        # Step 1) Finds the key. If it isn't there, does nothing.
+        hash_i = self.quad_prob(key, 'remove', hash_val)
+        an_entry = buckets[hash_i]
+        if an_entry is None or an_entry.hash_val != hash_val \
+                or an_entry.key != key:
+            return
+
+        # Step 2) Shifts the entries that follow back by one, until we reach
+        #   an empty slot or an entry already in its home slot.
+        next_i = (hash_i + 1) % cap
+        while buckets[next_i] is not None and \
+                self._probe_distance(buckets[next_i], next_i) > 0:
+            buckets[hash_i] = buckets[next_i]
+            hash_i, next_i = next_i, (next_i + 1) % cap
+            self._version += 1
+
+        buckets[hash_i] = None
+        self._size -= 1
+
+    def put_many(self, items) -> None:
+        """
+        Puts every (key, value) pair from items into our HM, as if put() had
+        been called on each in turn. The table is grown once up front and
+        every key is hashed in one batch.
+
+        :param items: An iterable of (key, value) pairs.
+        :return: None -- manipulates HM directly.
+        """
+        items = list(items)
+        if not items:
+            return
+
+        keys = [key for key, _ in items]
+        self._reserve_many(len(set(keys)))
+
+        size = self._size
+        for (key, value), hash_val in zip(items, self._hash_keys(keys)):
+            self._put_hashed(key, value, hash_val)
+
+        if self._stats is not None:
+            self._stats.put_many(len(items), self._size - size)
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Returns a DA of the value associated with each of the given keys (or
+        None for keys not in our HM), in the same order as keys. Every key is
+        hashed in one batch.
+
+        :param keys: An iterable of keys.
+        :return: A new Dynamic Array object hosting the values.
+        """
+        keys = list(keys)
+        new_da = DynamicArray()
+
+        buckets = self._buckets
+        for key, hash_val in zip(keys, self._hash_keys(keys)):
+            an_entry = buckets[self.quad_prob(key, 'get', hash_val)]
+            if an_entry is None or an_entry.hash_val != hash_val \
+                    or an_entry.key != key:
+                new_da.append(None)
+            else:
+                new_da.append(an_entry.value)
+
+        if self._stats is not None:
+            self._stats.get_many(new_da)
+        return new_da
+
+    def remove_many(self, keys) -> None:
+        """
+        Removes each of the given keys (and its value) from our HM. Keys that
+        do not exist are ignored. Every key is hashed in one batch.
+
+        :param keys: An iterable of keys.
+        :return: None -- manipulates HM directly.
+        """
+        keys = list(keys)
+        if self._stats is not None:
+            self._stats.removes += len(keys)
+        if self._size == 0 or not keys:
+            return
+
+        for key, hash_val in zip(keys, self._hash_keys(keys)):
+            self._remove_hashed(key, hash_val)
+
+        self._maybe_shrink()
+
+
+# Slot states for ArrayHashMap.
+EMPTY, LIVE, TOMBSTONE = 0, 1, 2
+
+# ArrayHashMap stores hashes as unsigned 64-bit integers, so every hash is
+#   first reduced to its low 64 bits (a no-op for the provided functions).
+HASH_MASK = (1 << 64) - 1
+
+
+class EntryView:
+    """
+    A HashEntry-like view of one slot in an ArrayHashMap. Reads go straight
+    to the map's columns, so no entry object is kept per slot.
+    """
+
+    __slots__ = ('_map', '_slot_i')
+
+    def __init__(self, hash_map: "ArrayHashMap", slot_i: int) -> None:
+        """Initialize a view of the given slot."""
+        self._map = hash_map
+        self._slot_i = slot_i
+
+    @property
+    def key(self) -> str:
+        """Return the key in this slot."""
+        return self._map._keys[self._slot_i]
+
+    @property
+    def value(self) -> object:
+        """Return the value in this slot."""
+        return self._map._values[self._slot_i]
+
+    @property
+    def hash_val(self) -> int:
+        """Return the cached hash in this slot."""
+        return self._map._hashes[self._slot_i]
+
+    @property
+    def is_tombstone(self) -> bool:
+        """Return True if this slot holds a removed entry."""
+        return self._map._states[self._slot_i] == TOMBSTONE
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        return f"K: {self.key} V: {self.value} TS: {self.is_tombstone}"
+
+
+class ArrayHashMap(HashMap):
+    """
+    Open addressing HashMap (quadratic probing) that keeps its table as
+    parallel columns instead of a DA of HashEntry objects: keys and values
+    in lists, cached hashes in an unsigned 64-bit array and a one-byte state
+    (EMPTY, LIVE or TOMBSTONE) per slot in a bytearray.
+
+    Probing reads only the state and hash columns until a hash matches, and
+    updating an existing key writes its value in place rather than
+    allocating a new entry. Iterating yields EntryView objects, which read
+    like HashEntry objects.
+    """
+
+    def __init__(self, capacity: int, function,
+                 compact_fraction: float = 0.25,
+                 shrink_load: float = None,
+                 policy=None) -> None:
+        """
+        Initialize new HashMap that uses quadratic probing for collision
+        resolution, stored as parallel columns (see HashMap for the other
+        arguments).
+        """
+        super().__init__(capacity, function, compact_fraction, shrink_load,
+                         policy)
+
+        # -- Only the storage differs: the columns replace the bucket DA.
+        del self._buckets
+        self._allocate(self._capacity)
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        out = ''
+        for i in range(self._capacity):
+            slot = EntryView(self, i) if self._states[i] != EMPTY else None
+            out += str(i) + ': ' + str(slot) + '\n'
+        return out
+
+    def __repr__(self) -> str:
+        """Override string method to provide more readable output."""
+        return self.__str__()
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        Replaces our columns with empty ones of the given capacity.
+
+        :param capacity: The number of slots.
+        :return: None -- manipulates HM directly.
+        """
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+        self._hashes = array('Q', [0]) * capacity
+        self._states = bytearray(capacity)
+        self._version += 1
+
+    def quad_prob(self, key, job, hash_val: int = None) -> int:
+        """
+        Returns a viable index of a non-occupied slot in our columns, or the
+        index holding key. Only the state and hash columns are read until a
+        hash matches. As in HashMap, put() reuses the first tombstone passed
+        if key is not found, and get() / remove() give up after
+        probe_limit(cap) probes, returning the index of some other slot.
+        """
+        if hash_val is None:
+            hash_val = self._hash_function(key)
+        hash_val &= HASH_MASK
+
+        states = self._states
+        hashes = self._hashes
+        keys = self._keys
+        cap = self._capacity
+        index = self._policy.index
+
+        start_j, gap = 0, 1
+        step = self._policy.probe_step
+        new_i = index(hash_val, cap)
+
+        if job == 'put':
+            first_tombstone = None
+            while states[new_i] != EMPTY:
+                if states[new_i] == TOMBSTONE:
+                    if first_tombstone is None:
+                        first_tombstone = new_i
+                elif hashes[new_i] == hash_val and keys[new_i] == key:
+                    if self._stats is not None:
+                        self._stats.probed((gap - 1) // step + 1)
+                    return new_i
+                new_i = (new_i + gap) % cap
+                gap += step
+
+            if self._stats is not None:
+                self._stats.probed((gap - 1) // step + 1)
+            return new_i if first_tombstone is None else first_tombstone
+
+        limit = self._policy.probe_limit(cap)
+        while states[new_i] != EMPTY and start_j < limit:
+            if states[new_i] == LIVE and hashes[new_i] == hash_val \
+                    and keys[new_i] == key:
+                break
+            start_j += 1
+            new_i = (new_i + gap) % cap
+            gap += step
+
+        if self._stats is not None:
+            self._stats.probed(start_j + 1)
+        return new_i
+
+    def _holds(self, slot_i: int, key: str) -> bool:
+        """
+        Returns True if the given slot holds key as a live entry.
+
+        :param slot_i: An index returned by quad_prob().
+        :param key: The key looked for.
+        :return: True or False.
+        """
+        return self._states[slot_i] == LIVE and self._keys[slot_i] == key
+
+    def _put_hashed(self, key: str, value: object, hash_val: int) -> None:
+        """
+        Updates or adds a key / value pair whose hash is already known. Does
+        not check the load factor; callers are responsible for resizing.
+
+        :param key: The key of our entry.
+        :param value: The value of our entry.
+        :param hash_val: The (pre-modulo) hash of key.
+        :return: None -- manipulates HM directly.
+        """
+        hash_i = self.quad_prob(key, 'put', hash_val)
+
+        # An update only rewrites the value column.
+        state = self._states[hash_i]
+        if state != LIVE:
+            self._size += 1
+            if state == TOMBSTONE:
+                self._tombstones -= 1
+            self._states[hash_i] = LIVE
+            self._hashes[hash_i] = hash_val & HASH_MASK
+            self._keys[hash_i] = key
+
+        self._values[hash_i] = value
+
+    def _upsert_hashed(self, key: str, function: callable, default: object,
+                       hash_val: int):
+        """
+        Does the work of upsert() for a key whose hash is already known. Does
+        not check the load factor; callers are responsible for resizing.
+
+        :param key: The key of our entry.
+        :param function: Called with the current value, or None.
+        :param default: The value of key if it is added.
+        :param hash_val: The (pre-modulo) hash of key.
+        :return: The value now associated with key.
+        """
+        hash_i = self.quad_prob(key, 'put', hash_val)
+
+        state = self._states[hash_i]
+        if state == LIVE:
+            if function is not None:
+                self._values[hash_i] = function(self._values[hash_i])
+            return self._values[hash_i]
+
+        self._size += 1
+        if state == TOMBSTONE:
+            self._tombstones -= 1
+        self._states[hash_i] = LIVE
+        self._hashes[hash_i] = hash_val & HASH_MASK
+        self._keys[hash_i] = key
+        self._values[hash_i] = default
+        return default
+
+    def _place(self, key: str, value: object, hash_val: int) -> None:
+        """
+        Writes a live entry into the first empty slot of its probe sequence.
+        Only valid while the table holds no tombstones and no other entry
+        with the same key.
+
+        :param key: The key of the entry.
+        :param value: The value of the entry.
+        :param hash_val: The cached (64-bit) hash of key.
+        :return: None -- manipulates HM directly.
+        """
+        states = self._states
+        cap = self._capacity
+        index = self._policy.index
+
+        gap, step = 1, self._policy.probe_step
+        new_i = index(hash_val, cap)
+        while states[new_i] != EMPTY:
+            new_i = (new_i + gap) % cap
+            gap += step
+
+        states[new_i] = LIVE
+        self._hashes[new_i] = hash_val
+        self._keys[new_i] = key
+        self._values[new_i] = value
+
+    def _live_columns(self) -> zip:
+        """
+        Returns (key, value, hash) for every live slot, taken from our current
+        columns.
+
+        (No params)
+        :return: A zip over the live slots' keys, values and hashes.
+        """
+        live_i = [i for i, state in enumerate(self._states) if state == LIVE]
+        return zip([self._keys[i] for i in live_i],
+                   [self._values[i] for i in live_i],
+                   [self._hashes[i] for i in live_i])
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Changes the capacity of the internal hash table, moving every live
+        entry into new columns by its cached hash. Does nothing if
+        new_capacity is less than our size, and only re-sizes to capacities
+        our policy allows.
+
+        :param new_capacity: The new capacity we're attempting to re-size to.
+        :return: None -- manipulates HM directly.
+        """
+        if new_capacity < self._size:
+            return
+        start = time.perf_counter() if self._stats is not None else None
+
+        new_capacity = self._policy.round_up(new_capacity)
+        new_capacity = self._grown_capacity(new_capacity, self._size)
+        self._rebuild(new_capacity)
+
+        if start is not None:
+            self._stats.resized(time.perf_counter() - start)
+
+    def _rebuild(self, new_capacity: int) -> None:
+        """
+        Moves every live entry into new, tombstone-free columns of the given
+        (allowed) capacity.
+
+        :param new_capacity: The capacity of the new columns.
+        :return: None -- manipulates HM directly.
+        """
+        live = self._live_columns()
+        self._capacity = new_capacity
+        self._allocate(new_capacity)
+        self._tombstones = 0
+        for key, value, hash_val in live:
+            self._place(key, value, hash_val)
+
+    def compact(self) -> None:
+        """
+        Purges every tombstone from the table without changing its capacity.
+
+        (No params)
+        :return: None -- manipulates HM directly.
+        """
+        self._rebuild(self._capacity)
+
+        if self._stats is not None:
+            self._stats.compactions += 1
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value associated with the given key. If the key is not in
+        our HM, returns None.
+        """
+        if self._size == 0:
+            if self._stats is not None:
+                self._stats.get(False)
+            return None
+
+        hash_i = self.quad_prob(key, 'get')
+        hit = self._holds(hash_i, key)
+        if self._stats is not None:
+            self._stats.get(hit)
+        return self._values[hash_i] if hit else None
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the given key and its associated value from the HM. If the key
+        is not in the HM, the method does nothing.
+        """
+        if self._stats is not None:
+            self._stats.removes += 1
+        if self._size == 0:
+            return
+
+        self._remove_hashed(key, self._hash_function(key))
+        self._maybe_shrink()
+        if self._tombstones > self._compact_fraction * self._capacity:
+            self.compact()
+
+    def _remove_hashed(self, key: str, hash_val: int) -> None:
+        """
+        Turns the slot holding key (whose hash is already known) into a
+        tombstone, if key is in our HM.
+
+        :param key: The key to remove.
+        :param hash_val: The (pre-modulo) hash of key.
+        :return: None -- manipulates HM directly.
+        """
+        hash_i = self.quad_prob(key, 'remove', hash_val)
+        if not self._holds(hash_i, key):
+            return
+
+        self._states[hash_i] = TOMBSTONE
+        self._keys[hash_i] = None
+        self._values[hash_i] = None
+        self._size -= 1
+        self._tombstones += 1
+
+    def clear(self) -> None:
+        """
+        Clears the contents of the hash map, but does not change the underlying
+        hash table capacity.
+        """
+        self._allocate(self._capacity)
+        self._size = 0
+        self._tombstones = 0
+
+    def put_many(self, items) -> None:
+        """
+        Puts every (key, value) pair from items into our HM, as if put() had
+        been called on each in turn. The table is grown once up front and
+        every key is hashed in one batch.
+
+        :param items: An iterable of (key, value) pairs.
+        :return: None -- manipulates HM directly.
+        """
+        items = list(items)
+        if not items:
+            return
+
+        keys = [key for key, _ in items]
+        self._reserve_many(len(set(keys)))
+
+        size = self._size
+        for (key, value), hash_val in zip(items, self._hash_keys(keys)):
+            self._put_hashed(key, value, hash_val)
+
+        if self._stats is not None:
+            self._stats.put_many(len(items), self._size - size)
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Returns a DA of the value associated with each of the given keys (or
+        None for keys not in our HM), in the same order as keys. Every key is
+        hashed in one batch.
+
+        :param keys: An iterable of keys.
+        :return: A new Dynamic Array object hosting the values.
+        """
+        keys = list(keys)
+        new_da = DynamicArray()
+
+        for key, hash_val in zip(keys, self._hash_keys(keys)):
+            hash_i = self.quad_prob(key, 'get', hash_val)
+            new_da.append(self._values[hash_i]
+                          if self._holds(hash_i, key) else None)
+
+        if self._stats is not None:
+            self._stats.get_many(new_da)
+        return new_da
+
+    def remove_many(self, keys) -> None:
+        """
+        Removes each of the given keys (and its value) from our HM. Keys that
+        do not exist are ignored. Every key is hashed in one batch.
+
+        :param keys: An iterable of keys.
+        :return: None -- manipulates HM directly.
+        """
+        keys = list(keys)
+        if self._stats is not None:
+            self._stats.removes += len(keys)
+        if self._size == 0 or not keys:
+            return
+
+        for key, hash_val in zip(keys, self._hash_keys(keys)):
+            self._remove_hashed(key, hash_val)
+
+        self._maybe_shrink()
+        if self._tombstones > self._compact_fraction * self._capacity:
+            self.compact()
+
+    def dump(self, path: str) -> None:
+        """
+        Writes our HM to a binary file (see HashMap.dump()), taking each
+        column's occupied slots as they are.
+
+        :param path: The file to write.
+        :return: None
+        """
+        used_i = [i for i, state in enumerate(self._states) if state != EMPTY]
+        write_dump(path, self, array('Q', used_i),
+                   bytes(self._states[i] for i in used_i),
+                   array('Q', [self._hashes[i] for i in used_i]),
+                   [self._keys[i] for i in used_i],
+                   [self._values[i] for i in used_i])
+
+    def _restore(self, table: TableDump) -> None:
+        """
+        Replaces our (empty) columns with the entries of a dump file, each in
+        its saved slot.
+
+        :param table: The contents of a dump file of our capacity.
+        :return: None -- manipulates HM directly.
+        """
+        self._allocate(self._capacity)
+        for slot_i, state, hash_val, key, value in zip(
+                table.slots, table.states, table.hashes,
+                table.keys, table.values):
+            self._states[slot_i] = state
+            self._hashes[slot_i] = hash_val
+            self._keys[slot_i] = key
+            self._values[slot_i] = value
+
+        self._size = table.size
+        self._tombstones = table.tombstones
+
+    def __iter__(self):
+        """
+        Create iterator for loop, yielding an EntryView for each live slot.
+        Like HashMapIterator, it raises RuntimeError if the columns are
+        rebuilt while it is in use.
+        """
+        version = self._version
+        states = self._states
+        for slot_i in range(len(states)):
+            if states[slot_i] == LIVE:
+                yield EntryView(self, slot_i)
+                if self._version != version:
+                    raise RuntimeError(
+                        "HashMap was rearranged during iteration")
+
+
+# Left in each drained slot of an IncrementalHashMap's old table. It acts as
+#   a tombstone, so probe sequences running through the slot carry on.
+MOVED = HashEntry(None, None)
+MOVED.is_tombstone = True
+
+
+class IncrementalHashMap(HashMap):
+    """
+    Open addressing HashMap that grows (and purges tombstones) incrementally
+    instead of all at once. When put() needs a bigger or cleaner table, a new
+    bucket array is swapped in but the old one is kept, and every later
+    put(), get() and remove() moves at most rehash_step old slots across.
+    Until the old array is drained, keys are looked up in both.
+
+    Operations over the whole table (empty_buckets(), compact(), the bulk
+    methods, get_keys_and_values(), iterating, an explicit resize_table(),
+    printing) finish any migration in progress first.
+    """
+
+    def __init__(self, capacity: int, function,
+                 compact_fraction: float = 0.25,
+                 rehash_step: int = 16,
+                 shrink_load: float = None,
+                 policy=None) -> None:
+        """
+        Initialize new HashMap that uses quadratic probing for collision
+        resolution, moving rehash_step old slots per operation while it
+        grows (or shrinks, see HashMap).
+        """
+        super().__init__(capacity, function, compact_fraction, shrink_load,
+                         policy)
+        self._rehash_step = rehash_step
+
+        # The bucket array being drained (None when not growing), and the
+        #   index of its next slot to move. _tombstones only counts those in
+        #   our current buckets.
+        self._old_buckets = None
+        self._old_capacity = 0
+        self._rehash_i = 0
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        self._finish_rehash()
+        return super().__str__()
+
+    def __repr__(self) -> str:
+        """Override string method to provide more readable output."""
+        self._finish_rehash()
+        return super().__repr__()
+
+    def _start_rehash(self, new_capacity: int) -> None:
+        """
+        Swaps in an empty bucket array of (the smallest capacity our policy
+        allows of at least) new_capacity, keeping the current one to be
+        drained.
+
+        :param new_capacity: The capacity to move to.
+        :return: None -- manipulates HM directly.
         """
-        return self._size
+        self._finish_rehash()
 
-    def get_capacity(self) -> int:
+        new_capacity = self._policy.round_up(new_capacity)
+        if self._stats is not None:
+            if new_capacity == self._capacity:
+                self._stats.compactions += 1
+            else:
+                self._stats.resized(0.0)
+
+        self._old_buckets = self._buckets
+        self._old_capacity = self._capacity
+        self._rehash_i = 0
+
+        self._buckets = DynamicArray([None] * new_capacity)
+        self._capacity = new_capacity
+        self._tombstones = 0
+        self._version += 1
+
+    def _rehash_some(self, count: int = None) -> None:
         """
-        Return capacity of map
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        Moves the live entries of up to count (by default rehash_step) old
+        slots into our current buckets, by their cached hashes, leaving MOVED
+        behind.
+
+        :param count: The number of old slots to move.
+        :return: None -- manipulates HM directly.
         """
-        return self._capacity
+        if self._old_buckets is None:
+            return
 
-    # ------------------------------------------------------------------ #
+        start = time.perf_counter() if self._stats is not None else None
+        old_buckets = self._old_buckets
+        end = min(self._rehash_i + (count or self._rehash_step),
+                  self._old_capacity)
+
+        for bucket_i in range(self._rehash_i, end):
+            an_entry = old_buckets[bucket_i]
+            if an_entry is not None:
+                if not an_entry.is_tombstone:
+                    self._place(an_entry)
+                old_buckets[bucket_i] = MOVED
+
+        self._rehash_i = end
+        if end == self._old_capacity:
+            self._old_buckets = None
+            self._old_capacity = 0
+
+        # -- A migration's time is the total over all of its steps.
+        if start is not None:
+            self._stats.resize_seconds += time.perf_counter() - start
 
-    def quad_prob(self, key, job) -> int:
+    def _finish_rehash(self) -> None:
         """
-        Returns a viable index of a non-occupied slot in our DA. Uses the
-        index provided to assess where the Hash Entry should go based on our
-        hash function as a starting place. If key is used, hunts for key.
+        Moves every remaining old slot across, ending the migration.
+
+        (No params)
+        :return: None -- manipulates HM directly.
         """
-        # Initializes start_j as 1. Increments this each loop.
-        start_j = 0
+        if self._old_buckets is not None:
+            self._rehash_some(self._old_capacity)
 
-        # The new index, will be with quadratic probing of our j-value.
-        new_i = (self._hash_function(key) + start_j ** 2) % self._capacity
+    def _old_slot(self, key: str, hash_val: int) -> int:
+        """
+        Returns the index of key's live entry in the old buckets, or None if
+        it isn't there (or we aren't growing). Probes exactly as quad_prob()
+        does for get().
 
-        # Temporarily stores our buckets, our function and our capacity locally
-        buckets = self._buckets
-        hash_fun = self._hash_function
-        cap = self._capacity
+        :param key: The key looked for.
+        :param hash_val: The (pre-modulo) hash of key.
+        :return: An index into the old buckets, or None.
+        """
+        old_buckets = self._old_buckets
+        if old_buckets is None:
+            return None
 
-        # For put() specifically, we will stop looping for tombstones OR None
-        #   OR if the key we're dealing with already exists.
-        if job == 'put':
-            while buckets[new_i] and not buckets[new_i].is_tombstone \
-                    and buckets[new_i].key != key:
-                start_j += 1
-                new_i = (hash_fun(key) + start_j ** 2) % cap
+        cap = self._old_capacity
+        index = self._policy.index
+        start_j, gap = 0, 1
+        step = self._policy.probe_step
+        limit = self._policy.probe_limit(cap)
+        new_i = index(hash_val, cap)
+        while old_buckets[new_i] is not None and start_j < limit:
+            an_entry = old_buckets[new_i]
+            if not an_entry.is_tombstone and an_entry.hash_val == hash_val \
+                    and an_entry.key == key:
+                return new_i
+            start_j += 1
+            new_i = (new_i + gap) % cap
+            gap += step
 
-            return new_i
+        return None
 
-        # For get() or remove(), we'll skip over tombstones until we hit None.
-        while buckets[new_i] and buckets[new_i].key != key:
-            start_j += 1
-            new_i = (hash_fun(key) + start_j ** 2) % cap
+    def _reserve(self, count: int) -> None:
+        """
+        Makes sure count new keys can be added to our current buckets without
+        their load factor (counting entries still to move across, and
+        tombstones) reaching _max_load. Starts growing, or moving to a fresh
+        table of the same capacity to shed tombstones, if it would.
 
-        return new_i
+        :param count: The number of keys about to be added.
+        :return: None -- manipulates HM directly.
+        """
+        if self._old_buckets is not None:
+            if self._grown_capacity(self._capacity, self._size +
+                                    self._tombstones + count) \
+                    == self._capacity:
+                return
+            self._finish_rehash()
+
+        new_capacity = self._grown_capacity(self._capacity,
+                                            self._size + count)
+        if new_capacity != self._capacity:
+            self._start_rehash(new_capacity)
+        elif self._tombstones and self._grown_capacity(
+                self._capacity, self._size + self._tombstones + count) \
+                != self._capacity:
+            self._start_rehash(self._capacity)
+
+    def _reserve_many(self, count: int) -> None:
+        """
+        Makes room for count new keys as _reserve() does, then finishes the
+        migration, so put_many() (which only probes our current buckets)
+        finds every key there. Any growth this needs happens right away
+        rather than incrementally.
+
+        :param count: The number of keys about to be added.
+        :return: None -- manipulates HM directly.
+        """
+        self._reserve(count)
+        self._finish_rehash()
 
     def put(self, key: str, value: object) -> None:
         """
@@ -148,50 +2022,125 @@ class HashMap:
         :param value: The value of our node.
         :return: None -- manipulates HM directly.
         """
-        # Step 1) Checks the load factor of our HM at its current state. In a
-        #   open-address HM, load factor cannot exceed 0.5.
-        lf = self.table_load()
+        self._reserve(1)
+        self._rehash_some()
+
+        # A key still in the old buckets is updated where it is.
+        hash_val = self._hash_function(key)
+        old_i = self._old_slot(key, hash_val)
+        if old_i is not None:
+            self._old_buckets[old_i].value = value
+            updated = True
+        else:
+            size = self._size
+            self._put_hashed(key, value, hash_val)
+            updated = self._size == size
+
+        if self._stats is not None:
+            self._stats.put(updated)
+
+    def upsert(self, key: str, function: callable, default: object = None):
+        """
+        Replaces the value of key with function(value), or adds key with the
+        value default (see HashMap.upsert()), updating a key still in the old
+        buckets where it is.
+
+        :param key: The key of our entry.
+        :param function: Called with the current value, returning the new one.
+        :param default: The value of key if it is added.
+        :return: The value now associated with key.
+        """
+        self._reserve(1)
+        self._rehash_some()
+
+        hash_val = self._hash_function(key)
+        old_i = self._old_slot(key, hash_val)
+        if old_i is not None:
+            an_entry = self._old_buckets[old_i]
+            if function is not None:
+                an_entry.value = function(an_entry.value)
+            value = an_entry.value
+            updated = True
+        else:
+            size = self._size
+            value = self._upsert_hashed(key, function, default, hash_val)
+            updated = self._size == size
+
+        if self._stats is not None:
+            self._stats.put(updated)
+        return value
 
-        # -- If load factor is greater than 0.5, we need to resize.
-        if lf >= 0.5:
-            self.resize_table(self._capacity * 2)
+    def get(self, key: str) -> object:
+        """
+        Returns the value associated with the given key, looking in the old
+        buckets too while the HM is growing. If the key is not in our HM,
+        returns None.
 
-        # Step 2) Finds the index of said key by putting it through the hash
-        #   function. Assigns correct index value and determines if this is a
-        #   node rewrite.
-        hash_i = self.quad_prob(key, 'put')
+        :param key: The key we are ultimately looking for.
+        :return: The value associated with said key.
+        """
+        self._rehash_some()
+        if self._size == 0:
+            if self._stats is not None:
+                self._stats.get(False)
+            return None
 
-        # If this is not a node rewrite, we increment size. If index holds
-        #   None or a tombstone, we won't have a re-write.
-        if not self._buckets[hash_i] or \
-                self._buckets[hash_i].is_tombstone:
-            self._size += 1
+        hash_val = self._hash_function(key)
+        an_entry = self._buckets[self.quad_prob(key, 'get', hash_val)]
+        if an_entry is None or an_entry.is_tombstone or an_entry.key != key:
+            old_i = self._old_slot(key, hash_val)
+            an_entry = self._old_buckets[old_i] if old_i is not None else None
 
-        self._buckets[hash_i] = HashEntry(key, value)
+        if self._stats is not None:
+            self._stats.get(an_entry is not None)
+        return an_entry.value if an_entry is not None else None
 
-    def table_load(self) -> float:
+    def remove(self, key: str) -> None:
         """
-        Returns the current hash table load factor. Load factor is calculated
-        by dividing the number of elements stored in the table by the number
-        of buckets. LF = n/m.
-
-        This is a O(1) time complexity implementation.
-
-        (No params)
-        :return: The Load Factor of this HM
+        Removes the given key and its associated value from the HM, looking in
+        the old buckets too while the HM is growing. If the key is not in the
+        HM, the method does nothing.
         """
-        # Stores the number of elements in the table as "n".
-        n = self._size
+        if self._stats is not None:
+            self._stats.removes += 1
+        self._rehash_some()
+        if self._size == 0:
+            return
 
-        # Stores the number of buckets in the table as "m".
-        # -- m will never be 0 in this case as any time a new HM is initialized
-        # -- it will default to capacity 1 or greater.
-        m = self._capacity
+        hash_val = self._hash_function(key)
+        an_entry = self._buckets[self.quad_prob(key, 'remove', hash_val)]
+        if an_entry is not None and not an_entry.is_tombstone \
+                and an_entry.key == key:
+            an_entry.is_tombstone = True
+            self._size -= 1
+            self._tombstones += 1
+
+            # -- Shrinks the table if it has emptied out, or else sheds
+            #   tombstones once they take up too much of the table, by
+            #   moving (gradually) to a fresh table of the same capacity.
+            self._maybe_shrink()
+            if self._old_buckets is None and \
+                    self._tombstones > self._compact_fraction * self._capacity:
+                self._start_rehash(self._capacity)
+            return
 
-        load_factor = n / m
+        # Old buckets are being drained, so their tombstones aren't counted.
+        old_i = self._old_slot(key, hash_val)
+        if old_i is not None:
+            self._old_buckets[old_i].is_tombstone = True
+            self._size -= 1
+            self._maybe_shrink()
 
-        # Returns load factor
-        return load_factor
+    def _shrink_to(self, new_capacity: int) -> None:
+        """
+        Starts moving our entries (incrementally) into a smaller table of the
+        given capacity, unless a migration is already in progress.
+
+        :param new_capacity: The smaller capacity.
+        :return: None -- manipulates HM directly.
+        """
+        if self._old_buckets is None:
+            self._start_rehash(new_capacity)
 
     def empty_buckets(self) -> int:
         """
@@ -200,208 +2149,310 @@ class HashMap:
         (No Params)
         :return: The number of empty buckets (an integer)
         """
-        # Stores the number of buckets available here.
-        curr_buckets = self._capacity
-
-        # Stores the number of items in the HM.
-        curr_size = self._size
+        self._finish_rehash()
+        return super().empty_buckets()
 
-        # Returns the number of buckets minus the number of HM items.
-        return curr_buckets - curr_size
+    def stats(self) -> dict:
+        """
+        Returns a plain dict describing our HM (see HashMap.stats()),
+        finishing any migration in progress first.
 
-    def resize_table(self, new_capacity: int) -> None:
+        (No params)
+        :return: A dict of statistic name to value.
         """
-        Changes the capacity of the internal hash table. This does nothing to
-        change the existing key/value pairs that already exist, but does re-
-        hash these pairs into new locations and buckets.
+        self._finish_rehash()
+        return super().stats()
 
-        This does nothing if the new_capacity is less than it's size and will
-        only re-size the HM to prime capacities.
+    def compact(self) -> None:
+        """
+        Purges every tombstone from the table in place right away, finishing
+        any migration in progress first.
 
-        :param new_capacity: The new capacity we're attempting to re-size to.
+        (No params)
         :return: None -- manipulates HM directly.
         """
-        # Step 1) Checks that new_capacity is not less than 1. If so, returns
-        #   immediately.
-        if new_capacity < self._size:
-            return
+        self._finish_rehash()
+        super().compact()
 
-        # Step 2) Makes sure that new_capacity is a prime number. Uses is_prime
-        #   and next_prime to accomplish.
-        if not self._is_prime(new_capacity):
-            new_capacity = self._next_prime(new_capacity)
+    def clear(self) -> None:
+        """
+        Clears the contents of the hash map (dropping any old buckets still
+        being drained), but does not change the underlying hash table
+        capacity.
 
-        # Step 2A) Sets new_da to the capacity we're looking for.
-        new_da = DynamicArray()
+        (No params)
+        :return: None.
+        """
+        self._old_buckets = None
+        self._old_capacity = 0
+        super().clear()
 
-        for item in range(new_capacity):
-            new_da.append(None)
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Changes the capacity of the internal hash table right away, finishing
+        any migration in progress first.
 
-        # Step 2B) Copies self._buckets to a new location for safe keeping.
-        temp_buckets = self._buckets
+        :param new_capacity: The new capacity we're attempting to re-size to.
+        :return: None -- manipulates HM directly.
+        """
+        self._finish_rehash()
+        super().resize_table(new_capacity)
 
-        # Step 3) Resets all of HM to default values with new_da as our buckets
-        self._buckets = new_da
-        self._capacity = new_capacity
-        self._size = 0
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Returns a DA of the value associated with each of the given keys,
+        finishing any migration in progress first.
 
-        # Step 3) Traverses node-by-node in our original HM. For each node,
-        #   hashes item via put() into our new HM object.
+        :param keys: An iterable of keys.
+        :return: A new Dynamic Array object hosting the values.
+        """
+        self._finish_rehash()
+        return super().get_many(keys)
 
-        for bucket_i in range(temp_buckets.length()):
-            if temp_buckets[bucket_i] and \
-                    not temp_buckets[bucket_i].is_tombstone:
-                non_empty_bucket = temp_buckets[bucket_i]
-                self.put(non_empty_bucket.key, non_empty_bucket.value)
+    def remove_many(self, keys) -> None:
+        """
+        Removes each of the given keys (and its value) from our HM, finishing
+        any migration in progress first.
 
-    def get(self, key: str) -> object:
+        :param keys: An iterable of keys.
+        :return: None -- manipulates HM directly.
         """
-        Returns the value associated with the given key. If the key is not in
-        our HM, returns None.
+        self._finish_rehash()
+        super().remove_many(keys)
 
-        :param key: The key we are ultimately looking for.
-        :return: The value associated with said key.
+    def dump(self, path: str) -> None:
         """
-        # Step 1) If HM is empty, immediately return None.
-        if self._size == 0:
-            return None
+        Writes our HM to a binary file (see HashMap.dump()), finishing any
+        migration in progress first.
 
-        # Step 2) Finds the index of said key by putting it through the hash
-        #   function. Assigns correct index value.
-        hash_i = self.quad_prob(key, 'get')
+        :param path: The file to write.
+        :return: None
+        """
+        self._finish_rehash()
+        super().dump(path)
 
-        # Step 3) Hunts through our buckets for this particular key, attempting
-        #   quadratic probing if the initial hash_i value does not exist.
-        # -- In this case, we've found the theoretical location of this key.
-        #   Check it. If it is None, the key doesn't exist, and if the key at
-        #   this index is not the key we're looking for, it probably DNE.
-        if self._buckets[hash_i] is None or self._buckets[hash_i].key != key \
-                or self._buckets[hash_i].is_tombstone:
-            return None
+    def __iter__(self):
+        """
+        Create iterator for loop, finishing any migration in progress first.
+        """
+        self._finish_rehash()
+        return super().__iter__()
+
+
+class SnapshotHashMap(HashMap):
+    """
+    Open addressing HashMap for tables that are read far more often than
+    they change. snapshot() hands out, in O(1), a read-only HashMapSnapshot
+    of the table as it stands; publish() makes one the snapshot that
+    published() returns to readers, with a single reference assignment.
+
+    A snapshot shares our bucket array rather than copying it. The first
+    change made after snapshot() copies the array (and its live entries,
+    which put() and remove() would otherwise update in place) before
+    touching it, so a snapshot never changes, or sees a resize, compact()
+    or clear() part way through. Readers of a snapshot take no lock; only
+    one thread should make changes.
+    """
+
+    def __init__(self, capacity: int, function,
+                 compact_fraction: float = 0.25,
+                 shrink_load: float = None,
+                 policy=None) -> None:
+        """
+        Initialize new HashMap that uses quadratic probing for collision
+        resolution (see HashMap), with no snapshot published yet.
+        """
+        super().__init__(capacity, function, compact_fraction, shrink_load,
+                         policy)
 
-        # If it does exist, return its value.
-        return self._buckets[hash_i].value
+        # The snapshot sharing our current buckets (None once they have been
+        #   copied), and the snapshot readers are handed.
+        self._snapshot = None
+        self._published = None
 
-    def contains_key(self, key: str) -> bool:
+    def snapshot(self) -> "HashMapSnapshot":
         """
-        Returns true if the given key is a part of our HM, and False if it is
-        not. If called on an empty HM, will return False.
+        Returns a read-only snapshot of our HM as it is now, in O(1).
+        Repeated calls with no change in between return the same snapshot.
+
+        (No params)
+        :return: A HashMapSnapshot.
         """
-        # Attempts self.get(). If a value other than None occurs, return True
-        if self.get(key) is not None:
-            return True
+        if self._snapshot is None:
+            self._snapshot = HashMapSnapshot(self)
+        return self._snapshot
 
-        # If None is the result, return False.
-        return False
+    def publish(self) -> "HashMapSnapshot":
+        """
+        Takes a snapshot of our HM and makes it the one published() returns.
 
-    def remove(self, key: str) -> None:
+        (No params)
+        :return: The published HashMapSnapshot.
         """
-        Removes the given key and its associated value from the HM. If the key
-        is not in the HM, the method does nothing.
+        self._published = self.snapshot()
+        return self._published
+
+    def published(self) -> "HashMapSnapshot":
         """
-        # Step 1) If HM is empty, immediately return.
-        if self._size == 0:
-            return
+        Returns the snapshot last published, without taking any lock.
 
-        # Step 2) Finds the index of said key by putting it through the hash
-        #   function. Assigns correct index value.
-        hash_i = self.quad_prob(key, 'remove')
+        (No params)
+        :return: A HashMapSnapshot, or None if none has been published.
+        """
+        return self._published
 
-        # -- In this case, we've found the theoretical location of this key.
-        #   Check it. If it is None, the key doesn't exist, and if the key at
-        #   this index is not the key we're looking for, it probably DNE.
-        if self._buckets[hash_i] is None or self._buckets[hash_i].key != key \
-                or self._buckets[hash_i].is_tombstone:
+    def _unshare(self) -> None:
+        """
+        Gives our HM a bucket array of its own, if a snapshot shares the
+        current one. Live entries are copied; tombstones are shared, as
+        nothing ever changes one.
+
+        (No params)
+        :return: None -- manipulates HM directly.
+        """
+        if self._snapshot is None:
             return
 
-        # -- In this case, the HE exists. Make it a tombstone and decrement
-        #   size.
-        self._buckets[hash_i].is_tombstone = True
-        self._size -= 1
+        # -- The old array's own list is read directly, once per slot.
+        self._buckets = DynamicArray([
+            an_entry if an_entry is None or an_entry.is_tombstone
+            else HashEntry(an_entry.key, an_entry.value, an_entry.hash_val)
+            for an_entry in self._buckets._data])
+        self._snapshot = None
+        self._version += 1
 
-    def clear(self) -> None:
+    def put(self, key: str, value: object) -> None:
         """
-        Clears the contents of the hash map, but does not change the underlying
-        hash table capacity.
+        Puts a key / value pair into our HM (see HashMap.put()), leaving
+        every snapshot as it is.
 
-        (No params)
-        :return: None.
+        :param key: The key of our entry.
+        :param value: The value of our entry.
+        :return: None -- manipulates HM directly.
         """
-        # Stores current capacity locally.
-        curr_capacity = self._capacity
-
-        # Creation of a new DA
-        new_da = DynamicArray()
+        self._unshare()
+        super().put(key, value)
 
-        # Appends items to the end of DA until capacity is same as self.
-        for bucket in range(curr_capacity):
-            new_da.append(None)
+    def upsert(self, key: str, function: callable, default: object = None):
+        """
+        Replaces the value of key with function(value), or adds key with the
+        value default (see HashMap.upsert()), leaving every snapshot as it is.
 
-        # Uses this new_da as our new set of buckets.
-        self._buckets = new_da
+        :param key: The key of our entry.
+        :param function: Called with the current value, returning the new one.
+        :param default: The value of key if it is added.
+        :return: The value now associated with key.
+        """
+        self._unshare()
+        return super().upsert(key, function, default)
 
-        # Resets size to 0 again.
-        self._size = 0
+    def remove(self, key: str) -> None:
+        """
+        Removes the given key and its associated value from the HM (see
+        HashMap.remove()), leaving every snapshot as it is.
 
-    def get_keys_and_values(self) -> DynamicArray:
+        :param key: The key of the entry we're looking to remove.
+        :return: None -- manipulates HM directly.
         """
-        Returns a DA where each index contains a tuple of the key/value pairs
-        stored in our HM.
+        self._unshare()
+        super().remove(key)
 
-        (No Params)
-        :return: A new Dynamic Array object hosting tuples of all HM items.
+    def put_many(self, items) -> None:
         """
-        # Creation of a new DA object:
-        new_da = DynamicArray()
+        Puts every (key, value) pair from items into our HM (see
+        HashMap.put_many()), leaving every snapshot as it is.
 
-        # Iterates through each index of our HM and appends those values into
-        # new HM.
-        for hash_entry in self:
-            new_da.append((hash_entry.key, hash_entry.value))
+        :param items: An iterable of (key, value) pairs.
+        :return: None -- manipulates HM directly.
+        """
+        self._unshare()
+        super().put_many(items)
 
-        # Returns new_da at end.
-        return new_da
+    def remove_many(self, keys) -> None:
+        """
+        Removes each of the given keys (and its value) from our HM (see
+        HashMap.remove_many()), leaving every snapshot as it is.
 
-    def __iter__(self):
+        :param keys: An iterable of keys.
+        :return: None -- manipulates HM directly.
         """
-        Create iterator for loop.
+        self._unshare()
+        super().remove_many(keys)
+
+    def resize_table(self, new_capacity: int) -> None:
         """
+        Changes the capacity of the internal hash table (see
+        HashMap.resize_table()), leaving every snapshot as it is.
 
-        # Creation of an index parameter.
-        self.da_i = 0
+        :param new_capacity: The new capacity we're attempting to re-size to.
+        :return: None -- manipulates HM directly.
+        """
+        self._unshare()
+        super().resize_table(new_capacity)
 
-        # As long as this index is less than capacity and either None or a
-        #   tombstone, skip ahead until we find a valid index.
-        while self.da_i < self._capacity and \
-                (not self._buckets[self.da_i] or
-                 self._buckets[self.da_i].is_tombstone):
-            self.da_i += 1
+    def compact(self) -> None:
+        """
+        Purges every tombstone from the table (see HashMap.compact()),
+        leaving every snapshot as it is.
 
-        # Return this.
-        return self
+        (No params)
+        :return: None -- manipulates HM directly.
+        """
+        self._unshare()
+        super().compact()
 
-    def __next__(self):
+    def clear(self) -> None:
         """
-        Obtain object at next index and advance iterator.
+        Clears the contents of the hash map, leaving every snapshot as it is.
+        A fresh bucket array is swapped in, so nothing needs copying.
+
+        (No params)
+        :return: None.
         """
-        # If this index value becomes greater than or equal to our capacity,
-        #   we've reached the end of the list. Stop.
-        if self.da_i >= self._capacity:
-            raise StopIteration
+        self._snapshot = None
+        super().clear()
 
-        # otherwise, test the value at this index and increment for next index.
-        value = self._buckets[self.da_i]
-        self.da_i += 1
 
-        # If this index is None, or a tombstone and less than capacity, find
-        #   valid next index (if not already so.)
-        while self.da_i < self._capacity and \
-                (not self._buckets[self.da_i] or
-                 self._buckets[self.da_i].is_tombstone):
-            self.da_i += 1
+class HashMapSnapshot:
+    """
+    Read-only view of a SnapshotHashMap's table at the moment snapshot() was
+    called. It answers lookups and iterates exactly as the HashMap did then,
+    probing the same shared bucket array, which nothing changes any more.
+    """
 
-        # Returns valid value.
-        return value
+    def __init__(self, hash_map: SnapshotHashMap) -> None:
+        """
+        Initialize a new snapshot of the given HashMap's current buckets.
+        """
+        self._buckets = hash_map._buckets
+        self._capacity = hash_map._capacity
+        self._size = hash_map._size
+        self._tombstones = hash_map._tombstones
+        self._hash_function = hash_map._hash_function
+        self._policy = hash_map._policy
+
+        # Nothing is counted, and nothing is ever rearranged.
+        self._stats = None
+        self._version = 0
+
+    # Lookups and iteration run HashMap's own code over our fields, as they
+    #   mean exactly what they do in a HashMap.
+    get_size = HashMap.get_size
+    get_capacity = HashMap.get_capacity
+    table_load = HashMap.table_load
+    empty_buckets = HashMap.empty_buckets
+    quad_prob = HashMap.quad_prob
+    get = HashMap.get
+    contains_key = HashMap.contains_key
+    get_many = HashMap.get_many
+    _hash_keys = HashMap._hash_keys
+    keys = HashMap.keys
+    values = HashMap.values
+    items = HashMap.items
+    get_keys_and_values = HashMap.get_keys_and_values
+    __iter__ = HashMap.__iter__
+    __str__ = HashMap.__str__
+    __repr__ = HashMap.__repr__
 
 
 # ------------------- BASIC TESTING ---------------------------------------- #
@@ -618,3 +2669,29 @@ if __name__ == "__main__":
     print(m)
     for item in m:
         print('K:', item.key, 'V:', item.value)
+
+    print("\nRobin Hood - put / get / remove example")
+    print("---------------------")
+    m = RobinHoodHashMap(11, hash_function_1)
+    for i in range(50):
+        m.put('str' + str(i), i * 100)
+    print(m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+    for i in range(0, 50, 2):
+        m.remove('str' + str(i))
+    result = True
+    for i in range(50):
+        result &= m.get('str' + str(i)) == (None if i % 2 == 0 else i * 100)
+    print(result, m.get_size(), m.empty_buckets())
+
+    print("\nArrayHashMap - put / get / remove example")
+    print("---------------------")
+    m = ArrayHashMap(11, hash_function_1)
+    for i in range(50):
+        m.put('str' + str(i), i * 100)
+    for i in range(0, 50, 2):
+        m.remove('str' + str(i))
+    result = True
+    for i in range(50):
+        result &= m.get('str' + str(i)) == (None if i % 2 == 0 else i * 100)
+    print(result, m.get_size(), m.get_capacity(), m.empty_buckets())
+    print(m.get_keys_and_values())
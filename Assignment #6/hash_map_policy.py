@@ -0,0 +1,311 @@
+# Course: CS261 - Data Structures
+# Assignment: Assignment #6: Hash Map
+# Description: Capacity policies for the Separate Chaining and Open
+# # -- Addressing Hash Maps. A policy decides which capacities a table may
+# #     have, how far it grows or shrinks at a time, how keys are hashed
+# #     into slots, and (optionally) the load factor it is kept below.
+# #
+# #     PrimePolicy is the default, and gives the same tables as before:
+# #     prime capacities, doubled on growth, indexed by hash modulo the
+# #     capacity and probed quadratically (j ** 2). PowerOfTwoPolicy uses
+# #     power-of-two capacities, indexed by masking off the low bits of the
+# #     hash. It first mixes each hash with a Fibonacci multiplier so every
+# #     bit of it reaches those low bits, and probes triangularly
+# #     (j * (j + 1) / 2), which visits every slot of a power-of-two table.
+
+from bisect import bisect_left
+
+from hash_map_hashes import hash_batch
+
+
+# 2 ** 64 divided by the golden ratio (rounded to odd), for Fibonacci hashing.
+FIBONACCI_MULTIPLIER = 0x9E3779B97F4A7C15
+MASK_64 = (1 << 64) - 1
+
+# The ladder only goes up to tables far larger than memory allows.
+_LADDER_CEILING = 1 << 32
+
+
+def _is_prime(number: int) -> bool:
+    """
+    Determine if given integer is a prime number and return boolean.
+
+    :param number: The integer to test.
+    :return: True if number is prime.
+    """
+    if number == 2 or number == 3:
+        return True
+
+    if number < 2 or number % 2 == 0:
+        return False
+
+    factor = 3
+    while factor * factor <= number:
+        if number % factor == 0:
+            return False
+        factor += 2
+
+    return True
+
+
+def fibonacci_mix(hash_val: int) -> int:
+    """
+    Multiplies hash_val by the Fibonacci multiplier (mod 2 ** 64) and keeps
+    the upper 32 bits of the product, each of which depends on every lower
+    bit of hash_val.
+
+    :param hash_val: A (non-negative) hash.
+    :return: The mixed, 32-bit hash.
+    """
+    return (hash_val * FIBONACCI_MULTIPLIER & MASK_64) >> 32
+
+
+def _next_prime(number: int) -> int:
+    """
+    Returns the smallest prime at least as large as number (3 if number is
+    1 or less), by trial division.
+
+    :param number: The integer to start from.
+    :return: A prime.
+    """
+    prime = number if number == 2 else max(number, 3) | 1
+    while not _is_prime(prime):
+        prime += 2
+    return prime
+
+
+def _build_prime_ladder() -> tuple:
+    """
+    Returns the ladder of primes a table of 2 slots climbs as it doubles:
+    each rung is the smallest prime at or above twice the one before, up
+    to _LADDER_CEILING. The default tables (of 11 slots, say) grow along it.
+
+    (No params)
+    :return: A tuple of increasing primes.
+    """
+    ladder = [2]
+    while ladder[-1] < _LADDER_CEILING:
+        ladder.append(_next_prime(2 * ladder[-1]))
+    return tuple(ladder)
+
+
+PRIME_LADDER = _build_prime_ladder()
+
+
+class MixedHash:
+    """
+    Wraps a hash function so that each hash it returns is passed through
+    fibonacci_mix(). The original function is kept as .function, so keys can
+    still be hashed by it in batches.
+    """
+    __slots__ = ('function',)
+
+    def __init__(self, function: callable) -> None:
+        self.function = function
+
+    def __call__(self, key: str) -> int:
+        return fibonacci_mix(self.function(key))
+
+
+class CapacityPolicy:
+    """
+    Base class for capacity policies. Subclasses decide which capacities are
+    allowed (round_up()) and how keys are probed; the growth factor and load
+    factor limit are shared.
+    """
+
+    # How much the gap between consecutive probe offsets grows per probe: 2
+    #   gives the offsets j ** 2, 1 gives j * (j + 1) / 2.
+    probe_step = 2
+
+    # Fraction of a table's slots that one key's probe sequence reaches.
+    probe_reach = 0.5
+
+    def __init__(self, growth: float = 2, max_load: float = None) -> None:
+        """
+        Initialize a new policy that multiplies the capacity by growth each
+        time a table grows (and divides it by growth when it shrinks). If
+        max_load is given, tables grow once their load factor reaches it,
+        instead of at their own default (1 for SC, 0.5 for OA).
+        """
+        if growth <= 1:
+            raise ValueError("growth must be greater than 1")
+        if max_load is not None and max_load <= 0:
+            raise ValueError("max_load must be greater than 0")
+
+        self.growth = growth
+        self.max_load = max_load
+
+    def round_up(self, capacity: int) -> int:
+        """
+        Returns the smallest allowed capacity at least as large as capacity.
+
+        :param capacity: The capacity asked for.
+        :return: An allowed capacity.
+        """
+        raise NotImplementedError
+
+    def initial_capacity(self, capacity: int) -> int:
+        """
+        Returns the capacity a new table asked to hold capacity slots starts
+        with: like round_up(), but never fewer than 3 slots.
+
+        :param capacity: The capacity asked for.
+        :return: An allowed capacity.
+        """
+        return self.round_up(max(capacity, 3))
+
+    def grow(self, capacity: int) -> int:
+        """
+        Returns the capacity a table of the given capacity grows to.
+
+        :param capacity: The current (allowed) capacity.
+        :return: A larger allowed capacity.
+        """
+        return self.round_up(max(int(capacity * self.growth), capacity + 1))
+
+    def shrink(self, capacity: int) -> int:
+        """
+        Returns the capacity a table of the given capacity shrinks to. This
+        may equal capacity when the table is already as small as it gets.
+
+        :param capacity: The current (allowed) capacity.
+        :return: A smaller (or the same) allowed capacity.
+        """
+        return self.round_up(int(capacity / self.growth))
+
+    def hasher(self, function: callable) -> callable:
+        """
+        Returns the hash function a table should actually use for function.
+
+        :param function: The hash function the table was given.
+        :return: The hash function to use.
+        """
+        return function
+
+    def hash_many(self, hasher: callable, keys) -> list:
+        """
+        Returns hasher(key) for every key in keys, computed in one batch.
+
+        :param hasher: A hash function returned by hasher().
+        :param keys: A sequence of keys.
+        :return: A list of hashes, in the same order as keys.
+        """
+        return hash_batch(hasher, keys)
+
+    def index(self, hash_val: int, capacity: int) -> int:
+        """
+        Returns the slot (or bucket) a hash falls in, in a table of the given
+        capacity: the hash modulo the capacity.
+
+        :param hash_val: A hash (or any integer, even a negative one).
+        :param capacity: An allowed capacity.
+        :return: An index below capacity.
+        """
+        return hash_val % capacity
+
+    def probe_limit(self, capacity: int) -> int:
+        """
+        Returns how many probes into a table of the given capacity reach
+        distinct slots. Past that, the probe sequence only repeats itself.
+
+        :param capacity: An allowed capacity.
+        :return: The number of distinct probes.
+        """
+        return capacity // 2 + 1
+
+
+class PrimePolicy(CapacityPolicy):
+    """
+    Prime capacities, probed quadratically. Capacities on the way up
+    PRIME_LADDER (where doubling tables land) are looked up; any other is
+    found by trial division.
+    """
+
+    def round_up(self, capacity: int) -> int:
+        """
+        Returns the smallest prime at least as large as capacity (3 if
+        capacity is 1 or less).
+
+        :param capacity: The capacity asked for.
+        :return: A prime capacity.
+        """
+        # -- No prime lies between twice one rung and the next, so a
+        #   capacity in that range rounds up to the next rung.
+        rung = bisect_left(PRIME_LADDER, capacity)
+        if 0 < rung < len(PRIME_LADDER) and \
+                capacity >= 2 * PRIME_LADDER[rung - 1]:
+            return PRIME_LADDER[rung]
+
+        return _next_prime(capacity)
+
+
+class PowerOfTwoPolicy(CapacityPolicy):
+    """
+    Power-of-two capacities, probed triangularly, with hashes mixed by
+    fibonacci_mix(). A slot index is then just the low bits of the mixed
+    hash, masked off rather than divided out. Growth factors that are not
+    powers of two are rounded up to one.
+    """
+
+    probe_step = 1
+    probe_reach = 1.0
+
+    def round_up(self, capacity: int) -> int:
+        """
+        Returns the smallest power of two at least as large as capacity (and
+        at least 2).
+
+        :param capacity: The capacity asked for.
+        :return: A power-of-two capacity.
+        """
+        return 1 << max(capacity - 1, 1).bit_length()
+
+    def hasher(self, function: callable) -> callable:
+        """
+        Returns function wrapped so that its hashes are mixed (unless it
+        already is).
+
+        :param function: The hash function the table was given.
+        :return: The hash function to use.
+        """
+        if isinstance(function, MixedHash):
+            return function
+        return MixedHash(function)
+
+    def hash_many(self, hasher: MixedHash, keys) -> list:
+        """
+        Returns hasher(key) for every key in keys, hashing them in one batch
+        with the unmixed function and mixing the results.
+
+        :param hasher: A hash function returned by hasher().
+        :param keys: A sequence of keys.
+        :return: A list of mixed hashes, in the same order as keys.
+        """
+        return [fibonacci_mix(hash_val)
+                for hash_val in hash_batch(hasher.function, keys)]
+
+    def index(self, hash_val: int, capacity: int) -> int:
+        """
+        Returns the slot (or bucket) a hash falls in, in a table of the given
+        capacity: the hash's low bits.
+
+        :param hash_val: A hash (or any integer, even a negative one).
+        :param capacity: A power-of-two capacity.
+        :return: An index below capacity.
+        """
+        return hash_val & (capacity - 1)
+
+    def probe_limit(self, capacity: int) -> int:
+        """
+        Returns how many probes into a table of the given capacity reach
+        distinct slots: all of them, for triangular probing.
+
+        :param capacity: A power-of-two capacity.
+        :return: The number of distinct probes.
+        """
+        return capacity
+
+
+# Policy used by any HashMap that isn't given one.
+DEFAULT_POLICY = PrimePolicy()
@@ -11,32 +11,86 @@
 # #
 # #     This Hash Map allows for following operations: put(), empty_buckets(),
 # #     table_load(), clear(), resize_table(), get(), contains_key(), remove()
-# #     get_keys_and_values(), and find_mode().
-
+# #     get_keys_and_values(), the lazy keys(), values() and items() views
+# #     and __iter__(), find_mode(), the streaming find_mode_stream() and
+# #     multi-process find_mode_parallel(), the single-probe upsert(),
+# #     setdefault() and increment(), along with the bulk operations
+# #     put_many(), get_many(), remove_many(), increment_many() and
+# #     from_items(). Capacities, growth and the load factor limit come from
+# #     a capacity policy (see hash_map_policy), and stats() reports the
+# #     table's shape and (after enable_stats()) operation counters. dump()
+# #     and load() save and restore the table's exact layout (see
+# #     hash_map_dump).
+# #     ConcurrentHashMap can be shared between threads, guarding its
+# #     buckets with striped locks and reading without any.
+
+
+import heapq
+import os
+import threading
+import time
+from array import array
+from contextlib import contextmanager
+from itertools import islice
+from multiprocessing import Pool
 
 from a6_include import (DynamicArray, LinkedList,
                         hash_function_1, hash_function_2)
+from hash_map_dump import TableDump, write_dump, read_dump, gc_paused
+from hash_map_hashes import BATCH_CHUNK
+from hash_map_policy import DEFAULT_POLICY
+from hash_map_stats import HashMapStats
+from hash_map_views import KeysView, ValuesView, ItemsView
+
+
+# Shared stand-in for every bucket that has never held a node (or has been
+#   emptied). It behaves like an empty LinkedList for lookups and removals,
+#   but nothing is ever inserted into it: a bucket gets a LinkedList of its
+#   own on its first insert.
+EMPTY_BUCKET = LinkedList()
 
 
 class HashMap:
+    # Load factor the table grows at, unless the policy gives its own.
+    _max_load = 1.0
+
     def __init__(self,
                  capacity: int = 11,
-                 function: callable = hash_function_1) -> None:
+                 function: callable = hash_function_1,
+                 shrink_load: float = None,
+                 policy=None) -> None:
         """
         Initialize new HashMap that uses
         separate chaining for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+
+        If shrink_load is given, removals that drop the load factor below it
+        shrink the table (never below its starting capacity). It should be
+        well under the load factor that makes the table grow (1) divided by
+        the policy's growth factor, so a shrunk table is not about to grow
+        again. The policy (see hash_map_policy) defaults to prime capacities
+        that double on growth.
         """
-        self._buckets = DynamicArray()
+        self._policy = DEFAULT_POLICY if policy is None else policy
+        if self._policy.max_load is not None:
+            self._max_load = self._policy.max_load
 
-        # capacity must be a prime number
-        self._capacity = self._next_prime(capacity)
-        for _ in range(self._capacity):
-            self._buckets.append(LinkedList())
+        # capacity must be one the policy allows (a prime number by default)
+        self._capacity = self._policy.initial_capacity(capacity)
+        self._buckets = DynamicArray([EMPTY_BUCKET] * self._capacity)
 
-        self._hash_function = function
+        self._hash_function = self._policy.hasher(function)
         self._size = 0
 
+        # Number of buckets holding no nodes, kept up to date on every
+        #   insert and removal.
+        self._empty_count = self._capacity
+
+        self._shrink_load = shrink_load
+        self._min_capacity = self._capacity
+
+        # Operation counters, only kept while enable_stats() is in effect.
+        self._stats = None
+
     def __str__(self) -> str:
         """
         Override string method to provide more readable output
@@ -106,6 +160,47 @@ class HashMap:
 
     # ------------------------------------------------------------------ #
 
+    @classmethod
+    def from_items(cls, items, size_hint: int = None,
+                   function: callable = hash_function_1,
+                   policy=None) -> "HashMap":
+        """
+        Builds a new HM from an iterable of (key, value) pairs. The table is
+        sized once, to the capacity that keeps size_hint keys under our load
+        factor limit (1 by default), so filling it never triggers a resize.
+
+        If no size_hint is given, items is read fully first to count it. If
+        items turns out to hold more pairs than size_hint, the table simply
+        grows as it would through put().
+
+        :param items: An iterable of (key, value) pairs.
+        :param size_hint: The expected number of distinct keys in items.
+        :param function: The hash function for the new HM.
+        :param policy: The capacity policy for the new HM.
+        :return: A new HashMap holding every pair.
+        """
+        # Step 1) Works out how many keys the table needs to hold.
+        if size_hint is None:
+            items = list(items)
+            size_hint = len(items)
+
+        # Step 2) Creates the HM at its final capacity.
+        max_load = cls._max_load
+        if policy is not None and policy.max_load is not None:
+            max_load = policy.max_load
+        new_map = cls(max(int(size_hint / max_load) + 1, 11), function,
+                      policy=policy)
+
+        # Step 3) Fills it a chunk at a time, so each chunk's keys are hashed
+        #   in one batch without holding a generator's pairs all at once.
+        items = iter(items)
+        chunk = list(islice(items, BATCH_CHUNK))
+        while chunk:
+            new_map.put_many(chunk)
+            chunk = list(islice(items, BATCH_CHUNK))
+
+        return new_map
+
     def put(self, key: str, value: object) -> None:
         """
         Takes a key / value pair and either updates it (in the case that the
@@ -117,60 +212,169 @@ class HashMap:
         :return: None -- manipulates HM directly.
         """
         # Step 1) Checks the load factor of our HM at its current state. In a
-        #   chained HM, load factor cannot exceed 1.
+        #   chained HM, load factor cannot exceed _max_load (1 by default).
         lf = self.table_load()
 
-        # -- If load factor is greater than 1, we need to resize.
-        if lf >= 1:
-            self.resize_table(self._capacity * 2)
+        # -- If load factor has reached it, we need to resize.
+        if lf >= self._max_load:
+            self.resize_table(self._policy.grow(self._capacity))
 
-        # Step 2) Finds the index of said key by putting it through the hash
-        #   function. Assigns correct index value.
-        hash_val = self._hash_function(key)
-        hash_i = hash_val % self._capacity
+        # Step 2) Puts the key through the hash function, then places it.
+        size = self._size
+        self._put_hashed(key, value, self._hash_function(key))
 
-        # Step 3) Hunts through the linked list at this index and attempts to
-        #   see if key already exists. If so, updates the value associated with
-        #   said key, if not adds the new key/value pair.
+        if self._stats is not None:
+            self._stats.put(self._size == size)
+
+    def _put_hashed(self, key: str, value: object, hash_val: int) -> None:
+        """
+        Updates or adds a key / value pair whose hash is already known. Does
+        not check the load factor; callers are responsible for resizing.
+
+        :param key: The key of our node.
+        :param value: The value of our node.
+        :param hash_val: The (pre-modulo) hash of key.
+        :return: None -- manipulates HM directly.
+        """
+        # Step 1) Hunts through the linked list at this key's index and
+        #   attempts to see if key already exists. If so, updates the value
+        #   associated with said key, if not adds the new key/value pair.
+        hash_i = self._policy.index(hash_val, self._capacity)
         ll = self._buckets[hash_i]
 
         if ll.length() == 0:
-            ll.insert(key, value)
+            self._own_bucket(hash_i).insert(key, value, hash_val)
             self._size += 1
             return
 
+        # -- Cached hashes are compared first so most non-matching nodes are
+        #   skipped without a full key comparison.
         for ll_item in ll:
-            if ll_item.key == key:
+            if ll_item.hash_val == hash_val and ll_item.key == key:
                 ll_item.value = value
                 return
 
-        ll.insert(key, value)
+        ll.insert(key, value, hash_val)
         self._size += 1
 
-    def empty_buckets(self) -> int:
+    def upsert(self, key: str, function: callable, default: object = None):
         """
-        Returns the number of empty buckets currently in our HM.
+        Replaces the value of key with function(value), or (in the case that
+        key doesn't exist) adds key with the value default. Either way, the
+        key is hashed and its chain walked only once. If function is None,
+        an existing value is left as it is.
 
-        (No Params)
-        :return: The number of empty buckets (an integer)
+        :param key: The key of our node.
+        :param function: Called with the current value, returning the new one.
+        :param default: The value of key if it is added.
+        :return: The value now associated with key.
+        """
+        # Step 1) Checks the load factor exactly as put() does.
+        if self.table_load() >= self._max_load:
+            self.resize_table(self._policy.grow(self._capacity))
+
+        # Step 2) Finds or creates the node in one pass.
+        size = self._size
+        value = self._upsert_hashed(key, function, default,
+                                    self._hash_function(key))
+
+        if self._stats is not None:
+            self._stats.put(self._size == size)
+        return value
+
+    def setdefault(self, key: str, default: object = None):
         """
-        # Stores the number of buckets available here.
-        curr_buckets = self._capacity
+        Returns the value of key, first adding key with the value default in
+        the case that it doesn't exist.
 
-        # Stores empty_buckets, initialized to 0.
-        empty_buckets = 0
+        :param key: The key of our node.
+        :param default: The value of key if it is added.
+        :return: The value now associated with key.
+        """
+        return self.upsert(key, None, default)
+
+    def increment(self, key: str, delta: int = 1):
+        """
+        Adds delta to the value of key, or adds key with the value delta in
+        the case that it doesn't exist.
+
+        :param key: The key of our node.
+        :param delta: The amount to add.
+        :return: The value now associated with key.
+        """
+        return self.upsert(key, lambda value: value + delta, delta)
+
+    def _upsert_hashed(self, key: str, function: callable, default: object,
+                       hash_val: int):
+        """
+        Does the work of upsert() for a key whose hash is already known. Does
+        not check the load factor; callers are responsible for resizing.
+
+        :param key: The key of our node.
+        :param function: Called with the current value, or None.
+        :param default: The value of key if it is added.
+        :param hash_val: The (pre-modulo) hash of key.
+        :return: The value now associated with key.
+        """
+        hash_i = self._policy.index(hash_val, self._capacity)
+        for ll_item in self._buckets[hash_i]:
+            if ll_item.hash_val == hash_val and ll_item.key == key:
+                if function is not None:
+                    ll_item.value = function(ll_item.value)
+                return ll_item.value
+
+        self._own_bucket(hash_i).insert(key, default, hash_val)
+        self._size += 1
+        return default
+
+    def _own_bucket(self, bucket_i: int) -> LinkedList:
+        """
+        Returns the LinkedList at the given bucket to insert into, first
+        giving the bucket a LinkedList of its own if it holds EMPTY_BUCKET.
+
+        :param bucket_i: The index of the bucket.
+        :return: The bucket's own LinkedList.
+        """
+        ll = self._buckets[bucket_i]
+        if ll is EMPTY_BUCKET:
+            ll = LinkedList()
+            self._buckets[bucket_i] = ll
+            self._empty_count -= 1
+        return ll
+
+    def _release_bucket(self, bucket_i: int) -> None:
+        """
+        Puts EMPTY_BUCKET back in the given bucket if its LinkedList has been
+        emptied.
+
+        :param bucket_i: The index of the bucket.
+        :return: None -- manipulates HM directly.
+        """
+        ll = self._buckets[bucket_i]
+        if ll is not EMPTY_BUCKET and ll.length() == 0:
+            self._buckets[bucket_i] = EMPTY_BUCKET
+            self._empty_count += 1
+
+    def _hash_keys(self, keys) -> list:
+        """
+        Returns the hash of every key in keys, computed in one batch.
+
+        :param keys: A sequence of keys.
+        :return: A list of (pre-modulo) hashes, in the same order as keys.
+        """
+        return self._policy.hash_many(self._hash_function, keys)
 
-        # Iterates through the DA that holds the buckets. For each index,
-        #   checks if bucket holds an empty LL. If so, increments
-        #   empty_buckets. Otherwise, moves to next bucket.
-        for bucket_i in range(curr_buckets):
-            a_bucket = self._buckets[bucket_i]
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of empty buckets currently in our HM.
 
-            if a_bucket.length() == 0:
-                empty_buckets += 1
+        This is a O(1) time complexity implementation, as the count is kept
+        up to date as buckets are filled and emptied.
 
-        # Returns empty_buckets at end.
-        return empty_buckets
+        (No Params)
+        :return: The number of empty buckets (an integer)
+        """
+        return self._empty_count
 
     def table_load(self) -> float:
         """
@@ -201,21 +405,22 @@ class HashMap:
         Clears the contents of the hash map, but does not change the underlying
         hash table capacity.
 
-        Implemented in O(1) time complexity.
+        No bucket is allocated or visited one at a time: the bucket array is
+        replaced with a bulk copy pointing every slot at EMPTY_BUCKET.
 
         (No params)
         :return: None.
         """
-        # Stores current capacity locally.
-        curr_capacity = self._capacity
+        # An already empty HM has nothing to clear.
+        if self._size == 0:
+            return
 
-        # Iterates of each valid index in curr_capacity. For every bucket,
-        #   resets all LL to empty.
-        for bucket_i in range(curr_capacity):
-            self._buckets[bucket_i] = LinkedList()
+        # Points every bucket back at EMPTY_BUCKET, in one bulk copy.
+        self._buckets = DynamicArray([EMPTY_BUCKET] * self._capacity)
 
-        # Resets size to 0 again.
+        # Resets size to 0 again, and every bucket to empty.
         self._size = 0
+        self._empty_count = self._capacity
 
     def resize_table(self, new_capacity: int) -> None:
         """
@@ -224,7 +429,7 @@ class HashMap:
         hash these pairs into new locations and buckets.
 
         This does nothing if the new_capacity is less than 1 and will only
-        re-size the HM to prime capacities.
+        re-size the HM to capacities our policy allows (primes by default).
 
         :param new_capacity: The new capacity we're attempting to re-size to.
         :return: None -- manipulates HM directly.
@@ -233,33 +438,64 @@ class HashMap:
         #   immediately.
         if new_capacity < 1:
             return
+        start = time.perf_counter() if self._stats is not None else None
 
-        # Step 2) Makes sure that new_capacity is a prime number. Uses is_prime
-        #   and next_prime to accomplish.
-        if not self._is_prime(new_capacity):
-            new_capacity = self._next_prime(new_capacity)
+        # Step 2) Makes sure that new_capacity is one our policy allows (a
+        #   prime number by default), rounding it up if not.
+        new_capacity = self._policy.round_up(new_capacity)
 
-        # Step 2A) Sets new_da to the capacity we're looking for.
-        new_da = DynamicArray()
+        # -- Re-inserting through put() would keep doubling a table that is
+        #   too small for our current size, so settle on that final capacity
+        #   up front instead.
+        new_capacity = self._grown_capacity(new_capacity, self._size)
 
-        for item in range(new_capacity):
-            new_da.append(LinkedList())
+        # Step 2A) Sets new_da to the capacity we're looking for, with every
+        #   bucket empty.
+        new_da = DynamicArray([EMPTY_BUCKET] * new_capacity)
 
         # Step 2B) Copies self._buckets to a new location for safe keeping.
         temp_buckets = self._buckets
 
-        # Step 3) Resets all of HM to default values with new_da as our buckets
+        # Step 3) Swaps in new_da as our buckets. Size does not change, as
+        #   every key in the old table is already unique.
         self._buckets = new_da
         self._capacity = new_capacity
-        self._size = 0
+        self._empty_count = new_capacity
+
+        # -- An empty HM has nothing to move.
+        if self._size == 0:
+            if start is not None:
+                self._stats.resized(time.perf_counter() - start)
+            return
 
         # Step 4) Traverses node-by-node in our original HM. For each node,
-        #   hashes item via put() into our new HM object.
+        #   re-indexes it with its cached hash, so no key is hashed again.
+        index = self._policy.index
         for bucket_i in range(temp_buckets.length()):
             if temp_buckets[bucket_i].length() != 0:
                 non_empty_bucket = temp_buckets[bucket_i]
                 for a_node in non_empty_bucket:
-                    self.put(a_node.key, a_node.value)
+                    self._own_bucket(index(a_node.hash_val, new_capacity)) \
+                        .insert(a_node.key, a_node.value, a_node.hash_val)
+
+        if start is not None:
+            self._stats.resized(time.perf_counter() - start)
+
+    def _grown_capacity(self, capacity: int, size: int) -> int:
+        """
+        Returns the capacity a table of the given size ends up with when its
+        entries are put() one at a time into a table of the given capacity,
+        growing (as our policy says) whenever the load factor reaches
+        _max_load.
+
+        :param capacity: The capacity we start from.
+        :param size: The number of entries to be placed.
+        :return: The final capacity.
+        """
+        while size > 0 and (size - 1) / capacity >= self._max_load:
+            capacity = self._policy.grow(capacity)
+
+        return capacity
 
     def get(self, key: str):
         """
@@ -272,12 +508,14 @@ class HashMap:
         """
         # Step 1) If HM is empty, immediately return None.
         if self._size == 0:
+            if self._stats is not None:
+                self._stats.get(False)
             return None
 
         # Step 2) Finds the index of said key by putting it through the hash
         #   function. Assigns correct index value.
         hash_val = self._hash_function(key)
-        hash_i = hash_val % self._capacity
+        hash_i = self._policy.index(hash_val, self._capacity)
 
         # Step 3) Hunts through the linked list at this index and attempts to
         #   see if key already exists.
@@ -285,7 +523,10 @@ class HashMap:
 
         # Checks through LL for whether a node with that specific key exists.
         #   If there isn't a node with that specific key, returns None.
-        potential_node = ll.contains(key)
+        potential_node = ll.contains(key, hash_val)
+
+        if self._stats is not None:
+            self._stats.get(potential_node is not None)
 
         if potential_node:
             return potential_node.value
@@ -315,6 +556,9 @@ class HashMap:
         :param key: The key of the node we're looking to remove.
         :return: None -- manipulates HM directly.
         """
+        if self._stats is not None:
+            self._stats.removes += 1
+
         # Step 1) If HM is empty, immediately return.
         if self._size == 0:
             return
@@ -322,7 +566,7 @@ class HashMap:
         # Step 2) Finds the index of said key by putting it through the hash
         #   function. Assigns correct index value.
         hash_val = self._hash_function(key)
-        hash_i = hash_val % self._capacity
+        hash_i = self._policy.index(hash_val, self._capacity)
 
         # Step 3) Hunts through the linked list at this index and attempts to
         #   see if key already exists.
@@ -330,38 +574,1105 @@ class HashMap:
 
         # Attempts to remove specific node with key. This will default to True
         #   if successful, and False if not. If true, decrement size of HM.
-        successful_remove = ll.remove(key)
+        successful_remove = ll.remove(key, hash_val)
 
         if successful_remove:
             self._size -= 1
+            self._release_bucket(hash_i)
+            self._maybe_shrink()
+
+    def _maybe_shrink(self) -> None:
+        """
+        If a shrink_load was given and our load factor has dropped below it,
+        shrinks the table (as our policy says) as many times as it takes to
+        bring the load factor back up to it, without going below the
+        starting capacity.
+
+        (No params)
+        :return: None -- manipulates HM directly.
+        """
+        if self._shrink_load is None:
+            return
+
+        new_capacity = self._capacity
+        while self._size / new_capacity < self._shrink_load:
+            smaller = self._policy.shrink(new_capacity)
+            if smaller < self._min_capacity or smaller >= new_capacity:
+                break
+            new_capacity = smaller
+
+        if new_capacity != self._capacity:
+            self._shrink_to(new_capacity)
+
+    def _shrink_to(self, new_capacity: int) -> None:
+        """
+        Moves our entries into a smaller table of the given capacity.
+
+        :param new_capacity: The smaller capacity.
+        :return: None -- manipulates HM directly.
+        """
+        self.resize_table(new_capacity)
+
+    def put_many(self, items) -> None:
+        """
+        Puts every (key, value) pair from items into our HM, as if put() had
+        been called on each in turn. The table is grown once up front, every
+        key is hashed in one batch, and inserts are grouped by bucket.
+
+        :param items: An iterable of (key, value) pairs.
+        :return: None -- manipulates HM directly.
+        """
+        items = list(items)
+        if not items:
+            return
+
+        # Step 1) Grows the table once, to the capacity it would have reached
+        #   had every pair been a new key put() one at a time.
+        keys = [key for key, _ in items]
+        new_capacity = self._grown_capacity(self._capacity,
+                                            self._size + len(set(keys)))
+        if new_capacity != self._capacity:
+            self.resize_table(new_capacity)
+
+        # Step 2) Hashes every key at once, and groups the pairs by the
+        #   bucket they land in (keeping their input order).
+        cap = self._capacity
+        index = self._policy.index
+        groups = {}
+        for (key, value), hash_val in zip(items, self._hash_keys(keys)):
+            groups.setdefault(index(hash_val, cap), []).append(
+                (key, value, hash_val))
+
+        # Step 3) Visits each bucket once, updating or inserting its pairs.
+        size = self._size
+        for bucket_i, group in groups.items():
+            ll = self._own_bucket(bucket_i)
+            for key, value, hash_val in group:
+                potential_node = ll.contains(key, hash_val)
+                if potential_node:
+                    potential_node.value = value
+                else:
+                    ll.insert(key, value, hash_val)
+                    self._size += 1
+
+        if self._stats is not None:
+            self._stats.put_many(len(items), self._size - size)
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Returns a DA of the value associated with each of the given keys (or
+        None for keys not in our HM), in the same order as keys. Every key is
+        hashed in one batch.
+
+        :param keys: An iterable of keys.
+        :return: A new Dynamic Array object hosting the values.
+        """
+        keys = list(keys)
+        new_da = DynamicArray()
+
+        if self._size == 0:
+            for _ in keys:
+                new_da.append(None)
+            if self._stats is not None:
+                self._stats.get_many(new_da)
+            return new_da
+
+        buckets = self._buckets
+        cap = self._capacity
+        index = self._policy.index
+        for key, hash_val in zip(keys, self._hash_keys(keys)):
+            potential_node = buckets[index(hash_val, cap)].contains(
+                key, hash_val)
+            new_da.append(potential_node.value if potential_node else None)
+
+        if self._stats is not None:
+            self._stats.get_many(new_da)
+        return new_da
+
+    def remove_many(self, keys) -> None:
+        """
+        Removes each of the given keys (and its value) from our HM. Keys that
+        do not exist are ignored. Every key is hashed in one batch.
+
+        :param keys: An iterable of keys.
+        :return: None -- manipulates HM directly.
+        """
+        keys = list(keys)
+        if self._stats is not None:
+            self._stats.removes += len(keys)
+        if self._size == 0 or not keys:
+            return
+
+        buckets = self._buckets
+        cap = self._capacity
+        index = self._policy.index
+        for key, hash_val in zip(keys, self._hash_keys(keys)):
+            hash_i = index(hash_val, cap)
+            if buckets[hash_i].remove(key, hash_val):
+                self._size -= 1
+                self._release_bucket(hash_i)
+
+        self._maybe_shrink()
+
+    def increment_many(self, keys, delta: int = 1) -> None:
+        """
+        Calls increment(key, delta) for every key in keys, in turn. The table
+        is grown once up front and every key is hashed in one batch.
+
+        :param keys: An iterable of keys.
+        :param delta: The amount to add for each occurrence of a key.
+        :return: None -- manipulates HM directly.
+        """
+        keys = list(keys)
+        if not keys:
+            return
+
+        # Step 1) Grows the table once, to the capacity it would have reached
+        #   had every distinct key been new.
+        new_capacity = self._grown_capacity(self._capacity,
+                                            self._size + len(set(keys)))
+        if new_capacity != self._capacity:
+            self.resize_table(new_capacity)
+
+        # Step 2) Hashes every key at once, then finds or creates each node.
+        size = self._size
+        add_delta = lambda value: value + delta
+        for key, hash_val in zip(keys, self._hash_keys(keys)):
+            self._upsert_hashed(key, add_delta, delta, hash_val)
+
+        if self._stats is not None:
+            self._stats.put_many(len(keys), self._size - size)
+
+    def keys(self) -> KeysView:
+        """
+        Returns a lazy view of the keys in our HM.
+
+        (No Params)
+        :return: A KeysView over our HM.
+        """
+        return KeysView(self)
+
+    def values(self) -> ValuesView:
+        """
+        Returns a lazy view of the values in our HM.
+
+        (No Params)
+        :return: A ValuesView over our HM.
+        """
+        return ValuesView(self)
+
+    def items(self) -> ItemsView:
+        """
+        Returns a lazy view of the (key, value) pairs in our HM.
+
+        (No Params)
+        :return: An ItemsView over our HM.
+        """
+        return ItemsView(self)
 
     def get_keys_and_values(self) -> DynamicArray:
         """
         Returns a DA where each index contains a tuple of the key/value pairs
-        stored in our HM.
+        stored in our HM. To walk the pairs without copying them, loop over
+        items() instead.
 
         (No Params)
         :return: A new Dynamic Array object hosting tuples of all HM items.
         """
-        # Creation of a new DA object:
         new_da = DynamicArray()
+        for item in self.items():
+            new_da.append(item)
+        return new_da
+
+    def dump(self, path: str) -> None:
+        """
+        Writes our HM to a binary file (see hash_map_dump), recording the
+        bucket and cached hash of every node along with its key and value,
+        so load() can rebuild each chain as it was.
+
+        :param path: The file to write.
+        :return: None
+        """
+        slots, hashes = array('Q'), array('Q')
+        keys, values = [], []
+
+        # -- Each chain is saved tail first, so inserting its nodes in file
+        #   order (each at the head) puts them back in the same order.
+        for bucket_i in range(self._capacity):
+            ll = self._buckets[bucket_i]
+            if ll.length() != 0:
+                for a_node in reversed(list(ll)):
+                    slots.append(bucket_i)
+                    hashes.append(a_node.hash_val)
+                    keys.append(a_node.key)
+                    values.append(a_node.value)
+
+        write_dump(path, self, slots, b'', hashes, keys, values)
+
+    @classmethod
+    def load(cls, path: str, function: callable) -> "HashMap":
+        """
+        Returns a new HM holding the table dump() wrote to path, with the
+        same capacity and policy and every chain as it was, so no key is
+        hashed or compared. Settings not saved (such as shrink_load) take
+        their defaults.
+
+        Raises ValueError if the file was written by another class, or with
+        a hash function other than function.
+
+        :param path: The file to read.
+        :param function: The hash function the file was written with.
+        :return: A new HashMap.
+        """
+        with gc_paused():
+            table = read_dump(path, cls, function)
+            new_map = cls(table.capacity, function, policy=table.policy)
+            new_map._restore(table)
+        return new_map
+
+    def _restore(self, table: TableDump) -> None:
+        """
+        Replaces our (empty) buckets with the nodes of a dump file.
+
+        :param table: The contents of a dump file of our capacity.
+        :return: None -- manipulates HM directly.
+        """
+        # -- The buckets are filled as a plain list, then wrapped in one go.
+        buckets = [EMPTY_BUCKET] * self._capacity
+        for bucket_i, hash_val, key, value in zip(
+                table.slots, table.hashes, table.keys, table.values):
+            ll = buckets[bucket_i]
+            if ll is EMPTY_BUCKET:
+                ll = buckets[bucket_i] = LinkedList()
+            ll.insert(key, value, hash_val)
+
+        self._buckets = DynamicArray(buckets)
+        self._empty_count = buckets.count(EMPTY_BUCKET)
+        self._size = table.size
+
+    def __iter__(self):
+        """
+        Create iterator for loop, yielding the node of every key in our HM.
+        """
+        for bucket_i in range(self._capacity):
+            yield from self._buckets[bucket_i]
+
+    def enable_stats(self) -> None:
+        """
+        Starts (or restarts, from 0) counting operations for stats().
+
+        (No params)
+        :return: None -- manipulates HM directly.
+        """
+        self._stats = HashMapStats()
+
+    def disable_stats(self) -> None:
+        """
+        Stops counting operations, and drops the counts so far.
+
+        (No params)
+        :return: None -- manipulates HM directly.
+        """
+        self._stats = None
+
+    def stats(self) -> dict:
+        """
+        Returns a plain dict describing our HM: its size, capacity, load
+        factor and empty buckets, how many buckets hold a chain of each
+        length, and the operation counters of HashMapStats (all 0 unless
+        enable_stats() is in effect). This is O(capacity), as every chain is
+        measured.
+
+        (No params)
+        :return: A dict of statistic name to value.
+        """
+        chain_lengths = {}
+        for bucket_i in range(self._capacity):
+            length = self._buckets[bucket_i].length()
+            chain_lengths[length] = chain_lengths.get(length, 0) + 1
+
+        stats = {
+            'enabled': self._stats is not None,
+            'size': self._size,
+            'capacity': self._capacity,
+            'table_load': self.table_load(),
+            'empty_buckets': self.empty_buckets(),
+            'chain_lengths': dict(sorted(chain_lengths.items())),
+        }
+        stats.update((self._stats or HashMapStats()).as_dict())
+        return stats
+
+
+class IncrementalHashMap(HashMap):
+    """
+    Separate chaining HashMap that grows incrementally instead of all at
+    once. When put() crosses the load factor limit, a new bucket array is
+    swapped in but the old one is kept, and every later put(), get() and
+    remove() moves at most rehash_step old buckets across. Until the old
+    array is drained, keys are looked up in both.
+
+    Operations over the whole table (empty_buckets(), the bulk methods,
+    iterating, and so get_keys_and_values() and the views, an explicit
+    resize_table(), printing) finish any migration in progress first.
+    """
+
+    def __init__(self,
+                 capacity: int = 11,
+                 function: callable = hash_function_1,
+                 rehash_step: int = 16,
+                 shrink_load: float = None,
+                 policy=None) -> None:
+        """
+        Initialize new HashMap that uses separate chaining for collision
+        resolution, moving rehash_step old buckets per operation while it
+        grows (or shrinks, see HashMap).
+        """
+        super().__init__(capacity, function, shrink_load, policy)
+        self._rehash_step = rehash_step
+
+        # The bucket array being drained (None when not growing), and the
+        #   index of its next bucket to move.
+        self._old_buckets = None
+        self._old_capacity = 0
+        self._rehash_i = 0
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        self._finish_rehash()
+        return super().__str__()
+
+    def __repr__(self) -> str:
+        """Override string method to provide more readable output."""
+        self._finish_rehash()
+        return super().__repr__()
+
+    def _start_rehash(self, new_capacity: int) -> None:
+        """
+        Swaps in an empty bucket array of (the smallest capacity our policy
+        allows of at least) new_capacity, keeping the current one to be
+        drained.
+
+        :param new_capacity: The capacity to grow to.
+        :return: None -- manipulates HM directly.
+        """
+        self._finish_rehash()
+
+        new_capacity = self._policy.round_up(new_capacity)
+
+        self._old_buckets = self._buckets
+        self._old_capacity = self._capacity
+        self._rehash_i = 0
+
+        self._buckets = DynamicArray([EMPTY_BUCKET] * new_capacity)
+        self._capacity = new_capacity
+        self._empty_count = new_capacity
+
+        # Time spent moving buckets is added on by _rehash_some().
+        if self._stats is not None:
+            self._stats.resized(0.0)
+
+    def _rehash_some(self, count: int = None) -> None:
+        """
+        Moves the nodes of up to count (by default rehash_step) old buckets
+        into our current buckets, by their cached hashes.
+
+        :param count: The number of old buckets to move.
+        :return: None -- manipulates HM directly.
+        """
+        if self._old_buckets is None:
+            return
+        start = time.perf_counter() if self._stats is not None else None
+
+        old_buckets = self._old_buckets
+        end = min(self._rehash_i + (count or self._rehash_step),
+                  self._old_capacity)
+
+        index = self._policy.index
+        for bucket_i in range(self._rehash_i, end):
+            ll = old_buckets[bucket_i]
+            if ll.length() != 0:
+                for a_node in ll:
+                    self._own_bucket(index(a_node.hash_val, self._capacity)) \
+                        .insert(a_node.key, a_node.value, a_node.hash_val)
+                old_buckets[bucket_i] = EMPTY_BUCKET
+
+        self._rehash_i = end
+        if end == self._old_capacity:
+            self._old_buckets = None
+            self._old_capacity = 0
+
+        if start is not None:
+            self._stats.resize_seconds += time.perf_counter() - start
+
+    def _finish_rehash(self) -> None:
+        """
+        Moves every remaining old bucket across, ending the migration.
+
+        (No params)
+        :return: None -- manipulates HM directly.
+        """
+        if self._old_buckets is not None:
+            self._rehash_some(self._old_capacity)
+
+    def _old_bucket(self, hash_val: int) -> LinkedList:
+        """
+        Returns the old bucket a key with the given hash still lives in, or
+        EMPTY_BUCKET if that bucket has already been moved (or we aren't
+        growing).
+
+        :param hash_val: The (pre-modulo) hash of a key.
+        :return: A LinkedList.
+        """
+        if self._old_buckets is None:
+            return EMPTY_BUCKET
+
+        bucket_i = self._policy.index(hash_val, self._old_capacity)
+        if bucket_i < self._rehash_i:
+            return EMPTY_BUCKET
+        return self._old_buckets[bucket_i]
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Takes a key / value pair and either updates it (in the case that the
+        key already exists), or adds it (in the case that it doesn't) to our
+        HM. Starts growing the HM, without moving anything yet, once the load
+        factor reaches _max_load.
+
+        :param key: The key of our node.
+        :param value: The value of our node.
+        :return: None -- manipulates HM directly.
+        """
+        if self.table_load() >= self._max_load:
+            self._start_rehash(self._policy.grow(self._capacity))
+        self._rehash_some()
+
+        # A key still in the old buckets is updated where it is.
+        hash_val = self._hash_function(key)
+        potential_node = self._old_bucket(hash_val).contains(key, hash_val)
+        if potential_node:
+            potential_node.value = value
+            updated = True
+        else:
+            size = self._size
+            self._put_hashed(key, value, hash_val)
+            updated = self._size == size
+
+        if self._stats is not None:
+            self._stats.put(updated)
+
+    def upsert(self, key: str, function: callable, default: object = None):
+        """
+        Replaces the value of key with function(value), or adds key with the
+        value default (see HashMap.upsert()), updating a key still in the old
+        buckets where it is.
+
+        :param key: The key of our node.
+        :param function: Called with the current value, returning the new one.
+        :param default: The value of key if it is added.
+        :return: The value now associated with key.
+        """
+        if self.table_load() >= self._max_load:
+            self._start_rehash(self._policy.grow(self._capacity))
+        self._rehash_some()
+
+        hash_val = self._hash_function(key)
+        potential_node = self._old_bucket(hash_val).contains(key, hash_val)
+        if potential_node:
+            if function is not None:
+                potential_node.value = function(potential_node.value)
+            value = potential_node.value
+            updated = True
+        else:
+            size = self._size
+            value = self._upsert_hashed(key, function, default, hash_val)
+            updated = self._size == size
+
+        if self._stats is not None:
+            self._stats.put(updated)
+        return value
+
+    def get(self, key: str):
+        """
+        Returns the value associated with a given key, looking in the old
+        buckets too while the HM is growing. If the key is not in the Hash
+        Map, the method returns None.
+
+        :param key: The key to which we want to find the value for.
+        :return: A value or None.
+        """
+        self._rehash_some()
+        if self._size == 0:
+            if self._stats is not None:
+                self._stats.get(False)
+            return None
+
+        hash_val = self._hash_function(key)
+        hash_i = self._policy.index(hash_val, self._capacity)
+        potential_node = self._buckets[hash_i].contains(key, hash_val) \
+            or self._old_bucket(hash_val).contains(key, hash_val)
+
+        if self._stats is not None:
+            self._stats.get(potential_node is not None)
+
+        if potential_node:
+            return potential_node.value
+        return None
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the given key and its associated value from the HM, looking in
+        the old buckets too while the HM is growing. If key does not exist,
+        does nothing.
+
+        :param key: The key of the node we're looking to remove.
+        :return: None -- manipulates HM directly.
+        """
+        if self._stats is not None:
+            self._stats.removes += 1
+
+        self._rehash_some()
+        if self._size == 0:
+            return
+
+        hash_val = self._hash_function(key)
+        hash_i = self._policy.index(hash_val, self._capacity)
+
+        if self._buckets[hash_i].remove(key, hash_val):
+            self._size -= 1
+            self._release_bucket(hash_i)
+        elif self._old_bucket(hash_val).remove(key, hash_val):
+            self._size -= 1
+        else:
+            return
+
+        self._maybe_shrink()
+
+    def _shrink_to(self, new_capacity: int) -> None:
+        """
+        Starts moving our entries (incrementally) into a smaller table of the
+        given capacity, unless a migration is already in progress.
+
+        :param new_capacity: The smaller capacity.
+        :return: None -- manipulates HM directly.
+        """
+        if self._old_buckets is None:
+            self._start_rehash(new_capacity)
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of empty buckets currently in our HM.
+
+        (No Params)
+        :return: The number of empty buckets (an integer)
+        """
+        self._finish_rehash()
+        return super().empty_buckets()
+
+    def stats(self) -> dict:
+        """
+        Returns a plain dict describing our HM (see HashMap.stats()).
+
+        (No params)
+        :return: A dict of statistic name to value.
+        """
+        self._finish_rehash()
+        return super().stats()
+
+    def clear(self) -> None:
+        """
+        Clears the contents of the hash map (dropping any old buckets still
+        being drained), but does not change the underlying hash table
+        capacity.
+
+        (No params)
+        :return: None.
+        """
+        self._old_buckets = None
+        self._old_capacity = 0
+        super().clear()
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Changes the capacity of the internal hash table right away, finishing
+        any migration in progress first.
+
+        :param new_capacity: The new capacity we're attempting to re-size to.
+        :return: None -- manipulates HM directly.
+        """
+        self._finish_rehash()
+        super().resize_table(new_capacity)
+
+    def put_many(self, items) -> None:
+        """
+        Puts every (key, value) pair from items into our HM, finishing any
+        migration in progress first.
+
+        :param items: An iterable of (key, value) pairs.
+        :return: None -- manipulates HM directly.
+        """
+        self._finish_rehash()
+        super().put_many(items)
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Returns a DA of the value associated with each of the given keys,
+        finishing any migration in progress first.
+
+        :param keys: An iterable of keys.
+        :return: A new Dynamic Array object hosting the values.
+        """
+        self._finish_rehash()
+        return super().get_many(keys)
+
+    def remove_many(self, keys) -> None:
+        """
+        Removes each of the given keys (and its value) from our HM, finishing
+        any migration in progress first.
+
+        :param keys: An iterable of keys.
+        :return: None -- manipulates HM directly.
+        """
+        self._finish_rehash()
+        super().remove_many(keys)
+
+    def increment_many(self, keys, delta: int = 1) -> None:
+        """
+        Calls increment(key, delta) for every key in keys, finishing any
+        migration in progress first.
+
+        :param keys: An iterable of keys.
+        :param delta: The amount to add for each occurrence of a key.
+        :return: None -- manipulates HM directly.
+        """
+        self._finish_rehash()
+        super().increment_many(keys, delta)
+
+    def dump(self, path: str) -> None:
+        """
+        Writes our HM to a binary file (see HashMap.dump()), finishing any
+        migration in progress first.
+
+        :param path: The file to write.
+        :return: None
+        """
+        self._finish_rehash()
+        super().dump(path)
+
+    def __iter__(self):
+        """
+        Create iterator for loop, finishing any migration in progress first.
+        """
+        self._finish_rehash()
+        return super().__iter__()
+
+
+class ConcurrentHashMap(HashMap):
+    """
+    Separate chaining HashMap that can be shared between threads. Buckets
+    are guarded by a fixed number of striped locks (bucket i by lock
+    i % stripes), so writers to different stripes never wait on each other.
+    The size and empty bucket counts are kept per stripe, each updated
+    under its own lock, and summed when read.
+
+    Readers (get(), contains_key(), get_many(), iterating) take no lock at
+    all. A resize or clear() takes every lock, in order, builds a complete
+    new bucket array off to the side, and then publishes it with a single
+    reference swap, so a reader sees either the old table or the new one.
+    Iterating is weakly consistent: it may or may not see changes made
+    while it runs.
+
+    upsert() (and so setdefault() and increment()) is atomic: function is
+    called while its stripe is locked, so it must not use this HM. The bulk
+    methods are not atomic as a whole; they apply each key in turn. The
+    counters of enable_stats() may miss operations that overlap.
+    """
+
+    def __init__(self,
+                 capacity: int = 11,
+                 function: callable = hash_function_1,
+                 stripes: int = 16,
+                 shrink_load: float = None,
+                 policy=None) -> None:
+        """
+        Initialize new HashMap that uses separate chaining for collision
+        resolution, guarded by the given number of striped locks (see
+        HashMap for shrink_load and policy).
+        """
+        if stripes < 1:
+            raise ValueError("stripes must be at least 1")
+        self._stripe_count = stripes
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+        super().__init__(capacity, function, shrink_load, policy)
+
+        # The bucket array and its capacity, swapped as one reference so
+        #   lock-free readers never pair one with the other's partner.
+        self._table = (self._buckets, self._capacity)
+
+    # Only the sum of the per-stripe counts means anything; setting either
+    #   count (which HashMap only does while no other thread can see the HM,
+    #   or while every stripe is held) starts the counts over from it.
+    @property
+    def _size(self) -> int:
+        return sum(self._stripe_sizes)
+
+    @_size.setter
+    def _size(self, size: int) -> None:
+        self._stripe_sizes = [size] + [0] * (self._stripe_count - 1)
+
+    @property
+    def _empty_count(self) -> int:
+        return sum(self._stripe_empty)
+
+    @_empty_count.setter
+    def _empty_count(self, count: int) -> None:
+        self._stripe_empty = [count] + [0] * (self._stripe_count - 1)
+
+    @contextmanager
+    def _all_stripes(self):
+        """
+        Holds every stripe lock, always taken in the same order so two
+        threads doing so can't deadlock, for the body of a with statement.
+        """
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(self._locks):
+                lock.release()
+
+    def _lock_bucket(self, hash_val: int) -> tuple:
+        """
+        Acquires the lock of the stripe a key with the given hash lands in.
+        If a resize swapped the table while we waited for it, the key may
+        now land elsewhere, so we let go and try again.
+
+        :param hash_val: The (pre-modulo) hash of a key.
+        :return: A tuple of the stripe index (whose lock the caller must
+        release) and the key's bucket index.
+        """
+        while True:
+            buckets, capacity = self._table
+            bucket_i = self._policy.index(hash_val, capacity)
+            stripe_i = bucket_i % self._stripe_count
+            self._locks[stripe_i].acquire()
+            if self._table[0] is buckets:
+                return stripe_i, bucket_i
+            self._locks[stripe_i].release()
+
+    def _own_bucket(self, bucket_i: int) -> LinkedList:
+        """
+        Returns the LinkedList at the given bucket to insert into (see
+        HashMap._own_bucket()). The bucket's stripe must be held.
+
+        :param bucket_i: The index of the bucket.
+        :return: The bucket's own LinkedList.
+        """
+        ll = self._buckets[bucket_i]
+        if ll is EMPTY_BUCKET:
+            ll = LinkedList()
+            self._buckets[bucket_i] = ll
+            self._stripe_empty[bucket_i % self._stripe_count] -= 1
+        return ll
+
+    def _release_bucket(self, bucket_i: int) -> None:
+        """
+        Puts EMPTY_BUCKET back in the given bucket if its LinkedList has been
+        emptied. The bucket's stripe must be held.
+
+        :param bucket_i: The index of the bucket.
+        :return: None -- manipulates HM directly.
+        """
+        ll = self._buckets[bucket_i]
+        if ll is not EMPTY_BUCKET and ll.length() == 0:
+            self._buckets[bucket_i] = EMPTY_BUCKET
+            self._stripe_empty[bucket_i % self._stripe_count] += 1
+
+    def _grow_if_full(self) -> None:
+        """
+        Grows the table (as our policy says) if the load factor has reached
+        _max_load. Of several threads that see this at once, only the first
+        to get every stripe resizes.
+
+        (No params)
+        :return: None -- manipulates HM directly.
+        """
+        capacity = self._table[1]
+        if self._size / capacity < self._max_load:
+            return
+
+        with self._all_stripes():
+            if self._capacity == capacity:
+                self._rebuild(self._policy.grow(capacity))
+
+    def _rebuild(self, new_capacity: int) -> None:
+        """
+        Copies every node into a new bucket array of (the smallest capacity
+        our policy allows of at least) new_capacity, by its cached hash, and
+        then swaps it in. Every stripe must be held. The old buckets are left
+        untouched for any reader still walking them.
+
+        :param new_capacity: The new capacity.
+        :return: None -- manipulates HM directly.
+        """
+        start = time.perf_counter() if self._stats is not None else None
+
+        new_capacity = self._grown_capacity(
+            self._policy.round_up(new_capacity), self._size)
+        new_da = DynamicArray([EMPTY_BUCKET] * new_capacity)
+
+        empty_count = new_capacity
+        old_buckets = self._buckets
+        for bucket_i in range(self._capacity):
+            for a_node in old_buckets[bucket_i]:
+                hash_i = self._policy.index(a_node.hash_val, new_capacity)
+                ll = new_da[hash_i]
+                if ll is EMPTY_BUCKET:
+                    ll = LinkedList()
+                    new_da[hash_i] = ll
+                    empty_count -= 1
+                ll.insert(a_node.key, a_node.value, a_node.hash_val)
+
+        self._buckets = new_da
+        self._capacity = new_capacity
+        self._empty_count = empty_count
+        self._table = (new_da, new_capacity)
+
+        if start is not None:
+            self._stats.resized(time.perf_counter() - start)
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Takes a key / value pair and either updates it (in the case that the
+        key already exists), or adds it (in the case that it doesn't) to our
+        HM, holding only the key's stripe.
+
+        :param key: The key of our node.
+        :param value: The value of our node.
+        :return: None -- manipulates HM directly.
+        """
+        self._grow_if_full()
+
+        hash_val = self._hash_function(key)
+        stripe_i, bucket_i = self._lock_bucket(hash_val)
+        try:
+            potential_node = self._buckets[bucket_i].contains(key, hash_val)
+            if potential_node:
+                potential_node.value = value
+            else:
+                self._own_bucket(bucket_i).insert(key, value, hash_val)
+                self._stripe_sizes[stripe_i] += 1
+        finally:
+            self._locks[stripe_i].release()
+
+        if self._stats is not None:
+            self._stats.put(potential_node is not None)
+
+    def upsert(self, key: str, function: callable, default: object = None):
+        """
+        Replaces the value of key with function(value), or adds key with the
+        value default (see HashMap.upsert()), as one atomic step.
+
+        :param key: The key of our node.
+        :param function: Called with the current value, returning the new one.
+        :param default: The value of key if it is added.
+        :return: The value now associated with key.
+        """
+        self._grow_if_full()
+
+        hash_val = self._hash_function(key)
+        stripe_i, bucket_i = self._lock_bucket(hash_val)
+        try:
+            potential_node = self._buckets[bucket_i].contains(key, hash_val)
+            if potential_node:
+                if function is not None:
+                    potential_node.value = function(potential_node.value)
+                value = potential_node.value
+            else:
+                self._own_bucket(bucket_i).insert(key, default, hash_val)
+                self._stripe_sizes[stripe_i] += 1
+                value = default
+        finally:
+            self._locks[stripe_i].release()
+
+        if self._stats is not None:
+            self._stats.put(potential_node is not None)
+        return value
 
-        # Iterates through each index of our DA to access each LL.
-        for da_i in range(self._capacity):
-            ll = self._buckets[da_i]
+    def get(self, key: str):
+        """
+        Returns the value associated with a given key, without taking any
+        lock. If the key is not in the Hash Map, the method returns None.
+
+        :param key: The key to which we want to find the value for.
+        :return: A value or None.
+        """
+        buckets, capacity = self._table
+        hash_val = self._hash_function(key)
+        potential_node = buckets[self._policy.index(hash_val, capacity)] \
+            .contains(key, hash_val)
+
+        if self._stats is not None:
+            self._stats.get(potential_node is not None)
+
+        if potential_node:
+            return potential_node.value
+        return None
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the given key and its associated value from the HM, holding
+        only the key's stripe. If key does not exist, does nothing.
+
+        :param key: The key of the node we're looking to remove.
+        :return: None -- manipulates HM directly.
+        """
+        if self._stats is not None:
+            self._stats.removes += 1
+
+        hash_val = self._hash_function(key)
+        stripe_i, bucket_i = self._lock_bucket(hash_val)
+        try:
+            successful_remove = self._buckets[bucket_i].remove(key, hash_val)
+            if successful_remove:
+                self._stripe_sizes[stripe_i] -= 1
+                self._release_bucket(bucket_i)
+        finally:
+            self._locks[stripe_i].release()
+
+        if successful_remove:
+            self._maybe_shrink()
+
+    def _shrink_to(self, new_capacity: int) -> None:
+        """
+        Moves our entries into a smaller table of the given capacity, unless
+        another thread has already shrunk it.
+
+        :param new_capacity: The smaller capacity.
+        :return: None -- manipulates HM directly.
+        """
+        with self._all_stripes():
+            if new_capacity < self._capacity:
+                self._rebuild(new_capacity)
+
+    def clear(self) -> None:
+        """
+        Clears the contents of the hash map, but does not change the underlying
+        hash table capacity.
 
-            # As long as the list length isn't 0, there are items in the LL.
-            #   Iterates through these nodes, appending our new_list with the
-            #   key, value tuple.
-            if ll.length != 0:
-                for ll_node in ll:
-                    ll_key = ll_node.key
-                    ll_value = ll_node.value
-                    new_da.append((ll_key, ll_value))
+        (No params)
+        :return: None.
+        """
+        with self._all_stripes():
+            new_da = DynamicArray([EMPTY_BUCKET] * self._capacity)
+            self._buckets = new_da
+            self._size = 0
+            self._empty_count = self._capacity
+            self._table = (new_da, self._capacity)
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Changes the capacity of the internal hash table (see
+        HashMap.resize_table()), holding every stripe while it does.
+
+        :param new_capacity: The new capacity we're attempting to re-size to.
+        :return: None -- manipulates HM directly.
+        """
+        if new_capacity < 1:
+            return
+
+        with self._all_stripes():
+            self._rebuild(new_capacity)
+
+    def put_many(self, items) -> None:
+        """
+        Puts every (key, value) pair from items into our HM, one put() at a
+        time.
+
+        :param items: An iterable of (key, value) pairs.
+        :return: None -- manipulates HM directly.
+        """
+        for key, value in items:
+            self.put(key, value)
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Returns a DA of the value associated with each of the given keys (or
+        None for keys not in our HM), in the same order as keys.
 
-        # Returns new_da at end.
+        :param keys: An iterable of keys.
+        :return: A new Dynamic Array object hosting the values.
+        """
+        new_da = DynamicArray()
+        for key in keys:
+            new_da.append(self.get(key))
         return new_da
 
+    def remove_many(self, keys) -> None:
+        """
+        Removes each of the given keys (and its value) from our HM, one
+        remove() at a time.
+
+        :param keys: An iterable of keys.
+        :return: None -- manipulates HM directly.
+        """
+        for key in keys:
+            self.remove(key)
+
+    def increment_many(self, keys, delta: int = 1) -> None:
+        """
+        Calls increment(key, delta) for every key in keys, in turn.
+
+        :param keys: An iterable of keys.
+        :param delta: The amount to add for each occurrence of a key.
+        :return: None -- manipulates HM directly.
+        """
+        for key in keys:
+            self.increment(key, delta)
+
+    def stats(self) -> dict:
+        """
+        Returns a plain dict describing our HM (see HashMap.stats()), holding
+        every stripe so the table can't change while it is measured.
+
+        (No params)
+        :return: A dict of statistic name to value.
+        """
+        with self._all_stripes():
+            return super().stats()
+
+    def _restore(self, table: TableDump) -> None:
+        """
+        Replaces our (empty) buckets with the nodes of a dump file (see
+        HashMap._restore()), then publishes them to readers.
+
+        :param table: The contents of a dump file of our capacity.
+        :return: None -- manipulates HM directly.
+        """
+        super()._restore(table)
+        self._table = (self._buckets, self._capacity)
+
+    def dump(self, path: str) -> None:
+        """
+        Writes our HM to a binary file (see HashMap.dump()), holding every
+        stripe so the table can't change while it is written.
+
+        :param path: The file to write.
+        :return: None
+        """
+        with self._all_stripes():
+            super().dump(path)
+
+    def __iter__(self):
+        """
+        Create iterator for loop, yielding the node of every key in the table
+        as it was when the loop started, without taking any lock.
+        """
+        buckets, capacity = self._table
+        for bucket_i in range(capacity):
+            yield from buckets[bucket_i]
+
 
 def find_mode(da: DynamicArray) -> (DynamicArray, int):
     """
@@ -385,18 +1696,9 @@ def find_mode(da: DynamicArray) -> (DynamicArray, int):
     #   be the item from da, value will ultimately be the frequency it appears.
     for da_i in range(da_length):
 
-        #   We can use map.get(key) to pull the value in the map
-        potential_value = map.get(da[da_i])
-
-        # If value is None, this is the first time we've seen this key. If not,
-        #   increment this value.
-        if potential_value is not None:
-            potential_value += 1
-        else:
-            potential_value = 1
-
-        # Put key/value back into HM with new value.
-        map.put(da[da_i], potential_value)
+        # increment() adds 1 to the key's count (starting it at 1 the first
+        #   time we see this key), finding its node with a single hash.
+        potential_value = map.increment(da[da_i])
 
         # Checks if potential value is newest high frequency. If so, rewrites
         #   DA to reflect this new value only. If it's equal to our previous
@@ -415,6 +1717,249 @@ def find_mode(da: DynamicArray) -> (DynamicArray, int):
     return new_da, highest_freq
 
 
+def find_mode_stream(items, top_k: int = 0,
+                     chunk_size: int = BATCH_CHUNK) -> tuple:
+    """
+    Returns the most-occurring value(s) of any iterable (a generator reading
+    a log file, say) along with how many times they occurred, and the top_k
+    most frequent values with their counts.
+
+    items is consumed chunk_size values at a time, each chunk counted into
+    a Separate Chaining HashMap in one batch, so memory is bounded by the
+    number of distinct values rather than the length of items. The top_k
+    values are then picked from the final counts with a heap of size top_k.
+
+    :param items: An iterable of strings.
+    :param top_k: How many of the most frequent values to return.
+    :param chunk_size: How many values to read from items at a time.
+    :return: A tuple of a DA of the most-occurring value(s), the # of times
+    they occur, and a DA of up to top_k (value, count) tuples, most frequent
+    first.
+    """
+    # Step 1) Counts every value, a chunk at a time.
+    counts = HashMap()
+    items = iter(items)
+    chunk = list(islice(items, chunk_size))
+    while chunk:
+        counts.increment_many(chunk)
+        chunk = list(islice(items, chunk_size))
+
+    # Step 2) Walks the counts once, collecting every value tied for the
+    #   highest count (starting over whenever a higher count turns up) and
+    #   keeping the top_k counts seen so far in a min-heap.
+    modes = DynamicArray()
+    highest_freq = 0
+    heap = []
+    for bucket_i in range(counts.get_capacity()):
+        for ll_node in counts._buckets[bucket_i]:
+            if ll_node.value > highest_freq:
+                modes = DynamicArray()
+                highest_freq = ll_node.value
+            if ll_node.value == highest_freq:
+                modes.append(ll_node.key)
+
+            # -- Ties on count are broken by value, so the result doesn't
+            #   depend on bucket order.
+            if top_k > 0:
+                entry = (ll_node.value, _Reversed(ll_node.key))
+                if len(heap) < top_k:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+
+    top = DynamicArray()
+    for count, key in sorted(heap, reverse=True):
+        top.append((key.value, count))
+
+    return modes, highest_freq, top
+
+
+# Inputs shorter than this are counted serially by find_mode_parallel(), as
+#   starting a pool and shipping the shards to it would cost more than it
+#   saves.
+PARALLEL_MIN_ITEMS = 200_000
+
+
+def find_mode_parallel(da: DynamicArray, workers: int = None,
+                       min_items: int = PARALLEL_MIN_ITEMS) -> tuple:
+    """
+    Returns the same tuple as find_mode(da), including the order of the
+    modes, counting with a pool of worker processes.
+
+    da is split into one contiguous shard per worker, and each worker counts
+    its shard into its own HashMap and splits those counts by key hash into
+    one partition per worker. Partition p of every shard is then merged by
+    a single worker, independently of the others. The modes are put back in
+    find_mode()'s order (the order in which each reached the highest count)
+    by having each shard's worker find where that happened.
+
+    :param da: A DA object of strings.
+    :param workers: The number of processes (by default, one per CPU).
+    :param min_items: Below this many elements, find_mode() is used instead.
+    :return: A Tuple including a DA of the most-occurring value(s) and # of
+    times it occurs.
+    """
+    workers = workers or os.cpu_count() or 1
+    length = da.length()
+    if workers == 1 or length < min_items:
+        return find_mode(da)
+
+    # Step 1) Splits da into contiguous shards, remembering where each one
+    #   starts.
+    values = [da[da_i] for da_i in range(length)]
+    bounds = [length * shard_i // workers for shard_i in range(workers + 1)]
+    shards = [values[bounds[i]:bounds[i + 1]] for i in range(workers)]
+    del values
+
+    with Pool(workers) as pool:
+        # Step 2) Counts each shard, split into partitions by key hash.
+        partitioned = pool.map(_count_shard,
+                               [(shard, workers) for shard in shards])
+
+        # Step 3) Merges each partition across every shard, each merge
+        #   reporting its highest count and the per-shard counts of the keys
+        #   that reached it.
+        merged = pool.map(_merge_partition,
+                          [[parts[part_i] for parts in partitioned]
+                           for part_i in range(workers)])
+        del partitioned
+
+        highest_freq = max(freq for freq, _ in merged)
+        if highest_freq == 0:
+            return DynamicArray(), 0
+
+        # Step 4) Works out, for each mode, which shard holds its
+        #   highest_freq-th occurrence and which occurrence within that
+        #   shard it is. Each shard's worker then finds those positions.
+        targets = [{} for _ in shards]
+        for freq, modes in merged:
+            if freq != highest_freq:
+                continue
+            for key, shard_counts in modes:
+                remaining = highest_freq
+                shard_i = 0
+                while shard_counts[shard_i] < remaining:
+                    remaining -= shard_counts[shard_i]
+                    shard_i += 1
+                targets[shard_i][key] = remaining
+
+        located = pool.map(_locate_modes, [
+            (shard, shard_targets, bounds[shard_i])
+            for shard_i, (shard, shard_targets)
+            in enumerate(zip(shards, targets)) if shard_targets])
+
+    # Step 5) Orders the modes by the position at which each reached
+    #   highest_freq.
+    positions = {}
+    for shard_positions in located:
+        positions.update(shard_positions)
+
+    new_da = DynamicArray()
+    for key in sorted(positions, key=positions.get):
+        new_da.append(key)
+    return new_da, highest_freq
+
+
+def _count_shard(task: tuple) -> list:
+    """
+    Worker for find_mode_parallel(): counts a shard, returning its counts
+    split into partitions by key hash.
+
+    :param task: A (shard, partitions) tuple, shard being a list of strings.
+    :return: A list of partitions, each a list of (key, count) tuples.
+    """
+    shard, partitions = task
+    counts = HashMap()
+    for start in range(0, len(shard), BATCH_CHUNK):
+        counts.increment_many(shard[start:start + BATCH_CHUNK])
+
+    parts = [[] for _ in range(partitions)]
+    for bucket_i in range(counts.get_capacity()):
+        for ll_node in counts._buckets[bucket_i]:
+            parts[ll_node.hash_val % partitions].append(
+                (ll_node.key, ll_node.value))
+    return parts
+
+
+def _merge_partition(parts: list) -> tuple:
+    """
+    Worker for find_mode_parallel(): adds up one partition's counts from
+    every shard.
+
+    :param parts: The partition's (key, count) tuples from each shard, in
+    shard order.
+    :return: A tuple of the highest count in the partition, and a list of
+    (key, per-shard counts) tuples for the keys that reached it.
+    """
+    totals = HashMap()
+    for part in parts:
+        for key, count in part:
+            totals.increment(key, count)
+
+    highest_freq = 0
+    modes = {}
+    for bucket_i in range(totals.get_capacity()):
+        for ll_node in totals._buckets[bucket_i]:
+            if ll_node.value > highest_freq:
+                highest_freq = ll_node.value
+                modes = {}
+            if ll_node.value == highest_freq:
+                modes[ll_node.key] = [0] * len(parts)
+
+    # -- Only the modes need their count from each shard.
+    for shard_i, part in enumerate(parts):
+        for key, count in part:
+            if key in modes:
+                modes[key][shard_i] = count
+
+    return highest_freq, list(modes.items())
+
+
+def _locate_modes(task: tuple) -> dict:
+    """
+    Worker for find_mode_parallel(): finds the position in da of given
+    occurrences of given keys within one shard.
+
+    :param task: A (shard, targets, offset) tuple, targets mapping each key
+    to which of its occurrences in the shard to find (1 for the first), and
+    offset being where the shard starts in da.
+    :return: A dict of key to the position of that occurrence in da.
+    """
+    shard, targets, offset = task
+
+    # -- One pass over the shard, counting each target key down to the
+    #   occurrence wanted, however many keys are targets.
+    remaining = dict(targets)
+    positions = {}
+    for shard_i, key in enumerate(shard):
+        if key not in remaining:
+            continue
+        remaining[key] -= 1
+        if remaining[key] == 0:
+            positions[key] = offset + shard_i
+            del remaining[key]
+            if not remaining:
+                break
+    return positions
+
+
+class _Reversed:
+    """
+    Wraps a value so that it sorts in reverse, letting a min-heap of
+    (count, _Reversed(key)) prefer the smaller key among equal counts.
+    """
+    __slots__ = ('value',)
+
+    def __init__(self, value) -> None:
+        self.value = value
+
+    def __lt__(self, other: "_Reversed") -> bool:
+        return self.value > other.value
+
+    def __eq__(self, other: "_Reversed") -> bool:
+        return self.value == other.value
+
+
 # ------------------- BASIC TESTING ---------------------------------------- #
 
 if __name__ == "__main__":
@@ -0,0 +1,660 @@
+# Course: CS261 - Data Structures
+# Assignment: Assignment #6: Hash Map
+# Description: An Open Addressing Hash Map that several processes share,
+# # -- held in multiprocessing.shared_memory segments so there is only ever
+# #     one copy of the table, whichever processes use it. Keys are split
+# #     across a power of two number of shards by the high bits of their
+# #     (Fibonacci-mixed) hash. Each shard is an open addressing table in its
+# #     own segment, laid out like a MappedHashMap file
+# #
+# #         header | capacity slots | data region
+# #
+# #     and probed with the same code, so a get() in any process reads the
+# #     shared slots and records directly, with no lock and no message to
+# #     another process.
+# #
+# #     A small directory segment holds, for each shard, a sequence number
+# #     and the generation of its current segment. Writers take the shard's
+# #     lock (a multiprocessing.Lock), and make the sequence number odd while
+# #     they change a slot. A reader notes the sequence number, looks its key
+# #     up, and retries if the number was odd or has changed since. A shard
+# #     outgrowing its segment is copied into a new one (the next
+# #     generation), which is published in the directory before the old
+# #     segment is unlinked.
+
+import os
+import pickle
+import secrets
+import struct
+import time
+import multiprocessing
+from multiprocessing.shared_memory import SharedMemory
+
+from a6_include import HashEntry, hash_function_1
+from hash_map_hashes import MASK_64, hash_function_name, named_hash_function
+from hash_map_mmap import (MappedHashMap, HEADER, HEADER_SIZE, SLOT, LENGTH,
+                           LIVE, TOMBSTONE, STATE_OFFSET, INITIAL_DATA)
+from hash_map_oa import HashMap
+from hash_map_policy import DEFAULT_POLICY, FIBONACCI_MULTIPLIER
+
+
+DIRECTORY_MAGIC = b'A6SHMDIR'
+SHARD_MAGIC = b'A6SHMSHD'
+
+# Magic, number of shards and the hash function's name (see
+#   hash_function_name()). The shard entries start at HEADER_SIZE.
+DIRECTORY_HEADER = struct.Struct('<8sQ64s')
+
+# Sequence number (odd while a writer is changing the shard) and the
+#   generation of the shard's current segment.
+SHARD_ENTRY = struct.Struct('<QQ')
+SEQUENCE_OFFSET = 0
+GENERATION_OFFSET = 8
+
+
+class SharedShard:
+    """
+    One shard of a ShardedHashMap: an open addressing table in a shared
+    memory segment, laid out like a MappedHashMap file. A segment never
+    grows; a shard that outgrows it is copied into a new one.
+    """
+
+    _policy = DEFAULT_POLICY
+
+    # Load factor (live entries plus tombstones) the table is kept below.
+    _max_load = 0.5
+
+    # Fraction of the slots tombstones may take before they are purged.
+    _compact_fraction = 0.25
+
+    def __init__(self, name: str, capacity: int = None,
+                 data_size: int = 0, hash_name: str = '') -> None:
+        """
+        Attaches to the shard segment with the given name or, if capacity
+        is given, creates it as an empty table of that capacity with room
+        for data_size bytes of records.
+        """
+        if capacity is None:
+            self._shm = SharedMemory(name)
+        else:
+            data_start = HEADER_SIZE + capacity * SLOT.size
+            self._shm = SharedMemory(name, create=True,
+                                     size=data_start + data_size)
+            HEADER.pack_into(self._shm.buf, 0, SHARD_MAGIC, capacity, 0, 0,
+                             data_start, hash_name.encode())
+
+        self._mm = self._shm.buf
+        magic, self._capacity = HEADER.unpack_from(self._mm, 0)[:2]
+        if magic != SHARD_MAGIC:
+            self.close()
+            raise ValueError(f"{name} is not a ShardedHashMap shard")
+        self._read_header()
+
+    # The slots and records are laid out as in a MappedHashMap file, so its
+    #   own code reads, probes and copies them.
+    _slot = MappedHashMap._slot
+    _probe = MappedHashMap._probe
+    _copy_live = MappedHashMap._copy_live
+    _write_header = MappedHashMap._write_header
+    _grown_capacity = HashMap._grown_capacity
+
+    def _read_header(self) -> None:
+        """
+        Reads our size, tombstone count and data region end from the header,
+        where the last writer left them.
+
+        (No params)
+        :return: None -- manipulates the shard directly.
+        """
+        self._size, self._tombstones, self._data_end = \
+            struct.unpack_from('<QQQ', self._mm, 16)
+
+    def _record(self, offset: int) -> bytes:
+        """
+        Returns a copy of the bytes of the record at the given offset.
+
+        :param offset: The segment offset of a key or value record.
+        :return: The record's contents.
+        """
+        start = offset + LENGTH.size
+        return bytes(
+            self._mm[start:start + LENGTH.unpack_from(self._mm, offset)[0]])
+
+    def _append(self, data: bytes) -> int:
+        """
+        Appends a record holding data to the data region, which the caller
+        has made sure has room for it (see fits()).
+
+        :param data: The bytes to store.
+        :return: The segment offset of the new record.
+        """
+        offset = self._data_end
+        end = offset + LENGTH.size + len(data)
+        LENGTH.pack_into(self._mm, offset, len(data))
+        self._mm[offset + LENGTH.size:end] = data
+        self._data_end = end
+        return offset
+
+    def fits(self, data_size: int) -> bool:
+        """
+        Returns True if data_size more bytes of records fit in our segment.
+
+        :param data_size: The bytes to be appended, lengths included.
+        :return: True if they fit.
+        """
+        return self._data_end + data_size <= self._shm.size
+
+    def live_data(self) -> int:
+        """
+        Returns the bytes taken by the key and current value records of our
+        live entries, lengths included: the data a copy of us would hold.
+
+        (No params)
+        :return: The number of bytes.
+        """
+        total = 0
+        for slot_i in range(self._capacity):
+            _, key_offset, value_offset, state = self._slot(slot_i)
+            if state == LIVE:
+                total += 2 * LENGTH.size + \
+                    LENGTH.unpack_from(self._mm, key_offset)[0] + \
+                    LENGTH.unpack_from(self._mm, value_offset)[0]
+        return total
+
+    def find(self, key_bytes: bytes, hash_val: int) -> bytes:
+        """
+        Returns the pickled value of the given key, or None if the key is
+        not in our shard.
+
+        :param key_bytes: The key, encoded as UTF-8.
+        :param hash_val: The key's hash, reduced to 64 bits.
+        :return: The value's record, or None.
+        """
+        slot_i = self._probe(key_bytes, hash_val, 'get')
+        if slot_i == -1:
+            return None
+        return self._record(self._slot(slot_i)[2])
+
+    def size(self) -> int:
+        """
+        Returns the number of live entries in our shard, as the last writer
+        left it.
+
+        (No params)
+        :return: The shard's size.
+        """
+        return struct.unpack_from('<Q', self._mm, 16)[0]
+
+    def entries(self) -> list:
+        """
+        Returns a HashEntry (read from our segment) for every key in our
+        shard.
+
+        (No params)
+        :return: A list of HashEntries.
+        """
+        entries = []
+        for slot_i in range(self._capacity):
+            hash_val, key_offset, value_offset, state = self._slot(slot_i)
+            if state == LIVE:
+                entries.append(HashEntry(
+                    self._record(key_offset).decode(),
+                    pickle.loads(self._record(value_offset)), hash_val))
+        return entries
+
+    def close(self) -> None:
+        """
+        Detaches from our segment. The shard can't be used afterwards.
+
+        (No params)
+        :return: None
+        """
+        self._mm = None
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """
+        Destroys our segment once every process has detached from it.
+
+        (No params)
+        :return: None
+        """
+        self._shm.unlink()
+
+
+class ShardedHashMap:
+    """
+    Open addressing HashMap spread across shared memory shards, so one table
+    can be used by many processes at once. It has the same semantics as
+    HashMap for put(), get(), remove(), contains_key(), get_size(),
+    clear(), iterating and the views.
+
+    The process that creates a ShardedHashMap owns its segments: the others
+    get it (pickled with its locks) as an argument of a new Process or of a
+    Pool's initializer, and each detaches with close() when done. The owner
+    calls unlink() (or leaves a with block) to destroy the segments.
+
+    get() takes no lock and is never blocked by a writer for longer than
+    its change to one slot. Iterating takes one shard's lock at a time, so
+    it may or may not see changes made to other shards while it runs.
+    """
+
+    def __init__(self, capacity: int = 11,
+                 function: callable = hash_function_1, shards: int = 8,
+                 name: str = None, context=None) -> None:
+        """
+        Creates a new, empty table with room for capacity entries, split
+        across shards shards (rounded up to a power of two), hashing keys
+        with function. Its segments are named after name, a random one by
+        default, and its locks are made for the processes of the given
+        multiprocessing context (the default one by default).
+        """
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+        shard_count = 1 << (shards - 1).bit_length()
+
+        self._name = name or f"a6hm_{secrets.token_hex(6)}"
+        context = context or multiprocessing.get_context()
+        self._locks = [context.Lock() for _ in range(shard_count)]
+        self._owner = os.getpid()
+
+        # Step 1) Writes the directory, every shard at generation 0.
+        directory = SharedMemory(
+            self._name, create=True,
+            size=HEADER_SIZE + shard_count * SHARD_ENTRY.size)
+        DIRECTORY_HEADER.pack_into(directory.buf, 0, DIRECTORY_MAGIC,
+                                   shard_count,
+                                   hash_function_name(function).encode())
+        directory.close()
+        self._attach()
+
+        # Step 2) Creates each shard's first segment.
+        shard_capacity = DEFAULT_POLICY.initial_capacity(
+            -(-capacity // shard_count) * 2)
+        for shard_i in range(shard_count):
+            self._shards[shard_i] = SharedShard(
+                self._segment_name(shard_i, 0), shard_capacity,
+                INITIAL_DATA, self._hash_name)
+            self._generations[shard_i] = 0
+
+    def __getstate__(self) -> dict:
+        """
+        Pickles the HM as the name of its directory and its locks, so only
+        a new Process or Pool initializer can be given it.
+        """
+        return {'name': self._name, 'locks': self._locks,
+                'owner': self._owner}
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Attaches to the pickled HM's directory. Shards are attached to as
+        they are first used.
+        """
+        self._name = state['name']
+        self._locks = state['locks']
+        self._owner = state['owner']
+        self._attach()
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        return (f"ShardedHashMap({self._name!r}, "
+                f"shards={self._shard_count}, size={self.get_size()})")
+
+    def __repr__(self) -> str:
+        """Override string method to provide more readable output."""
+        return str(self)
+
+    def __enter__(self) -> "ShardedHashMap":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if os.getpid() == self._owner:
+            self.unlink()
+        self.close()
+
+    # ------------------------------------------------------------------ #
+
+    def _attach(self) -> None:
+        """
+        Attaches to our directory segment and reads its header. No shard is
+        attached to yet.
+
+        (No params)
+        :return: None -- manipulates HM directly.
+        """
+        self._directory = SharedMemory(self._name)
+        magic, self._shard_count, hash_name = \
+            DIRECTORY_HEADER.unpack_from(self._directory.buf, 0)
+        if magic != DIRECTORY_MAGIC:
+            self._directory.close()
+            raise ValueError(f"{self._name} is not a ShardedHashMap")
+
+        self._hash_name = hash_name.rstrip(b'\0').decode()
+        self._hash_function = named_hash_function(self._hash_name)
+        self._shift = 64 - (self._shard_count - 1).bit_length()
+        self._shards = [None] * self._shard_count
+        self._generations = [-1] * self._shard_count
+
+    def _segment_name(self, shard_i: int, generation: int) -> str:
+        """
+        Returns the name of the given generation of a shard's segment.
+
+        :param shard_i: The index of the shard.
+        :param generation: The generation of its segment.
+        :return: The segment's name.
+        """
+        return f"{self._name}_{shard_i}_{generation}"
+
+    def _shard_of(self, hash_val: int) -> int:
+        """
+        Returns the shard of a key: the high bits of its Fibonacci-mixed
+        hash, which depend on every bit of the hash (a shard's slot is
+        picked by the hash modulo its prime capacity instead).
+
+        :param hash_val: The key's hash, reduced to 64 bits.
+        :return: The index of the key's shard.
+        """
+        return (hash_val * FIBONACCI_MULTIPLIER & MASK_64) >> self._shift
+
+    def _entry(self, shard_i: int) -> tuple:
+        """
+        Returns the directory entry of the given shard.
+
+        :param shard_i: The index of the shard.
+        :return: A tuple of its sequence number and generation.
+        """
+        return SHARD_ENTRY.unpack_from(
+            self._directory.buf, HEADER_SIZE + shard_i * SHARD_ENTRY.size)
+
+    def _bump(self, shard_i: int) -> None:
+        """
+        Adds one to the sequence number of the given shard, which must be
+        locked: a writer calls this before and after each change readers
+        could see.
+
+        :param shard_i: The index of the shard.
+        :return: None
+        """
+        offset = HEADER_SIZE + shard_i * SHARD_ENTRY.size + SEQUENCE_OFFSET
+        sequence, = struct.unpack_from('<Q', self._directory.buf, offset)
+        struct.pack_into('<Q', self._directory.buf, offset, sequence + 1)
+
+    def _shard(self, shard_i: int, generation: int) -> SharedShard:
+        """
+        Returns the given generation of a shard, attaching to it (and
+        detaching from the one we had) if need be.
+
+        :param shard_i: The index of the shard.
+        :param generation: The generation of its current segment.
+        :return: The shard.
+        """
+        if self._generations[shard_i] != generation:
+            old_shard = self._shards[shard_i]
+            self._shards[shard_i] = SharedShard(
+                self._segment_name(shard_i, generation))
+            self._generations[shard_i] = generation
+            if old_shard is not None:
+                old_shard.close()
+
+        return self._shards[shard_i]
+
+    def _read(self, shard_i: int, reader: callable, *args) -> object:
+        """
+        Calls reader(shard, *args) on the given shard without locking it,
+        trying again for as long as a writer changed the shard meanwhile,
+        and returns its result.
+
+        :param shard_i: The index of the shard.
+        :param reader: A function reading the shard.
+        :param args: Any further arguments of reader.
+        :return: What reader returned, for a shard no writer touched.
+        """
+        while True:
+            sequence, generation = self._entry(shard_i)
+            if sequence & 1:
+                # -- A writer is mid-change: lets it run rather than spin.
+                time.sleep(0)
+                continue
+
+            try:
+                result = reader(self._shard(shard_i, generation), *args)
+            except (FileNotFoundError, struct.error):
+                # -- A torn read (or a segment replaced and unlinked before
+                #   we attached) is only an error if nothing changed.
+                if self._entry(shard_i)[0] == sequence:
+                    raise
+                continue
+
+            if self._entry(shard_i)[0] == sequence:
+                return result
+
+    def _locked_shard(self, shard_i: int) -> SharedShard:
+        """
+        Returns the current generation of the given shard, which must be
+        locked, with its header read.
+
+        :param shard_i: The index of the shard.
+        :return: The shard.
+        """
+        shard = self._shard(shard_i, self._entry(shard_i)[1])
+        shard._read_header()
+        return shard
+
+    def _rebuild(self, shard_i: int, capacity: int, data_size: int,
+                 keep: bool = True) -> SharedShard:
+        """
+        Copies the live entries of the given shard, which must be locked,
+        into a new segment of the given capacity, with room for data_size
+        more bytes of records, then publishes it in place of the old one
+        and unlinks that. Processes still reading the old segment keep their
+        mapping of it until they next look at the shard.
+
+        :param shard_i: The index of the shard.
+        :param capacity: The new segment's capacity.
+        :param data_size: The bytes of new records it must have room for.
+        :param keep: False to leave the new segment empty instead.
+        :return: The new shard.
+        """
+        shard = self._locked_shard(shard_i)
+        generation = self._generations[shard_i] + 1
+
+        # Step 1) Builds the new segment off to the side.
+        new_shard = SharedShard(
+            self._segment_name(shard_i, generation), capacity,
+            max(2 * ((shard.live_data() if keep else 0) + data_size),
+                INITIAL_DATA), self._hash_name)
+        if keep:
+            shard._copy_live(new_shard)
+
+        # Step 2) Publishes it, then unlinks the old one.
+        self._bump(shard_i)
+        struct.pack_into('<Q', self._directory.buf,
+                         HEADER_SIZE + shard_i * SHARD_ENTRY.size +
+                         GENERATION_OFFSET, generation)
+        self._bump(shard_i)
+
+        shard.unlink()
+        return self._shard(shard_i, generation)
+
+    # ------------------------------------------------------------------ #
+
+    def get_size(self) -> int:
+        """
+        Returns the number of key / value pairs in our HM.
+
+        (No params)
+        :return: The number of items in our HM.
+        """
+        return sum(self._read(shard_i, SharedShard.size)
+                   for shard_i in range(self._shard_count))
+
+    def get_capacity(self) -> int:
+        """
+        Returns the total capacity of our shards.
+
+        (No params)
+        :return: The sum of the shards' capacities.
+        """
+        return sum(self._read(shard_i, lambda shard: shard._capacity)
+                   for shard_i in range(self._shard_count))
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Takes a key / value pair and either updates it (in the case that the
+        key already exists), or adds it (in the case that it doesn't) to our
+        HM, holding only the lock of the key's shard.
+
+        :param key: The key of our entry.
+        :param value: The value of our entry.
+        :return: None -- manipulates HM directly.
+        """
+        key_bytes = key.encode()
+        value_bytes = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        hash_val = self._hash_function(key) & MASK_64
+        shard_i = self._shard_of(hash_val)
+        data_size = 2 * LENGTH.size + len(key_bytes) + len(value_bytes)
+
+        with self._locks[shard_i]:
+            # Step 1) Makes room for one more key (and its records): grows
+            #   the shard (or purges its tombstones) as HashMap.put() would,
+            #   or copies it to a segment with a larger data region.
+            shard = self._locked_shard(shard_i)
+            capacity = shard._capacity
+            if shard._grown_capacity(capacity, shard._size +
+                                     shard._tombstones + 1) != capacity:
+                shard = self._rebuild(
+                    shard_i, shard._grown_capacity(capacity, shard._size + 1),
+                    data_size)
+            elif not shard.fits(data_size):
+                shard = self._rebuild(shard_i, capacity, data_size)
+
+            # Step 2) Appends the records where no reader looks yet, then
+            #   points the key's slot at them.
+            slot_i = shard._probe(key_bytes, hash_val, 'put')
+            _, key_offset, _, state = shard._slot(slot_i)
+            value_offset = shard._append(value_bytes)
+            if state != LIVE:
+                key_offset = shard._append(key_bytes)
+                shard._size += 1
+                if state == TOMBSTONE:
+                    shard._tombstones -= 1
+
+            self._bump(shard_i)
+            SLOT.pack_into(shard._mm, HEADER_SIZE + slot_i * SLOT.size,
+                           hash_val, key_offset, value_offset, LIVE)
+            shard._write_header()
+            self._bump(shard_i)
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value associated with the given key. If the key is not in
+        our HM, returns None. Takes no lock.
+
+        :param key: The key we are ultimately looking for.
+        :return: The value associated with said key.
+        """
+        hash_val = self._hash_function(key) & MASK_64
+        record = self._read(self._shard_of(hash_val), SharedShard.find,
+                            key.encode(), hash_val)
+        return None if record is None else pickle.loads(record)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns True if the given key is in our HM. Takes no lock.
+
+        :param key: The key we're looking for in our HM.
+        :return: True if key is found in our HM.
+        """
+        hash_val = self._hash_function(key) & MASK_64
+        return self._read(self._shard_of(hash_val), SharedShard.find,
+                          key.encode(), hash_val) is not None
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the given key and its associated value from the HM, leaving
+        a tombstone in its slot. If the key is not in the HM, the method
+        does nothing.
+
+        :param key: The key of the entry we're looking to remove.
+        :return: None -- manipulates HM directly.
+        """
+        key_bytes = key.encode()
+        hash_val = self._hash_function(key) & MASK_64
+        shard_i = self._shard_of(hash_val)
+
+        with self._locks[shard_i]:
+            shard = self._locked_shard(shard_i)
+            slot_i = shard._probe(key_bytes, hash_val, 'remove')
+            if slot_i == -1:
+                return
+
+            self._bump(shard_i)
+            shard._mm[HEADER_SIZE + slot_i * SLOT.size + STATE_OFFSET] = \
+                TOMBSTONE
+            shard._size -= 1
+            shard._tombstones += 1
+            shard._write_header()
+            self._bump(shard_i)
+
+            if shard._tombstones > shard._compact_fraction * shard._capacity:
+                self._rebuild(shard_i, shard._capacity, 0)
+
+    def clear(self) -> None:
+        """
+        Clears the contents of the hash map, but does not change the
+        underlying capacity of any shard. Each shard is locked in turn and
+        replaced by an empty segment.
+
+        (No params)
+        :return: None.
+        """
+        for shard_i in range(self._shard_count):
+            with self._locks[shard_i]:
+                self._rebuild(shard_i, self._locked_shard(shard_i)._capacity,
+                              0, keep=False)
+
+    # Only get_size(), contains_key(), get() and iterating are used by the
+    #   views, so HashMap's own ones work over us.
+    keys = HashMap.keys
+    values = HashMap.values
+    items = HashMap.items
+    get_keys_and_values = HashMap.get_keys_and_values
+
+    def __iter__(self):
+        """
+        Create iterator for loop, yielding a HashEntry for every key in our
+        HM. Each shard's entries are read while holding its lock.
+        """
+        for shard_i in range(self._shard_count):
+            with self._locks[shard_i]:
+                entries = self._locked_shard(shard_i).entries()
+            yield from entries
+
+    def close(self) -> None:
+        """
+        Detaches this process from our segments. The HM can't be used here
+        afterwards.
+
+        (No params)
+        :return: None
+        """
+        for shard in self._shards:
+            if shard is not None:
+                shard.close()
+        self._shards = [None] * self._shard_count
+        self._generations = [-1] * self._shard_count
+        self._directory.close()
+
+    def unlink(self) -> None:
+        """
+        Destroys our segments, once every process has detached from them.
+        Only the owner (the process that created the HM) should call this,
+        when every other process is done with it.
+
+        (No params)
+        :return: None
+        """
+        for shard_i in range(self._shard_count):
+            generation = self._entry(shard_i)[1]
+            SharedMemory(self._segment_name(shard_i, generation)).unlink()
+        self._directory.unlink()
@@ -0,0 +1,268 @@
+# Course: CS261 - Data Structures
+# Assignment: Assignment #6: Hash Map
+# Description: Approximate, fixed-memory counting for streams with too many
+# # -- distinct keys to hold in a HashMap. A CountMinSketch keeps depth rows
+# #     of width counters in a NumPy array, updated a whole batch of hashes
+# #     at a time. HeavyHitters pairs a sketch with a fixed number of
+# #     candidate keys (those with the highest estimates so far), and
+# #     find_mode_approx() uses it as a bounded-memory find_mode().
+# #
+# #     A sketch never under-counts. With probability at least
+# #     1 - e ** -depth, it over-counts a key by no more than
+# #     e / width * (the total count), which error_bound() reports.
+# #     Keys that the hash function itself maps to the same value are
+# #     counted together (as anagrams are by hash_function_1), so a stronger
+# #     hash function gives tighter estimates.
+
+import math
+import secrets
+from itertools import islice
+
+from a6_include import DynamicArray, hash_function_2
+from hash_map_hashes import hash_batch, BATCH_CHUNK, BATCH_HASH_FUNCTIONS
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+MASK_64 = (1 << 64) - 1
+
+
+def hash_array(function: callable, keys: list):
+    """
+    Returns the hash of every key as a NumPy uint64 array (each hash reduced
+    to its low 64 bits), using the batched variant of function when there
+    is one.
+
+    :param function: The hash function.
+    :param keys: A list of keys.
+    :return: A uint64 array of hashes, in the same order as keys.
+    """
+    batch_function = BATCH_HASH_FUNCTIONS.get(function)
+    if batch_function is not None:
+        return numpy.asarray(batch_function(keys)).astype(numpy.uint64)
+    return numpy.array([hash_val & MASK_64
+                        for hash_val in hash_batch(function, keys)],
+                       dtype=numpy.uint64)
+
+
+class CountMinSketch:
+    """
+    depth rows of width counters. A hash is counted once in every row, at a
+    column picked by that row's multiply-shift hash of it, and its estimate
+    is the smallest of those counters.
+    """
+
+    def __init__(self, width: int = 1 << 16, depth: int = 4,
+                 seed: int = None) -> None:
+        """
+        Initialize a new, empty sketch of depth rows of width counters (width
+        must be a power of two). Each row's multiplier and offset are drawn
+        from seed, or at random.
+        """
+        if numpy is None:
+            raise ImportError("CountMinSketch needs NumPy")
+        if width < 2 or width & (width - 1):
+            raise ValueError("width must be a power of two")
+        if depth < 1:
+            raise ValueError("depth must be at least 1")
+
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self._counters = numpy.zeros((depth, width), dtype=numpy.int64)
+
+        rand = numpy.random.default_rng(
+            secrets.randbits(64) if seed is None else seed)
+        self._multipliers = rand.integers(0, 1 << 63, size=(depth, 1),
+                                          dtype=numpy.uint64) * 2 + 1
+        self._offsets = rand.integers(0, 1 << 63, size=(depth, 1),
+                                      dtype=numpy.uint64)
+        self._shift = numpy.uint64(64 - (width.bit_length() - 1))
+        self._rows = numpy.arange(depth)[:, numpy.newaxis]
+
+    def columns(self, hashes):
+        """
+        Returns the column each hash lands in, in each row.
+
+        :param hashes: A uint64 array of hashes.
+        :return: A (depth, len(hashes)) array of column indices.
+        """
+        # uint64 arithmetic wraps mod 2 ** 64, as multiply-shift needs.
+        return ((hashes * self._multipliers + self._offsets)
+                >> self._shift).astype(numpy.intp)
+
+    def add(self, hashes):
+        """
+        Counts each hash once (a hash repeated in the batch is counted each
+        time it appears).
+
+        :param hashes: A uint64 array of hashes.
+        :return: The columns of each hash, as returned by columns().
+        """
+        columns = self.columns(hashes)
+        flat = (columns + self._rows * self.width).ravel()
+        self._counters += numpy.bincount(
+            flat, minlength=self.depth * self.width).reshape(
+            self.depth, self.width)
+        self.total += len(hashes)
+        return columns
+
+    def estimate(self, hashes=None, columns=None):
+        """
+        Returns the estimated count of each hash (given either the hashes
+        or their columns).
+
+        :param hashes: A uint64 array of hashes.
+        :param columns: Their columns, as returned by columns().
+        :return: An int64 array of estimates.
+        """
+        if columns is None:
+            columns = self.columns(hashes)
+        return self._counters[self._rows, columns].min(axis=0)
+
+    def error_bound(self) -> int:
+        """
+        Returns how far any estimate may exceed the true count, with
+        probability at least confidence().
+
+        (No params)
+        :return: The most an estimate over-counts by.
+        """
+        return math.ceil(math.e / self.width * self.total)
+
+    def confidence(self) -> float:
+        """
+        Returns the probability that a given estimate is within
+        error_bound() of the true count.
+
+        (No params)
+        :return: A probability.
+        """
+        return 1 - math.exp(-self.depth)
+
+
+class HeavyHitters:
+    """
+    A CountMinSketch along with the capacity keys estimated to be the most
+    frequent so far, for finding the most frequent keys of a stream in
+    fixed memory.
+    """
+
+    def __init__(self, capacity: int = 16, width: int = 1 << 16,
+                 depth: int = 4, function: callable = hash_function_2,
+                 seed: int = None) -> None:
+        """
+        Initialize a new, empty tracker of the capacity most frequent keys,
+        hashing keys with function into a sketch of the given shape.
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.sketch = CountMinSketch(width, depth, seed)
+        self.capacity = capacity
+        self._function = function
+
+        # Candidate keys, and the hash of each.
+        self._keys = []
+        self._hashes = numpy.empty(0, dtype=numpy.uint64)
+
+    def update(self, keys) -> None:
+        """
+        Counts every key in keys, in one batch, and refreshes the candidates.
+
+        :param keys: A list of keys.
+        :return: None -- manipulates the tracker directly.
+        """
+        keys = list(keys)
+        if not keys:
+            return
+
+        # Step 1) Counts the batch.
+        hashes = hash_array(self._function, keys)
+        self.sketch.add(hashes)
+
+        # Step 2) Pools the candidates with the batch's distinct keys, and
+        #   keeps the capacity with the highest estimates.
+        pool = dict(zip(self._keys, self._hashes.tolist()))
+        for key, hash_val in zip(keys, hashes.tolist()):
+            pool.setdefault(key, hash_val)
+
+        pool_keys = list(pool)
+        pool_hashes = numpy.fromiter(pool.values(), dtype=numpy.uint64,
+                                     count=len(pool))
+        pool_estimates = self.sketch.estimate(pool_hashes)
+        if len(pool_keys) > self.capacity:
+            keep = numpy.argpartition(-pool_estimates,
+                                      self.capacity - 1)[:self.capacity]
+            pool_keys = [pool_keys[i] for i in keep.tolist()]
+            pool_hashes = pool_hashes[keep]
+
+        self._keys = pool_keys
+        self._hashes = pool_hashes
+
+    def top(self, k: int = None) -> DynamicArray:
+        """
+        Returns the k (by default, all) candidates with the highest
+        estimates, along with their estimates, most frequent first.
+
+        :param k: How many candidates to return.
+        :return: A DA of (key, estimate) tuples.
+        """
+        estimates = self.sketch.estimate(self._hashes).tolist()
+        ranked = sorted(zip(self._keys, estimates),
+                        key=lambda pair: (-pair[1], pair[0]))
+
+        new_da = DynamicArray()
+        for pair in ranked[:k]:
+            new_da.append(pair)
+        return new_da
+
+    def modes(self) -> tuple:
+        """
+        Returns every candidate that could be the mode: each whose estimate
+        is within error_bound() of the highest. The true mode is among them
+        (with probability at least the sketch's confidence(), and as long as
+        it is one of the candidates).
+
+        (No params)
+        :return: A tuple of a DA of (key, estimate) tuples, most frequent
+        first, and the error bound on each estimate.
+        """
+        error = self.sketch.error_bound()
+        ranked = self.top()
+        new_da = DynamicArray()
+        for rank_i in range(ranked.length()):
+            if ranked[rank_i][1] < ranked[0][1] - error:
+                break
+            new_da.append(ranked[rank_i])
+        return new_da, error
+
+
+def find_mode_approx(items, capacity: int = 16, width: int = 1 << 16,
+                     depth: int = 4, function: callable = hash_function_2,
+                     chunk_size: int = BATCH_CHUNK) -> tuple:
+    """
+    Returns the candidate mode(s) of any iterable, with their estimated
+    frequencies, in memory fixed by the sketch's width and depth and the
+    number of candidates kept, however many distinct values items holds.
+
+    :param items: An iterable of strings.
+    :param capacity: How many candidate keys to keep.
+    :param width: The number of counters in each row of the sketch.
+    :param depth: The number of rows in the sketch.
+    :param function: The hash function.
+    :param chunk_size: How many values to read from items at a time.
+    :return: A tuple of a DA of (key, estimate) tuples (see
+    HeavyHitters.modes()), and the most any estimate over-counts by.
+    """
+    hitters = HeavyHitters(capacity, width, depth, function)
+    items = iter(items)
+    chunk = list(islice(items, chunk_size))
+    while chunk:
+        hitters.update(chunk)
+        chunk = list(islice(items, chunk_size))
+
+    return hitters.modes()
@@ -0,0 +1,107 @@
+# Course: CS261 - Data Structures
+# Assignment: Assignment #6: Hash Map
+# Description: Operation counters for the Separate Chaining and Open
+# # -- Addressing Hash Maps. A HashMap only keeps a HashMapStats while
+# #     enable_stats() is in effect; otherwise each operation pays for a
+# #     single "is None" check. HashMap.stats() reports these counters along
+# #     with the table's shape, as a plain dict.
+
+
+class HashMapStats:
+    """
+    Running counts of the operations on one HashMap since enable_stats().
+    """
+    __slots__ = ('puts', 'updates', 'gets', 'hits', 'misses', 'removes',
+                 'probe_ops', 'probes', 'max_probes',
+                 'resizes', 'resize_seconds', 'compactions')
+
+    def __init__(self) -> None:
+        """
+        Initialize every counter to 0.
+        """
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    def put(self, updated: bool) -> None:
+        """
+        Counts a put(), and whether it updated an existing key.
+
+        :param updated: True if the key was already in the HM.
+        :return: None
+        """
+        self.puts += 1
+        if updated:
+            self.updates += 1
+
+    def get(self, hit: bool) -> None:
+        """
+        Counts a get(), and whether it found its key.
+
+        :param hit: True if the key was in the HM.
+        :return: None
+        """
+        self.gets += 1
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def put_many(self, count: int, inserted: int) -> None:
+        """
+        Counts a put_many() of count pairs, inserted of which were new keys.
+
+        :param count: The number of pairs put.
+        :param inserted: How many more keys the HM holds afterwards.
+        :return: None
+        """
+        self.puts += count
+        self.updates += count - inserted
+
+    def get_many(self, values) -> None:
+        """
+        Counts a get_many() from the DA of values it returned, taking each
+        value other than None as a hit.
+
+        :param values: The Dynamic Array get_many() returned.
+        :return: None
+        """
+        count = values.length()
+        hits = sum(values[i] is not None for i in range(count))
+        self.gets += count
+        self.hits += hits
+        self.misses += count - hits
+
+    def probed(self, probes: int) -> None:
+        """
+        Counts one probe sequence of the given length (the number of slots
+        looked at).
+
+        :param probes: The number of slots probed.
+        :return: None
+        """
+        self.probe_ops += 1
+        self.probes += probes
+        if probes > self.max_probes:
+            self.max_probes = probes
+
+    def resized(self, seconds: float) -> None:
+        """
+        Counts a resize that took the given time.
+
+        :param seconds: How long the resize took.
+        :return: None
+        """
+        self.resizes += 1
+        self.resize_seconds += seconds
+
+    def as_dict(self) -> dict:
+        """
+        Returns every counter, plus the mean probe length, as a dict.
+
+        (No params)
+        :return: A dict of counter name to value.
+        """
+        counts = {name: getattr(self, name) for name in self.__slots__}
+        counts['mean_probes'] = self.probes / self.probe_ops \
+            if self.probe_ops else 0.0
+        return counts
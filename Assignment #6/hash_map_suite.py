@@ -0,0 +1,461 @@
+# Course: CS261 - Data Structures
+# Assignment: Assignment #6: Hash Map
+# Description: Reproducible benchmark suite for the Separate Chaining and
+# # -- Open Addressing Hash Maps. Every combination of map, workload, key
+# #     distribution, hash function and size is run, reporting ops/sec,
+# #     peak memory and p50/p99 latency per operation (plus find_mode()),
+# #     and the results are saved as JSON:
+# #
+# #         python hash_map_suite.py run --sizes 1000 10000 --out base.json
+# #
+# #     Two result files (say, from before and after a change) are then
+# #     compared cell by cell with:
+# #
+# #         python hash_map_suite.py compare base.json new.json
+# #
+# #     Keys and operation streams come from a seeded generator, so a run
+# #     with the same arguments always performs exactly the same operations.
+
+import argparse
+import gc
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from itertools import accumulate
+
+from a6_include import DynamicArray, hash_function_1, hash_function_2
+import hash_map_oa
+import hash_map_sc
+from hash_map_bench import random_keys, percentile
+
+
+# Map types, each built from a hash function.
+MAPS = {
+    'sc': lambda function: hash_map_sc.HashMap(11, function),
+    'oa': lambda function: hash_map_oa.HashMap(11, function),
+    'sc_incremental':
+        lambda function: hash_map_sc.IncrementalHashMap(11, function),
+    'oa_robin_hood':
+        lambda function: hash_map_oa.RobinHoodHashMap(11, function),
+    'oa_array': lambda function: hash_map_oa.ArrayHashMap(11, function),
+    'oa_incremental':
+        lambda function: hash_map_oa.IncrementalHashMap(11, function),
+}
+
+HASH_FUNCTIONS = {
+    'hash_function_1': hash_function_1,
+    'hash_function_2': hash_function_2,
+}
+
+# Each workload is whether the map is first filled with every key, and the
+#   share of each operation in the stream that follows.
+WORKLOADS = {
+    'insert': (False, {'put': 0.9, 'get': 0.1}),
+    'read': (True, {'get': 0.9, 'put': 0.1}),
+    'update': (True, {'put': 0.9, 'get': 0.1}),
+    'churn': (True, {'remove': 0.5, 'put': 0.5}),
+    'mixed': (True, {'get': 0.5, 'put': 0.3, 'remove': 0.2}),
+}
+
+DISTRIBUTIONS = ('uniform', 'zipf')
+
+# Exponent of the Zipf distribution: the k-th most popular key is drawn
+#   with probability proportional to 1 / k ** ZIPF_EXPONENT.
+ZIPF_EXPONENT = 1.1
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+
+def key_stream(keys: list, count: int, distribution: str,
+               rand: random.Random) -> list:
+    """
+    Returns count keys drawn (with replacement) from keys. Under 'zipf' the
+    popularity of each key follows a Zipf distribution, with the most
+    popular keys spread at random through keys.
+
+    :param keys: The key universe.
+    :param count: The number of keys to draw.
+    :param distribution: 'uniform' or 'zipf'.
+    :param rand: The random generator to draw with.
+    :return: A list of keys.
+    """
+    if distribution == 'uniform':
+        return rand.choices(keys, k=count)
+
+    ranked = keys[:]
+    rand.shuffle(ranked)
+    weights = accumulate(1 / rank ** ZIPF_EXPONENT
+                         for rank in range(1, len(ranked) + 1))
+    return rand.choices(ranked, cum_weights=list(weights), k=count)
+
+
+def op_stream(keys: list, count: int, mix: dict, distribution: str,
+              seed: int) -> list:
+    """
+    Returns count (operation, key) pairs, with operations drawn in the
+    proportions of mix and keys drawn from keys by the given distribution.
+
+    :param keys: The key universe.
+    :param count: The number of operations.
+    :param mix: Operation name to its share of the stream.
+    :param distribution: 'uniform' or 'zipf'.
+    :param seed: Seed for the random generator.
+    :return: A list of (operation, key) pairs.
+    """
+    rand = random.Random(seed)
+    ops = rand.choices(list(mix), weights=list(mix.values()), k=count)
+    return list(zip(ops, key_stream(keys, count, distribution, rand)))
+
+
+def run_ops(m, ops: list) -> None:
+    """
+    Performs each (operation, key) pair on m.
+
+    :param m: A HashMap.
+    :param ops: A list of (operation, key) pairs.
+    :return: None
+    """
+    put, get, remove = m.put, m.get, m.remove
+    for op, key in ops:
+        if op == 'get':
+            get(key)
+        elif op == 'put':
+            put(key, key)
+        else:
+            remove(key)
+
+
+def timed_ops(m, ops: list) -> dict:
+    """
+    Performs each (operation, key) pair on m, timing each one.
+
+    :param m: A HashMap.
+    :param ops: A list of (operation, key) pairs.
+    :return: Operation name to a list of its latencies, in nanoseconds.
+    """
+    latencies = {op: [] for op, _ in ops}
+    put, get, remove = m.put, m.get, m.remove
+    clock = time.perf_counter_ns
+    for op, key in ops:
+        if op == 'get':
+            start = clock()
+            get(key)
+        elif op == 'put':
+            start = clock()
+            put(key, key)
+        else:
+            start = clock()
+            remove(key)
+        latencies[op].append(clock() - start)
+    return latencies
+
+
+def new_map(map_name: str, function: callable, keys: list, preload: bool):
+    """
+    Returns a new map of the given type, filled with every key if preload.
+
+    :param map_name: A key of MAPS.
+    :param function: The hash function.
+    :param keys: The key universe.
+    :param preload: Whether to put every key first.
+    :return: The map.
+    """
+    m = MAPS[map_name](function)
+    if preload:
+        m.put_many((key, key) for key in keys)
+    return m
+
+
+def run_cell(map_name: str, workload: str, distribution: str,
+             hash_name: str, size: int, seed: int, memory: bool) -> dict:
+    """
+    Runs one workload of size operations over a universe of size keys, three
+    times over: once untimed for throughput, once timing every operation,
+    and (if memory) once under tracemalloc for peak memory. Each run starts
+    from a fresh map.
+
+    :return: A dict of the cell's parameters and results.
+    """
+    preload, mix = WORKLOADS[workload]
+    function = HASH_FUNCTIONS[hash_name]
+    keys = random_keys(size, 16, seed)
+    ops = op_stream(keys, size, mix, distribution, seed)
+
+    # Step 1) Throughput, with nothing else in the loop.
+    m = new_map(map_name, function, keys, preload)
+    gc.collect()
+    start = time.perf_counter()
+    run_ops(m, ops)
+    elapsed = time.perf_counter() - start
+
+    # Step 2) Latency of each operation. Garbage collection pauses would
+    #   otherwise swamp the tail.
+    m = new_map(map_name, function, keys, preload)
+    gc.collect()
+    gc.disable()
+    try:
+        latencies = timed_ops(m, ops)
+    finally:
+        gc.enable()
+
+    cell = {
+        'map': map_name,
+        'workload': workload,
+        'distribution': distribution,
+        'hash': hash_name,
+        'size': size,
+        'seconds': elapsed,
+        'ops_per_sec': size / elapsed if elapsed else None,
+        'latency_us': {
+            op: {
+                'count': len(values),
+                'p50': percentile(values, 0.5) / 1e3,
+                'p99': percentile(values, 0.99) / 1e3,
+            }
+            for op, values in sorted(latencies.items())
+        },
+        'final_size': m.get_size(),
+        'final_capacity': m.get_capacity(),
+    }
+
+    # Step 3) Peak memory of filling the map and running the workload,
+    #   beyond the keys and operations already allocated.
+    if memory:
+        del m
+        gc.collect()
+        tracemalloc.start()
+        m = new_map(map_name, function, keys, preload)
+        run_ops(m, ops)
+        cell['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return cell
+
+
+def run_find_mode(distribution: str, size: int, seed: int,
+                  memory: bool) -> dict:
+    """
+    Times hash_map_sc.find_mode() over a DA of size keys drawn from a
+    universe of size keys by the given distribution.
+
+    :return: A dict of the cell's parameters and results.
+    """
+    keys = random_keys(size, 16, seed)
+    da = DynamicArray(key_stream(keys, size, distribution,
+                                 random.Random(seed)))
+
+    gc.collect()
+    start = time.perf_counter()
+    _, frequency = hash_map_sc.find_mode(da)
+    elapsed = time.perf_counter() - start
+
+    cell = {
+        'map': 'sc',
+        'workload': 'find_mode',
+        'distribution': distribution,
+        'hash': 'hash_function_1',
+        'size': size,
+        'seconds': elapsed,
+        'ops_per_sec': size / elapsed if elapsed else None,
+        'mode_frequency': frequency,
+    }
+
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        hash_map_sc.find_mode(da)
+        cell['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return cell
+
+
+def environment() -> dict:
+    """
+    Returns a description of where and on what code the suite ran.
+
+    (No params)
+    :return: A dict of environment details.
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'],
+                                capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'commit': commit,
+        'started': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
+
+
+def run_suite(args) -> dict:
+    """
+    Runs every cell asked for, printing a line per cell as it finishes.
+
+    A (map, workload, distribution, hash) combination that took longer than
+    args.max_seconds at one size is skipped at the larger sizes, since the
+    worst combinations (hash_function_1 in particular) grow far faster than
+    linearly.
+
+    :param args: The parsed command line arguments.
+    :return: The results, ready to be saved as JSON.
+    """
+    results = []
+    too_slow = set()
+    for size in sorted(args.sizes):
+        for map_name in args.maps:
+            for workload in args.workloads:
+                for distribution in args.distributions:
+                    for hash_name in args.hashes:
+                        combo = (map_name, workload, distribution, hash_name)
+                        if combo in too_slow:
+                            continue
+
+                        start = time.perf_counter()
+                        cell = run_cell(map_name, workload, distribution,
+                                        hash_name, size, args.seed,
+                                        not args.no_memory)
+                        results.append(cell)
+                        print(summary(cell), flush=True)
+                        if time.perf_counter() - start > args.max_seconds:
+                            too_slow.add(combo)
+
+        if args.find_mode:
+            for distribution in args.distributions:
+                cell = run_find_mode(distribution, size, args.seed,
+                                     not args.no_memory)
+                results.append(cell)
+                print(summary(cell), flush=True)
+
+    return {
+        'environment': environment(),
+        'parameters': {
+            'sizes': sorted(args.sizes),
+            'maps': args.maps,
+            'workloads': {name: WORKLOADS[name] for name in args.workloads},
+            'distributions': args.distributions,
+            'zipf_exponent': ZIPF_EXPONENT,
+            'hashes': args.hashes,
+            'seed': args.seed,
+        },
+        'results': results,
+    }
+
+
+def summary(cell: dict) -> str:
+    """
+    Returns a one-line summary of a cell's results.
+
+    :param cell: A dict returned by run_cell() or run_find_mode().
+    :return: The summary.
+    """
+    line = (f"{cell['map']:>14} {cell['workload']:>9} "
+            f"{cell['distribution']:>7} {cell['hash']:>15} "
+            f"n={cell['size']:<8} {cell['ops_per_sec'] or 0:>12,.0f} ops/s")
+    if 'peak_bytes' in cell:
+        line += f" {cell['peak_bytes'] / 2 ** 20:8.1f}MB"
+    for op, latency in cell.get('latency_us', {}).items():
+        line += f" {op} p50 {latency['p50']:.2f}us p99 {latency['p99']:.2f}us"
+    return line
+
+
+def cell_key(cell: dict) -> tuple:
+    """
+    Returns the parameters that identify a cell across result files.
+
+    :param cell: A result cell.
+    :return: (map, workload, distribution, hash, size).
+    """
+    return (cell['map'], cell['workload'], cell['distribution'],
+            cell['hash'], cell['size'])
+
+
+def compare(old: dict, new: dict) -> None:
+    """
+    Prints, for every cell found in both result files, how ops/sec, peak
+    memory and p99 latency changed from old to new (as new / old).
+
+    :param old: Results loaded from the baseline JSON file.
+    :param new: Results loaded from the JSON file to compare.
+    :return: None -- prints results.
+    """
+    old_cells = {cell_key(cell): cell for cell in old['results']}
+    for cell in new['results']:
+        before = old_cells.get(cell_key(cell))
+        if before is None:
+            continue
+
+        line = ' '.join(str(part) for part in cell_key(cell))
+        if before['ops_per_sec'] and cell['ops_per_sec']:
+            line += f": ops/s x{cell['ops_per_sec'] / before['ops_per_sec']:.2f}"
+        if before.get('peak_bytes') and cell.get('peak_bytes'):
+            line += f", memory x{cell['peak_bytes'] / before['peak_bytes']:.2f}"
+        for op, latency in cell.get('latency_us', {}).items():
+            old_latency = before.get('latency_us', {}).get(op)
+            if old_latency and old_latency['p99']:
+                line += (f", {op} p99 "
+                         f"x{latency['p99'] / old_latency['p99']:.2f}")
+        print(line)
+
+
+def parse_args(argv: list):
+    """
+    Parses the command line.
+
+    :param argv: The arguments, without the program name.
+    :return: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark suite for the Hash Maps.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help="run the suite")
+    run.add_argument('--sizes', type=int, nargs='+',
+                     default=list(DEFAULT_SIZES),
+                     help="key universe (and operation) counts, "
+                          "e.g. 1000 10000000")
+    run.add_argument('--maps', nargs='+', choices=list(MAPS),
+                     default=['sc', 'oa'])
+    run.add_argument('--workloads', nargs='+', choices=list(WORKLOADS),
+                     default=list(WORKLOADS))
+    run.add_argument('--distributions', nargs='+', choices=DISTRIBUTIONS,
+                     default=list(DISTRIBUTIONS))
+    run.add_argument('--hashes', nargs='+', choices=list(HASH_FUNCTIONS),
+                     default=list(HASH_FUNCTIONS))
+    run.add_argument('--seed', type=int, default=261)
+    run.add_argument('--max-seconds', type=float, default=60,
+                     help="skip larger sizes of a combination once one "
+                          "size takes longer than this")
+    run.add_argument('--no-memory', action='store_true',
+                     help="skip the (slow) tracemalloc run")
+    run.add_argument('--no-find-mode', dest='find_mode',
+                     action='store_false')
+    run.add_argument('--out', default='hash_map_suite.json')
+
+    diff = commands.add_parser('compare', help="compare two result files")
+    diff.add_argument('old')
+    diff.add_argument('new')
+
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args(sys.argv[1:])
+    if args.command == 'run':
+        results = run_suite(args)
+        with open(args.out, 'w') as out_file:
+            json.dump(results, out_file, indent=2)
+        print(f"saved {len(results['results'])} results to {args.out}")
+    else:
+        with open(args.old) as old_file, open(args.new) as new_file:
+            compare(json.load(old_file), json.load(new_file))
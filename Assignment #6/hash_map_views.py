@@ -0,0 +1,77 @@
+# Course: CS261 - Data Structures
+# Assignment: Assignment #6: Hash Map
+# Description: Lazy views over the entries of the Separate Chaining and Open
+# # -- Addressing Hash Maps, returned by their keys(), values() and items()
+# #     methods. A view copies nothing: each loop over it walks the map's
+# #     own bucket array, so it always reflects the map's current contents.
+# #     len() and membership tests are answered by the map itself.
+
+
+class MapView:
+    """
+    Base class for the views. Subclasses pick what each entry is viewed as.
+    """
+    __slots__ = ('_map',)
+
+    def __init__(self, hash_map) -> None:
+        """
+        Initialize a new view of the given HashMap.
+        """
+        self._map = hash_map
+
+    def __len__(self) -> int:
+        return self._map.get_size()
+
+    def __iter__(self):
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)})"
+
+
+class KeysView(MapView):
+    """
+    View of the keys of a HashMap.
+    """
+    __slots__ = ()
+
+    def __iter__(self):
+        for entry in self._map:
+            yield entry.key
+
+    def __contains__(self, key: str) -> bool:
+        return self._map.contains_key(key)
+
+
+class ValuesView(MapView):
+    """
+    View of the values of a HashMap. Membership tests walk every entry.
+    """
+    __slots__ = ()
+
+    def __iter__(self):
+        for entry in self._map:
+            yield entry.value
+
+    def __contains__(self, value: object) -> bool:
+        return any(entry.value == value for entry in self._map)
+
+
+class ItemsView(MapView):
+    """
+    View of the (key, value) pairs of a HashMap.
+    """
+    __slots__ = ()
+
+    def __iter__(self):
+        for entry in self._map:
+            yield entry.key, entry.value
+
+    def __contains__(self, item: tuple) -> bool:
+        key, value = item
+        found = self._map.get(key)
+        # -- get() gives None for a missing key as well as for a stored None,
+        #   so only then does the key need looking up again.
+        if found is None:
+            return value is None and self._map.contains_key(key)
+        return found == value